@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Non-interactive batch sync driven by a list of character URLs.
+
+Reads one JanitorAI character chat URL per line (blank lines and lines
+starting with '#' are ignored), runs STEP 1-6 for each without prompting,
+and writes one JSON result record per item.
+"""
+
+import json
+import os
+import sys
+import time
+
+import manifest
+import resources
+import timing
+
+
+def read_urls(source):
+    """
+    Read character URLs from a file path, or from stdin when source is '-'.
+
+    Returns:
+        List of URLs in file order, without duplicates
+    """
+    if source == "-":
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(os.path.expanduser(source), 'r') as f:
+            lines = f.read().splitlines()
+
+    urls = []
+    seen = set()
+    for line in lines:
+        url = line.strip()
+        if not url or url.startswith("#") or url in seen:
+            continue
+        seen.add(url)
+        urls.append(url)
+    return urls
+
+
+def new_record(url):
+    """Empty result record for url."""
+    return {
+        'url': url,
+        'success': False,
+        'name': None,
+        'json_path': None,
+        'image_path': None,
+        'error': None,
+        'duration': None,
+    }
+
+
+def sync_url(driver, url):
+    """
+    Open url and run the sync steps for it.
+
+    Returns:
+        Result record: url, success, name, json_path, image_path, error,
+        duration (seconds)
+    """
+    import sync
+
+    record = new_record(url)
+    started = time.monotonic()
+    try:
+        with timing.traced(url):
+            driver.get(url)
+            result = sync.sync_character(driver, url)
+        manifest.record_export(url, result)
+        record.update(
+            success=True,
+            name=result['name'],
+            json_path=result['json_path'],
+            image_path=result['image_path'],
+        )
+    except KeyboardInterrupt:
+        raise
+    except Exception as e:
+        record['error'] = f"{type(e).__name__}: {e}"
+        print(f"[ERROR] {url}: {record['error']}")
+        try:
+            sync.close_extra_tabs(driver)
+        except Exception:
+            pass
+    record['duration'] = round(time.monotonic() - started, 3)
+    return record
+
+
+def print_summary(records, elapsed):
+    """Print a short summary of a batch run."""
+    succeeded = [r for r in records if r['success']]
+    failed = [r for r in records if not r['success']]
+
+    print("\n" + "="*60)
+    print(" " * 20 + "BATCH SUMMARY")
+    print("="*60)
+    print(f"  Processed: {len(records)}")
+    print(f"  Succeeded: {len(succeeded)}")
+    print(f"  Failed:    {len(failed)}")
+    print(f"  Elapsed:   {elapsed:.1f}s")
+    if records:
+        print(f"  Average:   {elapsed / len(records):.1f}s per character")
+    peaks = [r['memory']['rss_mb'] for r in records if (r.get('memory') or {}).get('rss_mb')]
+    if peaks:
+        print(f"  Peak RSS:  {max(peaks):.0f} MB (Firefox process tree)")
+    for record in failed:
+        print(f"\n  [FAILED] {record['url']}")
+        print(f"           {record['error']}")
+    print("="*60 + "\n")
+
+
+def run_batch(urls, results_path=None, driver=None, relaunch=None):
+    """
+    Sync every URL in order and append a result record per item.
+
+    Args:
+        urls: Character chat URLs
+        results_path: JSONL file the records are appended to (optional)
+        driver: Existing WebDriver to reuse; a new one is launched otherwise
+        relaunch: Callable returning a fresh driver when the browser is
+            recycled (default: sync.get_firefox_driver)
+
+    Returns:
+        List of result records
+    """
+    import sync
+
+    if driver is None:
+        print("[INIT] Launching Firefox via Selenium...")
+        driver = sync.get_firefox_driver()
+
+    records = []
+    recycler = resources.BrowserRecycler()
+    started = time.monotonic()
+    results_file = open(os.path.expanduser(results_path), 'a') if results_path else None
+    try:
+        for i, url in enumerate(urls, 1):
+            print("\n" + "="*60)
+            print(f"  [{i}/{len(urls)}] {url}")
+            print("="*60)
+            record = sync_url(driver, url)
+            if i < len(urls):
+                driver = sync.recycle_if_due(driver, recycler, relaunch, record)
+            else:
+                recycler.measure(driver, record)
+            records.append(record)
+            if results_file:
+                results_file.write(json.dumps(record) + "\n")
+                results_file.flush()
+    except KeyboardInterrupt:
+        print("\n[INFO] Batch interrupted by user.")
+    finally:
+        if results_file:
+            results_file.close()
+
+    print_summary(records, time.monotonic() - started)
+    return records
+
+
+def main(source, results_path=None, pipeline=False, workers=None,
+         browsers=1, host_concurrency=None, rate_per_minute=None, driver=None,
+         ttl_days=None, force=False, relaunch=None):
+    """
+    Entry point for `janitor-dl batch`.
+
+    With pipeline=True, post-processing runs on `workers` threads
+    overlapping the browser steps (see pipeline.py). With browsers > 1,
+    characters are spread over that many Firefox sessions (see pool.py).
+    Otherwise `driver` is reused when given, and `relaunch` starts its
+    replacement when the browser is recycled.
+
+    Characters already in the export manifest with unchanged files are
+    skipped unless force=True or their export is older than ttl_days.
+    """
+    import sync
+
+    if results_path is None:
+        results_path = os.path.join(sync.DOWNLOAD_PATH, "janitor-dl-batch.jsonl")
+
+    urls = read_urls(source)
+    if not urls:
+        print("[ERROR] No character URLs found.")
+        return 1
+
+    print(f"[INFO] Loaded {len(urls)} character URL(s)")
+    if not force:
+        ttl = ttl_days * 86400 if ttl_days is not None else None
+        urls, skipped = manifest.get_manifest().pending(urls, ttl)
+        if skipped:
+            print(f"[INFO] Skipping {len(skipped)} already exported character(s) "
+                  f"(use --force or --ttl to re-export)")
+        if not urls:
+            print("[INFO] Nothing to export.")
+            return 0
+    print(f"[INFO] Writing results to {results_path}")
+
+    if browsers and browsers > 1:
+        import pool
+        records = pool.run_pool(
+            urls, results_path, browsers=browsers,
+            host_concurrency=host_concurrency or pool.DEFAULT_HOST_CONCURRENCY,
+            rate_per_minute=pool.DEFAULT_RATE_PER_MINUTE if rate_per_minute is None else rate_per_minute,
+        )
+    elif pipeline:
+        from pipeline import run_pipeline, DEFAULT_WORKERS
+        records = run_pipeline(urls, results_path, driver, workers=workers or DEFAULT_WORKERS,
+                               relaunch=relaunch)
+    else:
+        records = run_batch(urls, results_path, driver, relaunch)
+    return 0 if records and all(r['success'] for r in records) else 1
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: batch.py URL_FILE|- [RESULTS_JSONL]")
+        sys.exit(2)
+    sys.exit(main(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else None))
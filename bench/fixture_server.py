@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+Offline stand-ins for JanitorAI and sucker.dev.
+
+Two stdlib HTTP servers sharing one in-memory state:
+
+- "janitor": /character/<slug> chat pages (title, chatbox, back button,
+  DOM_SIZE filler messages) and /profile/<slug> pages with the large
+  avatar, plus the avatar images themselves (CORS-enabled PNGs). Every
+  other character's avatar is served by the sucker.dev stand-in instead,
+  like an avatar CDN on a different origin.
+- "sucker": a card list rendered client-side from /api/cards. Every
+  message sent from a chat page adds that character's card at the bottom,
+  like sucker.dev does, and each card has a working "Download JSON"
+  button.
+
+Knobs: artificial latency per response, number of pre-seeded cards,
+number of filler chat messages, avatar size.
+
+Run standalone to poke at it in a browser:
+
+    python bench/fixture_server.py --cards 1000 --latency 50
+"""
+
+import argparse
+import html
+import json
+import struct
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+# Names exercise the awkward cases: apostrophes, quotes, accents, spaces
+BASE_NAMES = [
+    "Aiko",
+    "Brenna O'Hara",
+    "Céline",
+    "Dmitri",
+    "Eun-ji",
+    "Fionn \"Finn\" Byrne",
+    "Gwendolyn",
+    "Hikaru",
+    "Ísold",
+    "Jax",
+]
+
+
+def character_name(index):
+    """Deterministic character name for index."""
+    base = BASE_NAMES[index % len(BASE_NAMES)]
+    return base if index < len(BASE_NAMES) else f"{base} {index // len(BASE_NAMES) + 1}"
+
+
+def character_slug(index):
+    return f"char-{index:04d}"
+
+
+def _png_chunk(kind, data):
+    chunk = kind + data
+    return struct.pack(">I", len(data)) + chunk + struct.pack(">I", zlib.crc32(chunk) & 0xffffffff)
+
+
+def make_png(width, height, seed=0):
+    """Build an RGBA gradient PNG with the stdlib only."""
+    rows = []
+    for y in range(height):
+        row = bytearray([0])
+        for x in range(width):
+            row += bytes(((x + seed * 37) % 256, (y + seed * 91) % 256, (seed * 53) % 256, 255))
+        rows.append(bytes(row))
+    header = struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + _png_chunk(b"IHDR", header)
+            + _png_chunk(b"IDAT", zlib.compress(b"".join(rows), 6)) + _png_chunk(b"IEND", b""))
+
+
+class FixtureState:
+    """Shared state: characters, the sucker.dev card list, cached images."""
+
+    def __init__(self, characters=50, cards=50, dom_size=200, image_size=(400, 600), latency=0.0):
+        self.characters = characters
+        self.dom_size = dom_size
+        self.image_size = image_size
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.images = {}
+        self.requests = 0
+        self.bytes_sent = 0
+        self.cards = [
+            self.card_for(f"Seed Character {i:05d}", f"seed-{i:05d}")
+            for i in range(cards)
+        ]
+
+    @staticmethod
+    def card_for(name, slug):
+        return {
+            "name": name,
+            "slug": slug,
+            "data": {
+                "name": name,
+                "description": f"{name} is a fixture character used for offline benchmarks.",
+                "personality": "Patient, consistent, entirely synthetic.",
+                "scenario": "A local HTTP server pretending to be the internet.",
+                "first_mes": f"Hello, I'm {name}.",
+            },
+        }
+
+    def image(self, key, width, height, seed):
+        with self.lock:
+            if key not in self.images:
+                self.images[key] = make_png(width, height, seed)
+            return self.images[key]
+
+    def add_card(self, slug, name):
+        with self.lock:
+            self.cards.append(self.card_for(name, slug))
+
+    def count(self, sent):
+        with self.lock:
+            self.requests += 1
+            self.bytes_sent += sent
+
+
+CHAT_PAGE = """<!doctype html>
+<html><head><meta charset="utf-8"><title>{title}</title>
+<style>
+body {{ margin: 0; font-family: sans-serif; }}
+header {{ height: 80px; display: flex; align-items: center; gap: 12px; background: #222; color: #fff; padding: 0 16px; }}
+#messages {{ padding: 16px; }}
+.msg {{ padding: 6px 0; border-bottom: 1px solid #eee; }}
+textarea {{ width: 90%; height: 60px; margin: 16px; }}
+</style></head>
+<body>
+<header>
+  <button aria-label="Back" onclick="location.href='/profile/{slug}'">&larr;</button>
+  <span class="font-bold">{name_html}</span>
+</header>
+<div id="messages">{messages}</div>
+<textarea placeholder="Type a message" id="chat"></textarea>
+<script>
+document.getElementById('chat').addEventListener('keydown', function (e) {{
+  if (e.key !== 'Enter' || e.shiftKey) return;
+  e.preventDefault();
+  var text = this.value;
+  this.value = '';
+  fetch('/api/sent', {{method: 'POST', body: JSON.stringify({{slug: {slug_json}, name: {name_json}, text: text}})}})
+    .then(function () {{
+      var div = document.createElement('div');
+      div.className = 'msg';
+      div.textContent = text;
+      document.getElementById('messages').appendChild(div);
+    }});
+}});
+</script>
+</body></html>
+"""
+
+PROFILE_PAGE = """<!doctype html>
+<html><head><meta charset="utf-8"><title>{title}</title>
+<style>
+body {{ margin: 0; font-family: sans-serif; }}
+header {{ height: 160px; background: #222; color: #fff; padding: 16px; }}
+main {{ display: flex; gap: 24px; padding: 24px; min-height: 1200px; }}
+.thumbs img {{ width: 48px; height: 48px; }}
+</style></head>
+<body>
+<header><div class="thumbs">{thumbs}</div></header>
+<main>
+  <img class="avatar" src="{image}" width="{width}" height="{height}" alt="">
+  <div><h2>{name_html}</h2><p>{description}</p></div>
+</main>
+</body></html>
+"""
+
+SUCKER_PAGE = """<!doctype html>
+<html><head><meta charset="utf-8"><title>Sucker (fixture)</title>
+<style>
+body { font-family: sans-serif; margin: 0 auto; max-width: 900px; }
+.card { border: 1px solid #ccc; margin: 12px; padding: 12px; display: flex; gap: 12px; }
+.card img { width: 64px; height: 64px; }
+</style></head>
+<body>
+<h1>Captured characters</h1>
+<div id="cards"></div>
+<script>
+function download(card) {
+  var blob = new Blob([JSON.stringify(card.data, null, 2)], {type: 'application/json'});
+  var a = document.createElement('a');
+  a.href = URL.createObjectURL(blob);
+  a.download = card.name + '.json';
+  document.body.appendChild(a);
+  a.click();
+  a.remove();
+}
+fetch('/api/cards').then(function (r) { return r.json(); }).then(function (payload) {
+  var root = document.getElementById('cards');
+  payload.cards.forEach(function (card) {
+    var div = document.createElement('div');
+    div.className = 'card';
+    var img = document.createElement('img');
+    img.src = payload.image_base + '/images/thumb-' + card.slug + '.png';
+    var body = document.createElement('div');
+    var title = document.createElement('div');
+    title.className = 'title';
+    title.textContent = card.name;
+    var desc = document.createElement('p');
+    desc.textContent = card.data.description;
+    var button = document.createElement('button');
+    button.textContent = 'Download JSON';
+    button.addEventListener('click', function () { download(card); });
+    body.appendChild(title);
+    body.appendChild(desc);
+    body.appendChild(button);
+    div.appendChild(img);
+    div.appendChild(body);
+    root.appendChild(div);
+  });
+});
+</script>
+</body></html>
+"""
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Routes for both fixture sites; self.server.role picks which."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    @property
+    def state(self):
+        return self.server.state
+
+    def _send(self, body, content_type, status=200):
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        if self.state.latency:
+            time.sleep(self.state.latency)
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+        self.state.count(len(body))
+
+    def _not_found(self):
+        self._send("not found", "text/plain", 404)
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if self.server.role == "janitor":
+            self._janitor_get(path)
+        else:
+            self._sucker_get(path)
+
+    def do_POST(self):
+        path = urlparse(self.path).path
+        length = int(self.headers.get("Content-Length") or 0)
+        payload = self.rfile.read(length) if length else b"{}"
+        if self.server.role == "janitor" and path == "/api/sent":
+            data = json.loads(payload or b"{}")
+            self.state.add_card(data.get("slug", ""), data.get("name", ""))
+            self._send("{}", "application/json")
+        else:
+            self._not_found()
+
+    def _character(self, slug):
+        try:
+            index = int(slug.rsplit("-", 1)[1])
+        except (IndexError, ValueError):
+            return None
+        if not slug.startswith("char-") or index >= self.state.characters:
+            return None
+        return index, character_name(index)
+
+    def _janitor_get(self, path):
+        parts = path.strip("/").split("/")
+        if len(parts) == 2 and parts[0] in ("character", "profile"):
+            found = self._character(parts[1])
+            if found is None:
+                return self._not_found()
+            index, name = found
+            slug = parts[1]
+            title = html.escape(f"{name} (Chat) | JanitorAI")
+            if parts[0] == "character":
+                messages = "".join(
+                    f'<div class="msg"><span class="author">User</span> message {i} '
+                    f'in a long chat history</div>'
+                    for i in range(self.state.dom_size)
+                )
+                page = CHAT_PAGE.format(
+                    title=title, slug=slug, name_html=html.escape(name),
+                    messages=messages, slug_json=json.dumps(slug),
+                    name_json=json.dumps(name).replace("</", "<\\/"),
+                )
+            else:
+                width, height = self.state.image_size
+                thumbs = "".join(
+                    f'<img src="/images/thumb-seed-{i:05d}.png" alt="">' for i in range(5)
+                )
+                # Odd characters exercise a cross-origin avatar CDN
+                image_base = self.server.cdn_base if index % 2 else ""
+                page = PROFILE_PAGE.format(
+                    title=title, name_html=html.escape(name), thumbs=thumbs,
+                    image=f"{image_base}/images/{slug}.png", width=width, height=height,
+                    description=html.escape(self.state.card_for(name, slug)["data"]["description"]),
+                )
+            return self._send(page, "text/html; charset=utf-8")
+
+        if len(parts) == 2 and parts[0] == "images":
+            return self._image_get(parts[1])
+
+        self._not_found()
+
+    def _image_get(self, filename):
+        if not filename.endswith(".png"):
+            return self._not_found()
+        key = filename[:-len(".png")]
+        if key.startswith("thumb-"):
+            png = self.state.image(key, 64, 64, zlib.crc32(key.encode()) % 97)
+        else:
+            found = self._character(key)
+            if found is None:
+                return self._not_found()
+            width, height = self.state.image_size
+            png = self.state.image(key, width, height, found[0])
+        self._send(png, "image/png")
+
+    def _sucker_get(self, path):
+        if path.startswith("/images/"):
+            return self._image_get(path[len("/images/"):])
+        if path == "/":
+            return self._send(SUCKER_PAGE, "text/html; charset=utf-8")
+        if path == "/api/cards":
+            with self.state.lock:
+                cards = list(self.state.cards)
+            payload = {"cards": cards, "image_base": self.server.image_base}
+            return self._send(json.dumps(payload), "application/json")
+        self._not_found()
+
+
+class FixtureServers:
+    """Start/stop both fixture sites on free localhost ports."""
+
+    def __init__(self, host="127.0.0.1", janitor_port=0, sucker_port=0, **state_options):
+        self.state = FixtureState(**state_options)
+        self.janitor = ThreadingHTTPServer((host, janitor_port), FixtureHandler)
+        self.sucker = ThreadingHTTPServer((host, sucker_port), FixtureHandler)
+        self.janitor.role = "janitor"
+        self.sucker.role = "sucker"
+        for server in (self.janitor, self.sucker):
+            server.state = self.state
+            server.daemon_threads = True
+        self.janitor_url = f"http://{host}:{self.janitor.server_address[1]}"
+        self.sucker_url = f"http://{host}:{self.sucker.server_address[1]}/"
+        self.sucker.image_base = self.janitor_url
+        # sucker.dev doubles as the cross-origin avatar CDN
+        self.janitor.cdn_base = self.sucker_url.rstrip("/")
+        self._threads = []
+
+    def character_url(self, index):
+        return f"{self.janitor_url}/character/{character_slug(index)}"
+
+    def start(self):
+        for server in (self.janitor, self.sucker):
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self):
+        for server in (self.janitor, self.sucker):
+            server.shutdown()
+            server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def add_fixture_arguments(parser):
+    """Fixture knobs shared by this script and the benchmark runner."""
+    parser.add_argument("--latency", type=float, default=0.0, metavar="MS",
+                        help="Artificial delay added to every response (default: 0)")
+    parser.add_argument("--cards", type=int, default=50,
+                        help="Cards already in the sucker.dev list (default: 50)")
+    parser.add_argument("--dom-size", type=int, default=200,
+                        help="Filler messages on each chat page (default: 200)")
+    parser.add_argument("--image-size", default="400x600", metavar="WxH",
+                        help="Avatar size (default: 400x600)")
+
+
+def fixture_options(args, characters):
+    width, height = (int(v) for v in args.image_size.lower().split("x"))
+    return {
+        "characters": characters,
+        "cards": args.cards,
+        "dom_size": args.dom_size,
+        "image_size": (width, height),
+        "latency": args.latency / 1000.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve offline JanitorAI / sucker.dev fixtures")
+    add_fixture_arguments(parser)
+    parser.add_argument("--characters", type=int, default=50)
+    parser.add_argument("--janitor-port", type=int, default=8701)
+    parser.add_argument("--sucker-port", type=int, default=8702)
+    args = parser.parse_args()
+
+    servers = FixtureServers(
+        janitor_port=args.janitor_port, sucker_port=args.sucker_port,
+        **fixture_options(args, args.characters)
+    ).start()
+    print(f"[FIXTURE] JanitorAI stand-in: {servers.janitor_url}")
+    print(f"[FIXTURE] sucker.dev stand-in: {servers.sucker_url}")
+    print(f"[FIXTURE] First character:     {servers.character_url(0)}")
+    print("[FIXTURE] Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        servers.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+End-to-end sync benchmark against the offline fixture servers.
+
+Drives the real sync.sync_character() in headless Firefox against
+bench/fixture_server.py and reports per-step latency, characters per
+minute and WebDriver round trips (commands sent to geckodriver).
+
+    python bench/run_bench.py --characters 10 --cards 2000 --latency 30
+    python bench/run_bench.py --compare HEAD~3 HEAD
+    python bench/run_bench.py --compare-modes
+
+--compare checks both revisions out into temporary git worktrees and runs
+the same benchmark against each. Revisions need sync.sync_character and
+sync.SUCKER_URL, so comparisons reach back to when this suite was added.
+--compare-modes runs this tree twice, in normal and in lean page-load mode
+(sync.LEAN_MODE), and compares page-load time and bytes served.
+"""
+
+import argparse
+import json
+import math
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+REPO = os.path.dirname(HERE)
+sys.path.insert(0, HERE)
+
+from fixture_server import FixtureServers, add_fixture_arguments, fixture_options  # noqa: E402
+
+# sync helpers timed individually (whichever exist in the tree under test)
+STEP_FUNCTIONS = [
+    "detect_character_name",
+    "find_chatbox",
+    "find_character_in_sucker",
+    "find_back_button",
+    "find_character_image_url",
+    "fetch_image_bytes",
+    "finish_character",
+]
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100.0 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+class Recorder:
+    """Collects step durations and WebDriver command counts per character."""
+
+    def __init__(self):
+        self.steps = {}
+        self.commands = Counter()
+        self.current_commands = 0
+
+    def time_step(self, name, func):
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.steps.setdefault(name, []).append(time.perf_counter() - started)
+        timed.__wrapped__ = func
+        return timed
+
+    def count_commands(self, driver):
+        executor = driver.command_executor
+        original = executor.execute
+
+        def execute(command, params):
+            self.commands[command] += 1
+            self.current_commands += 1
+            return original(command, params)
+
+        executor.execute = execute
+
+
+def launch_headless(sync, download_dir):
+    from selenium import webdriver
+    from selenium.webdriver.firefox.service import Service
+
+    sync.PROFILE_PATH = ""
+    options = sync.get_firefox_options(download_dir, "copy")
+    options.add_argument("-headless")
+    driver = webdriver.Firefox(options=options, service=Service(log_output=os.devnull))
+    if hasattr(sync, "prepare_driver"):
+        sync.prepare_driver(driver)
+    elif hasattr(sync, "apply_lean_mode"):
+        sync.apply_lean_mode(driver)
+    return driver
+
+
+def run_once(args, tree):
+    """Benchmark the sync module in `tree`. Returns a results dict."""
+    sys.path.insert(0, tree)
+    import sync
+
+    recorder = Recorder()
+    for name in STEP_FUNCTIONS:
+        if hasattr(sync, name):
+            setattr(sync, name, recorder.time_step(name, getattr(sync, name)))
+
+    download_dir = tempfile.mkdtemp(prefix="janitor-bench-")
+    servers = FixtureServers(**fixture_options(args, args.characters)).start()
+    sync.DOWNLOAD_PATH = download_dir
+    sync.SUCKER_URL = servers.sucker_url
+    if args.lean:
+        sync.LEAN_MODE = True
+    # Measure each attempt as it happens: no journal, no retries
+    if hasattr(sync, "CHECKPOINTS"):
+        sync.CHECKPOINTS = False
+        sync.STEP_RETRIES = 0
+    # Fixture timings must not end up in the user's `janitor-dl stats`
+    timing = sys.modules.get("timing")
+    if timing is not None:
+        timing.SPANS_PATH = os.path.join(download_dir, "spans.jsonl")
+    # Fixture runs must not reorder the live selector strategies
+    strategies = sys.modules.get("strategies")
+    if strategies is not None:
+        strategies.STRATEGY_STATS_PATH = os.path.join(download_dir, "strategies.json")
+
+    driver = None
+    totals = []
+    rpcs = []
+    failures = []
+    started = time.perf_counter()
+    try:
+        launch_started = time.perf_counter()
+        driver = launch_headless(sync, download_dir)
+        launch_seconds = time.perf_counter() - launch_started
+        recorder.count_commands(driver)
+
+        for i in range(args.characters):
+            url = servers.character_url(i)
+            recorder.current_commands = 0
+            t0 = time.perf_counter()
+            try:
+                load_started = time.perf_counter()
+                driver.get(url)
+                recorder.steps.setdefault("page_load", []).append(time.perf_counter() - load_started)
+                sync.sync_character(driver)
+            except Exception as e:
+                failures.append({"url": url, "error": f"{type(e).__name__}: {e}"})
+                try:
+                    sync.close_extra_tabs(driver)
+                except Exception:
+                    pass
+                continue
+            totals.append(time.perf_counter() - t0)
+            rpcs.append(recorder.current_commands)
+    finally:
+        elapsed = time.perf_counter() - started
+        if driver is not None:
+            driver.quit()
+        servers.stop()
+        shutil.rmtree(download_dir, ignore_errors=True)
+
+    run_seconds = sum(totals)
+    return {
+        "tree": tree,
+        "mode": "lean" if args.lean else "normal",
+        "characters": args.characters,
+        "succeeded": len(totals),
+        "failures": failures,
+        "launch_seconds": round(launch_seconds, 3),
+        "elapsed_seconds": round(elapsed, 3),
+        "chars_per_minute": round(len(totals) / run_seconds * 60, 2) if run_seconds else 0.0,
+        "per_character": {
+            "p50": round(percentile(totals, 50), 3),
+            "p95": round(percentile(totals, 95), 3),
+            "mean": round(statistics.mean(totals), 3) if totals else 0.0,
+        },
+        "rpc_per_character": round(statistics.mean(rpcs), 1) if rpcs else 0.0,
+        "rpc_by_command": dict(recorder.commands.most_common()),
+        "steps": {
+            name: {
+                "calls": len(values),
+                "p50": round(percentile(values, 50), 4),
+                "p95": round(percentile(values, 95), 4),
+                "mean": round(statistics.mean(values), 4),
+            }
+            for name, values in recorder.steps.items()
+        },
+        "fixture": fixture_options(args, args.characters),
+        "fixture_requests": servers.state.requests,
+        "fixture_bytes": servers.state.bytes_sent,
+    }
+
+
+def print_results(results):
+    print("="*60)
+    print(" " * 18 + "Benchmark Results")
+    print("="*60)
+    print(f"  Tree:               {results['tree']}")
+    print(f"  Page-load mode:     {results.get('mode', 'normal')}")
+    print(f"  Characters:         {results['succeeded']}/{results['characters']} succeeded")
+    print(f"  Browser launch:     {results['launch_seconds']:.2f}s")
+    print(f"  Characters/minute:  {results['chars_per_minute']:.1f}")
+    print(f"  Per character:      p50 {results['per_character']['p50']:.2f}s  "
+          f"p95 {results['per_character']['p95']:.2f}s")
+    print(f"  WebDriver RPCs:     {results['rpc_per_character']:.0f} per character")
+    print(f"  Fixture traffic:    {results['fixture_requests']} requests, "
+          f"{results['fixture_bytes'] / 1024:.0f} KiB")
+    print("\n  Step                          calls     p50 (ms)   p95 (ms)")
+    for name, s in results['steps'].items():
+        print(f"  {name:<28} {s['calls']:>6} {s['p50'] * 1000:>11.1f} {s['p95'] * 1000:>10.1f}")
+    print("\n  Top WebDriver commands:")
+    for command, count in list(results['rpc_by_command'].items())[:8]:
+        print(f"    {command:<30} {count:>6}")
+    for failure in results['failures']:
+        print(f"\n  [FAILED] {failure['url']}\n           {failure['error']}")
+    print("="*60 + "\n")
+
+
+def _worktree(rev):
+    path = tempfile.mkdtemp(prefix="janitor-bench-rev-")
+    subprocess.run(["git", "-C", REPO, "worktree", "add", "--detach", path, rev],
+                   check=True, capture_output=True)
+    return path
+
+
+def _run_subprocess(tree, passthrough):
+    """Run this script against tree in a fresh interpreter. Returns its results."""
+    fd, out = tempfile.mkstemp(prefix="janitor-bench-", suffix=".json")
+    os.close(fd)
+    try:
+        subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--tree", tree, "--json", out] + passthrough,
+        )
+        with open(out) as f:
+            return json.load(f)
+    finally:
+        os.remove(out)
+
+
+def _run_revision(rev, passthrough):
+    """Run this script against a checkout of rev in a subprocess."""
+    tree = _worktree(rev)
+    try:
+        results = _run_subprocess(tree, passthrough)
+    finally:
+        subprocess.run(["git", "-C", REPO, "worktree", "remove", "--force", tree],
+                       capture_output=True)
+    results["revision"] = rev
+    return results
+
+
+def _run_mode(tree, lean, passthrough):
+    """Run this script against tree in normal or lean page-load mode."""
+    results = _run_subprocess(tree, passthrough + (["--lean"] if lean else []))
+    results["revision"] = "lean" if lean else "normal"
+    return results
+
+
+def print_comparison(a, b):
+    def delta(old, new):
+        return f"{(new - old) / old * 100:+.0f}%" if old else "n/a"
+
+    print("="*60)
+    print(" " * 18 + "Revision Comparison")
+    print("="*60)
+    print(f"  {'':<28} {a['revision']:>12} {b['revision']:>12} {'change':>8}")
+    rows = [
+        ("chars/minute", a['chars_per_minute'], b['chars_per_minute']),
+        ("per character p50 (s)", a['per_character']['p50'], b['per_character']['p50']),
+        ("RPCs per character", a['rpc_per_character'], b['rpc_per_character']),
+        ("fixture KiB served", a['fixture_bytes'] / 1024, b['fixture_bytes'] / 1024),
+        ("fixture requests", a['fixture_requests'], b['fixture_requests']),
+    ]
+    for name in sorted(set(a['steps']) | set(b['steps'])):
+        old = a['steps'].get(name, {}).get('p50', 0.0) * 1000
+        new = b['steps'].get(name, {}).get('p50', 0.0) * 1000
+        rows.append((f"{name} p50 (ms)", old, new))
+    for label, old, new in rows:
+        print(f"  {label:<28} {old:>12.2f} {new:>12.2f} {delta(old, new):>8}")
+    print("="*60 + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sync against offline fixtures")
+    add_fixture_arguments(parser)
+    parser.add_argument("--characters", type=int, default=5,
+                        help="Characters to export (default: 5)")
+    parser.add_argument("--tree", default=REPO,
+                        help="Source tree whose sync.py is benchmarked (default: this repo)")
+    parser.add_argument("--json", metavar="PATH", help="Also write the results as JSON")
+    parser.add_argument("--compare", nargs=2, metavar=("REV_A", "REV_B"),
+                        help="Benchmark two git revisions and compare them")
+    parser.add_argument("--lean", action="store_true",
+                        help="Run sync in lean page-load mode")
+    parser.add_argument("--compare-modes", action="store_true",
+                        help="Benchmark the tree in normal and lean page-load mode and compare them")
+    args = parser.parse_args()
+
+    if args.compare or args.compare_modes:
+        passthrough = [
+            "--characters", str(args.characters), "--latency", str(args.latency),
+            "--cards", str(args.cards), "--dom-size", str(args.dom_size),
+            "--image-size", args.image_size,
+        ]
+        if args.compare:
+            results = [_run_revision(rev, passthrough) for rev in args.compare]
+        else:
+            tree = os.path.abspath(args.tree)
+            results = [_run_mode(tree, lean, passthrough) for lean in (False, True)]
+        print_comparison(*results)
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump(results, f, indent=2)
+        return 0
+
+    results = run_once(args, os.path.abspath(args.tree))
+    print_results(results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0 if not results['failures'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
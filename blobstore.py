@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Content-addressed storage for exported files.
+
+Every exported JSON and PNG is stored once under
+<output dir>/.janitor-dl-blobs/<sha256[:2]>/<sha256>, and the readable
+<name>.json / <name>.png in the output folder is a hardlink to that blob
+(or a reflink on filesystems that support cloning but not hardlinks).
+Exporting the same bytes again, under any name, only adds a link. Blobs
+are read-only, so editing a file means replacing it, which leaves the blob
+intact. `janitor-dl gc` removes blobs nothing refers to any more.
+"""
+
+import os
+import sys
+
+import downloads
+from manifest import file_sha256
+
+# --- CONFIGURATION ---
+BLOB_DIR_NAME = ".janitor-dl-blobs"
+# Suffixes of output files that may refer to blobs
+STORED_SUFFIXES = (".json", ".png", ".webp")
+
+# Linux FICLONE ioctl (btrfs, XFS, ...)
+FICLONE = 0x40049409
+
+
+def blob_root(directory):
+    return os.path.join(directory, BLOB_DIR_NAME)
+
+
+def blob_path(directory, digest):
+    return os.path.join(blob_root(directory), digest[:2], digest)
+
+
+def _reflink(src, dst):
+    """Clone src to dst sharing extents; raises OSError where unsupported."""
+    try:
+        import fcntl
+    except ImportError:
+        raise OSError("reflinks are not supported on this platform")
+    with open(src, 'rb') as s, open(dst, 'wb') as d:
+        try:
+            fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+        except OSError:
+            d.close()
+            os.remove(dst)
+            raise
+
+
+def _link(src, dst):
+    """Hardlink src to dst, falling back to a reflink. Returns the method used."""
+    try:
+        os.link(src, dst)
+        return "hardlink"
+    except FileExistsError:
+        raise
+    except OSError:
+        _reflink(src, dst)
+        return "reflink"
+
+
+def store(path, directory=None):
+    """
+    Move the content of path into the blob store and link path to it.
+
+    Args:
+        path: A freshly written export file
+        directory: Output folder the store lives in (default: path's folder)
+
+    Returns:
+        (digest, outcome) where outcome is 'new', 'deduplicated' or
+        'unlinked' (the filesystem supports neither hardlinks nor reflinks,
+        so path was left as a plain file)
+    """
+    directory = directory or os.path.dirname(os.path.abspath(path))
+    digest = file_sha256(path)
+    blob = blob_path(directory, digest)
+    os.makedirs(os.path.dirname(blob), exist_ok=True)
+
+    if not os.path.exists(blob):
+        try:
+            _link(path, blob)
+            os.chmod(blob, 0o444)
+            return digest, "new"
+        except FileExistsError:
+            pass  # another worker stored the same bytes just now
+        except OSError:
+            return digest, "unlinked"
+
+    if os.path.samefile(path, blob):
+        return digest, "deduplicated"
+
+    # Swap path for a link to the existing blob atomically
+    tmp_path = f"{path}.link"
+    try:
+        _link(blob, tmp_path)
+    except OSError:
+        return digest, "unlinked"
+    downloads.claim(path, source=tmp_path)
+    os.replace(tmp_path, path)
+    return digest, "deduplicated"
+
+
+def _stored_files(directory):
+    """Export files in directory that could refer to a blob."""
+    for entry in os.scandir(directory):
+        if entry.is_file() and entry.name.endswith(STORED_SUFFIXES):
+            yield entry
+
+
+def gc(directory, dry_run=False):
+    """
+    Remove blobs no export file refers to.
+
+    A blob with more than one hardlink is in use. A blob with a single link
+    may still back a reflinked file, so it is kept if some export file of
+    the same size has the same hash.
+
+    Returns:
+        (blobs removed, bytes freed, blobs kept)
+    """
+    root = blob_root(directory)
+    if not os.path.isdir(root):
+        return 0, 0, 0
+
+    candidates = {}
+    kept = 0
+    for prefix in os.scandir(root):
+        if not prefix.is_dir():
+            continue
+        for blob in os.scandir(prefix.path):
+            st = blob.stat()
+            if st.st_nlink > 1:
+                kept += 1
+            else:
+                candidates.setdefault(st.st_size, {})[blob.name] = blob.path
+
+    if candidates:
+        for entry in _stored_files(directory):
+            blobs = candidates.get(entry.stat().st_size)
+            if not blobs:
+                continue
+            digest = file_sha256(entry.path)
+            if blobs.pop(digest, None) is not None:
+                kept += 1
+
+    removed = 0
+    freed = 0
+    for blobs in candidates.values():
+        for path in blobs.values():
+            freed += os.path.getsize(path)
+            removed += 1
+            if not dry_run:
+                os.chmod(path, 0o644)
+                os.remove(path)
+    return removed, freed, kept
+
+
+def gc_main(directory=None, dry_run=False):
+    """Entry point for `janitor-dl gc`."""
+    if directory is None:
+        import sync
+        directory = sync.DOWNLOAD_PATH
+    directory = os.path.expanduser(directory)
+
+    removed, freed, kept = gc(directory, dry_run)
+    verb = "Would remove" if dry_run else "Removed"
+    print(f"[GC] {verb} {removed} unreferenced blob(s), {freed / 1024 / 1024:.1f} MB "
+          f"({kept} still in use) in {blob_root(directory)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(gc_main(sys.argv[1] if len(sys.argv) > 1 else None))
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Network capture of sucker.dev's card data over WebDriver BiDi.
+
+Instead of clicking "Download JSON" and waiting on Firefox's download
+manager, a BiDi preload script (script.addPreloadScript) hooks fetch() and
+XMLHttpRequest in every sucker.dev page before the page's own scripts run
+and keeps the JSON bodies of its responses. Once the sucker.dev tab has
+loaded, the character is matched against the card-like objects in those
+bodies, and its data is handed back to Python to be written straight to
+<name>.json. Any miss (BiDi unavailable, hook not installed, no match in
+time) returns None and sync falls back to the download button.
+"""
+
+import json
+from urllib.parse import urlparse
+
+import waits
+
+# --- CONFIGURATION ---
+# How long to wait for a captured response containing the character
+CAPTURE_TIMEOUT = 10
+
+PRELOAD_SCRIPT = """
+() => {
+  if (location.origin !== %(origin)s || window.__janitorCaptured) return;
+  const captured = window.__janitorCaptured = [];
+  // started: when the request was issued, so responses to requests made
+  // before a requery can be told apart from fresh ones
+  const keep = (url, text, started) => {
+    try { captured.push({url: String(url), data: JSON.parse(text), started: started}); } catch (e) {}
+  };
+  const isJson = (type) => (type || '').indexOf('json') !== -1;
+  const fetch = window.fetch;
+  window.fetch = function () {
+    const started = performance.now();
+    return fetch.apply(this, arguments).then((response) => {
+      if (isJson(response.headers.get('content-type'))) {
+        response.clone().text().then((text) => keep(response.url, text, started), () => {});
+      }
+      return response;
+    });
+  };
+  const send = XMLHttpRequest.prototype.send;
+  XMLHttpRequest.prototype.send = function () {
+    const started = performance.now();
+    this.addEventListener('load', () => {
+      if (!isJson(this.getResponseHeader('content-type'))) return;
+      if (this.responseType === 'json') keep(this.responseURL, JSON.stringify(this.response), started);
+      else if (this.responseType === '' || this.responseType === 'text') keep(this.responseURL, this.responseText, started);
+    });
+    return send.apply(this, arguments);
+  };
+}
+"""
+
+# Collect card-like objects (a name plus card fields) from the bodies of
+# requests issued since the page loaded or was last requeried into
+# window.__janitorCards and return their names; [] while the tab is still
+# on about:blank, null if the hook isn't there
+CARD_NAMES_SCRIPT = """
+if (location.origin !== arguments[0]) return [];
+var captured = window.__janitorCaptured;
+if (!captured) return null;
+var cards = window.__janitorCards = [];
+function visit(value, depth) {
+  if (!value || typeof value !== 'object' || depth > 8) return;
+  if (Array.isArray(value)) {
+    for (var i = 0; i < value.length; i++) visit(value[i], depth + 1);
+    return;
+  }
+  var data = value.data && typeof value.data === 'object' ? value.data : null;
+  var name = typeof value.name === 'string' ? value.name : (data && typeof data.name === 'string' ? data.name : null);
+  if (name && (data || 'description' in value || 'first_mes' in value)) {
+    cards.push(value);
+    return;
+  }
+  for (var key in value) visit(value[key], depth + 1);
+}
+var since = window.__janitorCaptureSince || 0;
+captured.forEach(function (response) {
+  if (response.started >= since) visit(response.data, 0);
+});
+return cards.map(function (card) {
+  return typeof card.name === 'string' ? card.name : card.data.name;
+});
+"""
+
+CARD_DATA_SCRIPT = "return window.__janitorCards[arguments[0]];"
+
+# Fetch the JSON endpoints the page loaded again (through the hook, which
+# captures the fresh bodies) instead of reloading it; -1 if there's nothing
+# to re-fetch
+REQUERY_SCRIPT = """
+var captured = window.__janitorCaptured;
+if (location.origin !== arguments[0] || !captured || !captured.length) return -1;
+var urls = captured.map(function (response) { return response.url; })
+  .filter(function (url, i, all) { return all.indexOf(url) === i; });
+captured.length = 0;
+window.__janitorCaptureSince = performance.now();
+urls.forEach(function (url) {
+  window.fetch(url, {credentials: 'include', cache: 'no-store'}).catch(function () {});
+});
+return urls.length;
+"""
+
+
+def bidi_capabilities(options):
+    """Ask for a BiDi WebSocket on the session (set before launch)."""
+    options.set_capability("webSocketUrl", True)
+
+
+def _bidi_command(driver, method, params):
+    """
+    Send one raw BiDi command over Selenium's WebSocket connection.
+
+    Selenium has no public API for raw commands, so this goes through its
+    private _start_bidi() / _websocket_connection (Selenium 4.16+).
+    """
+    def command():
+        result = yield {"method": method, "params": params}
+        return result
+
+    try:
+        if getattr(driver, '_websocket_connection', None) is None:
+            driver._start_bidi()
+        execute = driver._websocket_connection.execute
+    except AttributeError:
+        raise RuntimeError("this Selenium version has no BiDi WebSocket support")
+    return execute(command())
+
+
+def _origin(url):
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc}"
+
+
+def installed(driver):
+    """True if the capture hook is registered on driver's session."""
+    return getattr(driver, '_janitor_capture_installed', False)
+
+
+def install(driver, sucker_url):
+    """
+    Register the capture hook for sucker_url's origin on this session.
+
+    Returns:
+        True if the preload script is in place
+    """
+    if installed(driver):
+        return True
+    origin = _origin(sucker_url)
+    try:
+        _bidi_command(driver, "script.addPreloadScript", {
+            "functionDeclaration": PRELOAD_SCRIPT % {'origin': json.dumps(origin)},
+        })
+    except Exception as e:
+        print(f"[WARNING] Network capture unavailable ({e}); using the download button")
+        driver._janitor_capture_installed = False
+        return False
+    driver._janitor_capture_installed = True
+    return True
+
+
+def requery(driver):
+    """
+    Refresh the card data of the sucker.dev tab driver is on without
+    reloading it.
+
+    Returns:
+        True if the page's JSON endpoints are being fetched again
+    """
+    if not installed(driver):
+        return False
+    import sync
+    return driver.execute_script(REQUERY_SCRIPT, _origin(sync.SUCKER_URL)) > 0
+
+
+def card_payload(card):
+    """What "Download JSON" would save for a captured card object."""
+    if card.get('spec') or not isinstance(card.get('data'), dict):
+        return card
+    return card['data']
+
+
+def _captured_cards(driver, origin):
+    """(cards, index) as in sync.index_sucker_cards() for the captured names, or None."""
+    import sync
+
+    names = driver.execute_script(CARD_NAMES_SCRIPT, origin)
+    if names is None:
+        return None
+    cards = []
+    index = {}
+    for position, name in enumerate(names):
+        card = {'position': position, 'title': name, 'key': sync.normalize_name(name)}
+        cards.append(card)
+        index[card['key']] = card
+    return cards, index
+
+
+def wait_for_card(driver, char_name, timeout=None):
+    """
+    Wait for a captured response holding char_name's card on the current tab.
+
+    Only an exact title match is accepted, since earlier characters' cards
+    are in the same responses.
+
+    Returns:
+        The card's JSON data, or None (fall back to the download button)
+    """
+    import sync
+
+    if not installed(driver):
+        return None
+    origin = _origin(sync.SUCKER_URL)
+    key = sync.normalize_name(char_name)
+
+    def condition(d):
+        captured = _captured_cards(d, origin)
+        if captured is None:
+            return "not-hooked"
+        return captured[1].get(key) or False
+
+    try:
+        card = waits.wait_for(driver, "network_capture", condition,
+                              CAPTURE_TIMEOUT if timeout is None else timeout)
+    except Exception:
+        print(f"[CAPTURE] No captured response for '{char_name}', using the download button")
+        return None
+    if card == "not-hooked":
+        print("[CAPTURE] Capture hook not active on this page, using the download button")
+        return None
+
+    print(f"[CAPTURE] Matched captured card '{card['title']}'")
+    data = driver.execute_script(CARD_DATA_SCRIPT, card['position'])
+    return card_payload(data) if isinstance(data, dict) else None
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+On-disk journal of per-character sync progress.
+
+sync_character() runs a character as a fixed sequence of steps (STEPS).
+Each finished step is written to a small JSON journal under CHECKPOINT_DIR
+with its outputs (name, download path or captured JSON, image URL, saved
+paths) and the page it ran on. When a step fails, the retry (automatic,
+or the next ENTER in the interactive loop) picks the journal up and
+resumes at that step instead of starting over from STEP 1, so a failed
+image fetch doesn't send the name to the chatbox again. Journals are
+removed once the character is exported and ignored after CHECKPOINT_TTL.
+"""
+
+import hashlib
+import json
+import os
+import time
+
+# --- CONFIGURATION ---
+CHECKPOINT_DIR = os.path.join(
+    os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share"),
+    "janitor-dl", "checkpoints",
+)
+# Journals older than this (seconds) are stale and start over
+CHECKPOINT_TTL = 60 * 60
+
+# In order; the first five run in the browser, the rest on files
+STEPS = ("name", "name_sent", "json", "navigated_back", "image_url", "json_saved", "image_saved")
+BROWSER_STEPS = STEPS[:5]
+
+
+def _journal_path(url):
+    return os.path.join(CHECKPOINT_DIR, hashlib.sha1(url.encode('utf-8')).hexdigest()[:16] + ".json")
+
+
+class Journal:
+    """
+    Completed steps of one character's sync.
+
+    A Journal without a path lives in memory only (pool and pipeline
+    workers, CHECKPOINTS off) and doesn't record pages, which would cost a
+    round trip per step.
+    """
+
+    def __init__(self, url=None, path=None, data=None):
+        self.url = url
+        self.path = path
+        self.data = data or {'url': url, 'started': time.time(), 'steps': {}}
+
+    @property
+    def steps(self):
+        return self.data['steps']
+
+    def get(self, step):
+        """Outputs of step if it has completed, else None."""
+        return self.steps.get(step)
+
+    def done(self, step):
+        """True if step has completed (steps without outputs record {})."""
+        return step in self.steps
+
+    def next_step(self):
+        """The first step that hasn't completed (None when all have)."""
+        for step in STEPS:
+            if step not in self.steps:
+                return step
+        return None
+
+    def page_of(self, driver):
+        """The page to record with a step, or None if this journal doesn't track pages."""
+        return driver.current_url if self.path is not None else None
+
+    def record(self, step, page=None, **outputs):
+        """Mark step completed with its outputs and persist the journal."""
+        if page is not None:
+            outputs['page'] = page
+        self.steps[step] = outputs
+        self.save()
+
+    def forget(self, step):
+        """Mark step as not completed, so the next attempt runs it again."""
+        if self.steps.pop(step, None) is not None:
+            self.save()
+
+    def rewind(self, page):
+        """
+        Forget browser steps that ran after the last one recorded on page.
+
+        Resuming from the chat page after STEP 5 already left it means
+        STEP 5 and 6 have to run again; resuming from the character page
+        keeps them. Nothing is dropped when no step ran on page.
+        """
+        last = None
+        for step in BROWSER_STEPS:
+            if (self.steps.get(step) or {}).get('page') == page:
+                last = step
+        if last is None:
+            return
+        for step in BROWSER_STEPS[BROWSER_STEPS.index(last) + 1:]:
+            self.steps.pop(step, None)
+
+    def save(self):
+        if self.path is None:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except (OSError, TypeError, ValueError) as e:
+            print(f"[WARNING] Could not write checkpoint: {e}")
+            self.path = None
+
+    def clear(self):
+        """Forget all steps and delete the journal file."""
+        self.data['steps'] = {}
+        if self.path is not None:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+
+def _load(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or time.time() - data.get('started', 0) > CHECKPOINT_TTL:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        return None
+    return data
+
+
+def open_journal(url):
+    """
+    The journal for a character whose sync started on url, or whose
+    unfinished journal recorded a step on url (e.g. the character page
+    after STEP 5); a fresh one when there is none.
+    """
+    path = _journal_path(url)
+    data = _load(path)
+    if data is None and os.path.isdir(CHECKPOINT_DIR):
+        for name in os.listdir(CHECKPOINT_DIR):
+            if not name.endswith(".json"):
+                continue
+            candidate = _load(os.path.join(CHECKPOINT_DIR, name))
+            if candidate and any(entry.get('page') == url for entry in candidate['steps'].values()):
+                path, data = os.path.join(CHECKPOINT_DIR, name), candidate
+                break
+    if data is None:
+        return Journal(url, path)
+    journal = Journal(data['url'], path, data)
+    journal.rewind(url)
+    return journal
@@ -1,9 +1,11 @@
 #!/usr/bin/env python3
 """
 Main CLI entry point for janitor-dl.
-Provides a simple menu to access sync and setup_profile scripts.
+Provides a simple menu to access sync and setup_profile scripts,
+plus subcommands for non-interactive use.
 """
 
+import argparse
 import sys
 
 
@@ -16,23 +18,35 @@ def show_menu():
     print("  1. Start character sync (download characters)")
     print("  2. Setup Firefox profile")
     print("  3. Create new Firefox profile")
-    print("  4. Exit\n")
+    print("  4. Batch sync from a URL list")
+    print("  5. Exit\n")
     print("="*60 + "\n")
 
 
-def main():
-    """Main entry point with TUI menu."""
+def run_menu(prewarm=False):
+    """
+    Interactive TUI menu loop.
+    
+    Sync runs share one warm browser session (see session.py). With
+    prewarm=True, Firefox starts in the background while the menu is shown.
+    """
+    if prewarm:
+        from session import get_session
+        get_session().prewarm()
+    
     while True:
         show_menu()
         
         try:
-            choice = input("Select an option (1-4): ").strip()
+            choice = input("Select an option (1-5): ").strip()
             
             if choice == "1":
                 print("\n[INFO] Starting character sync...\n")
                 try:
                     from sync import main as sync_main
-                    sync_main()
+                    from session import get_session
+                    session = get_session()
+                    sync_main(driver=session.get(), relaunch=session.restart)
                 except KeyboardInterrupt:
                     print("\n[INFO] Sync interrupted by user.")
                 except Exception as e:
@@ -71,11 +85,29 @@ def main():
                 input("Press ENTER to return to menu...")
                 
             elif choice == "4":
+                source = input("Path to URL list (one character URL per line): ").strip()
+                if source:
+                    print("\n[INFO] Starting batch sync...\n")
+                    try:
+                        from batch import main as batch_main
+                        from session import get_session
+                        session = get_session()
+                        batch_main(source, driver=session.get(), relaunch=session.restart)
+                    except KeyboardInterrupt:
+                        print("\n[INFO] Batch sync interrupted by user.")
+                    except Exception as e:
+                        print(f"\n[ERROR] Batch sync failed: {e}")
+                        import traceback
+                        traceback.print_exc()
+                print("\n" + "="*60 + "\n")
+                input("Press ENTER to return to menu...")
+                
+            elif choice == "5":
                 print("\n[INFO] Exiting. Goodbye!\n")
                 sys.exit(0)
                 
             else:
-                print("\n[ERROR] Invalid choice. Please enter 1, 2, 3, or 4.\n")
+                print("\n[ERROR] Invalid choice. Please enter 1, 2, 3, 4, or 5.\n")
                 input("Press ENTER to continue...")
                 
         except KeyboardInterrupt:
@@ -86,6 +118,278 @@ def main():
             sys.exit(0)
 
 
+def build_parser():
+    """Build the argument parser for the janitor-dl subcommands."""
+    parser = argparse.ArgumentParser(
+        prog="janitor-dl",
+        description="Export JanitorAI characters through sucker.dev. "
+                    "Run without a command for the interactive menu.",
+    )
+    parser.add_argument(
+        "--prewarm", action="store_true",
+        help="Start Firefox in the background while the menu is shown"
+    )
+    parser.add_argument(
+        "--profile-mode", choices=["copy", "in-place", "slim"],
+        help="How Firefox gets the profile: full temp copy (default), "
+             "run on it directly, or a cached copy of just the login files"
+    )
+    parser.add_argument(
+        "--startup-report", action="store_true",
+        help="Measure per-module import time and time to the first prompt, then exit"
+    )
+    parser.add_argument(
+        "--lean", action="store_true",
+        help="Faster page loads: eager load strategy, no web fonts or media, "
+             "and no images on the sucker.dev tab"
+    )
+    parser.add_argument(
+        "--capture", action="store_true",
+        help="Take the character JSON from sucker.dev's network responses (WebDriver BiDi) "
+             "instead of the download button"
+    )
+    parser.add_argument(
+        "--pack", action="store_true",
+        help="Also write a SillyTavern character card (PNG with embedded JSON) for each synced character"
+    )
+    parser.add_argument(
+        "--image-format", choices=["png", "webp", "webp-lossless"],
+        help="Re-encode each synced avatar as optimized PNG, WebP or lossless WebP"
+    )
+    parser.add_argument(
+        "--image-max-size", metavar="WxH",
+        help="With --image-format: shrink avatars larger than WxH"
+    )
+    parser.add_argument(
+        "--retries", type=int, metavar="N",
+        help="Retry a failed step up to N times, resuming where it failed (default: 2)"
+    )
+    parser.add_argument(
+        "--recycle-after", type=int, metavar="N",
+        help="Restart Firefox after N characters, 0 for never (default: 100)"
+    )
+    parser.add_argument(
+        "--recycle-rss", type=int, metavar="MB",
+        help="Restart Firefox once its processes use more than MB of memory, 0 for never (default: 2500)"
+    )
+    parser.add_argument(
+        "--trace-rpc", action="store_true",
+        help="Count WebDriver round trips per calling function and print a report after each character"
+    )
+    parser.add_argument(
+        "--cprofile", metavar="PATH",
+        help="Run under cProfile and save the stats to PATH"
+    )
+    subparsers = parser.add_subparsers(dest="command")
+    
+    batch_parser = subparsers.add_parser(
+        "batch", help="Sync every character URL in a file without prompts"
+    )
+    batch_parser.add_argument(
+        "source", help="File with one character URL per line, or '-' to read stdin"
+    )
+    batch_parser.add_argument(
+        "--results", metavar="PATH",
+        help="JSONL file for per-character result records "
+             "(default: janitor-dl-batch.jsonl in the download folder)"
+    )
+    batch_parser.add_argument(
+        "--pipeline", action="store_true",
+        help="Overlap file post-processing with the next character's browser steps"
+    )
+    batch_parser.add_argument(
+        "--workers", type=int, metavar="N",
+        help="Post-processing threads per pipeline stage (default: 2)"
+    )
+    batch_parser.add_argument(
+        "--browsers", type=int, default=1, metavar="N",
+        help="Export with N Firefox sessions in parallel (default: 1)"
+    )
+    batch_parser.add_argument(
+        "--host-concurrency", type=int, metavar="N",
+        help="With --browsers: most sessions on one site at once (default: 2)"
+    )
+    batch_parser.add_argument(
+        "--rate", type=float, metavar="PER_MIN",
+        help="With --browsers: most characters started per minute per site, 0 for no limit (default: 20)"
+    )
+    batch_parser.add_argument(
+        "--ttl", type=float, metavar="DAYS",
+        help="Re-export characters whose last export is older than DAYS days"
+    )
+    batch_parser.add_argument(
+        "--force", action="store_true",
+        help="Export every character, even ones already in the export manifest"
+    )
+    
+    pack_parser = subparsers.add_parser(
+        "pack", help="Embed each exported JSON into its PNG as a SillyTavern character card"
+    )
+    pack_parser.add_argument(
+        "directory", nargs="?",
+        help="Export folder with <name>.json / <name>.png pairs (default: the download folder)"
+    )
+    pack_parser.add_argument(
+        "--out", metavar="PATH",
+        help="Folder for the cards (default: cards/ inside the export folder)"
+    )
+    pack_parser.add_argument(
+        "--workers", type=int, metavar="N",
+        help="Worker processes (default: one per CPU core)"
+    )
+    
+    transcode_parser = subparsers.add_parser(
+        "transcode", help="Re-encode and optionally shrink every exported image in a folder"
+    )
+    transcode_parser.add_argument(
+        "directory", nargs="?",
+        help="Export folder (default: the download folder)"
+    )
+    transcode_parser.add_argument(
+        "--format", choices=["png", "webp", "webp-lossless"], default="png",
+        help="Output format (default: optimized png)"
+    )
+    transcode_parser.add_argument(
+        "--max-size", metavar="WxH",
+        help="Shrink images larger than WxH, keeping the aspect ratio"
+    )
+    transcode_parser.add_argument(
+        "--keep-metadata", action="store_true",
+        help="Keep EXIF and ICC data instead of stripping it"
+    )
+    transcode_parser.add_argument(
+        "--workers", type=int, metavar="N",
+        help="Worker processes (default: one per CPU core)"
+    )
+    
+    gc_parser = subparsers.add_parser(
+        "gc", help="Delete stored export blobs that no file refers to any more"
+    )
+    gc_parser.add_argument(
+        "--dir", metavar="PATH",
+        help="Output folder holding the blob store (default: the download folder)"
+    )
+    gc_parser.add_argument(
+        "--dry-run", action="store_true",
+        help="Only report what would be deleted"
+    )
+    
+    stats_parser = subparsers.add_parser(
+        "stats", help="Show p50/p95/p99 timings per sync step across past runs"
+    )
+    stats_parser.add_argument(
+        "--file", metavar="PATH",
+        help="Timing spans file (default: ~/.local/share/janitor-dl/spans.jsonl)"
+    )
+    stats_parser.add_argument(
+        "--since", type=float, metavar="DAYS",
+        help="Only include characters synced in the last DAYS days"
+    )
+    stats_parser.add_argument(
+        "--step", metavar="NAME",
+        help="Only show one step (e.g. step4_download_json)"
+    )
+    
+    return parser
+
+
+def main(argv=None):
+    """Main entry point: run a subcommand, or the TUI menu when none is given."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.image_max_size and not args.image_format:
+        parser.error("--image-max-size requires --image-format")
+    
+    if args.startup_report:
+        from startup import main as startup_main
+        sys.exit(startup_main())
+    
+    if args.profile_mode:
+        import sync
+        sync.PROFILE_MODE = args.profile_mode
+    
+    if args.lean:
+        import sync
+        sync.LEAN_MODE = True
+    
+    if args.capture:
+        import sync
+        sync.NETWORK_CAPTURE = True
+    
+    if args.pack:
+        import sync
+        sync.PACK_CARDS = True
+    
+    if args.image_format:
+        import sync
+        from transcode import parse_size
+        sync.IMAGE_FORMAT = args.image_format
+        if args.image_max_size:
+            try:
+                sync.IMAGE_MAX_SIZE = parse_size(args.image_max_size)
+            except ValueError as e:
+                parser.error(f"--image-max-size: {e}")
+    
+    if args.command == "transcode" and args.max_size:
+        from transcode import parse_size
+        try:
+            args.max_size = parse_size(args.max_size)
+        except ValueError as e:
+            parser.error(f"--max-size: {e}")
+    
+    if args.retries is not None:
+        import sync
+        sync.STEP_RETRIES = args.retries
+    
+    if args.recycle_after is not None or args.recycle_rss is not None:
+        import resources
+        if args.recycle_after is not None:
+            resources.RECYCLE_AFTER_CHARACTERS = args.recycle_after
+        if args.recycle_rss is not None:
+            resources.RECYCLE_RSS_MB = args.recycle_rss
+    
+    if args.trace_rpc:
+        import rpcstats
+        rpcstats.enable()
+    
+    if args.cprofile:
+        from rpcstats import profiled
+        with profiled(args.cprofile):
+            run_command(args)
+    else:
+        run_command(args)
+
+
+def run_command(args):
+    """Run the selected subcommand, or the menu when none was given."""
+    if args.command == "batch":
+        from batch import main as batch_main
+        sys.exit(batch_main(
+            args.source, args.results, args.pipeline, args.workers,
+            args.browsers, args.host_concurrency, args.rate,
+            ttl_days=args.ttl, force=args.force,
+        ))
+    
+    if args.command == "pack":
+        from pack import main as pack_main
+        sys.exit(pack_main(args.directory, args.out, args.workers))
+    
+    if args.command == "transcode":
+        from transcode import main as transcode_main
+        sys.exit(transcode_main(args.directory, args.format, args.max_size,
+                                not args.keep_metadata, args.workers))
+    
+    if args.command == "gc":
+        from blobstore import gc_main
+        sys.exit(gc_main(args.dir, args.dry_run))
+    
+    if args.command == "stats":
+        from timing import stats_main
+        sys.exit(stats_main(args.file, args.since, args.step))
+    
+    run_menu(prewarm=args.prewarm)
+
+
 if __name__ == "__main__":
     main()
 
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Download-completion watcher for DOWNLOAD_PATH.
+
+Firefox writes a download to "<name>.part" (next to an empty "<name>"
+placeholder) and renames it once the last byte is on disk. The watcher
+snapshots the directory before a download is triggered, waits for a new
+file whose .part companion has gone away, then renames it to a
+deterministic "<char_name>.json".
+"""
+
+import os
+import re
+import threading
+import time
+
+# --- CONFIGURATION ---
+DOWNLOAD_TIMEOUT = 60
+POLL_INTERVAL = 0.1
+
+# Temporary files Firefox leaves around while a download is in flight
+PARTIAL_SUFFIXES = (".part", ".crdownload", ".tmp")
+
+
+def safe_filename(name):
+    """Turn a character name into something safe to use as a file name."""
+    cleaned = re.sub(r'[\\/:*?"<>|\x00-\x1f]', '_', name).strip().strip('.')
+    return cleaned or "character"
+
+
+# Files janitor-dl itself put in place ({abs path: inode}), so a rename or
+# relink done while another character's download is being watched isn't
+# mistaken for that download
+_claimed = {}
+_claimed_lock = threading.Lock()
+
+
+def claim(path, source=None):
+    """
+    Mark path as produced by janitor-dl rather than by a browser download.
+
+    Call before renaming `source` to path, so the file is claimed before it
+    appears; the inode (which a rename keeps) identifies it.
+    """
+    try:
+        inode = os.stat(source or path).st_ino
+    except OSError:
+        return
+    with _claimed_lock:
+        _claimed[os.path.abspath(path)] = inode
+
+
+def snapshot(directory):
+    """
+    Return {file name: (inode, mtime)} for everything currently in directory.
+
+    Keeping the file identity means a name that is renamed away and then
+    reused by a later download still counts as new.
+    """
+    entries = {}
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                try:
+                    stat = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                entries[entry.name] = (stat.st_ino, stat.st_mtime_ns)
+    except FileNotFoundError:
+        pass
+    return entries
+
+
+def _new_names(directory, before):
+    """Names in directory that are not in the `before` snapshot (or changed identity)."""
+    current = snapshot(directory)
+    directory = os.path.abspath(directory)
+    return [
+        name for name, identity in current.items()
+        if before.get(name) != identity
+        and _claimed.get(os.path.join(directory, name)) != identity[0]
+    ]
+
+
+def _is_partial(name):
+    return name.endswith(PARTIAL_SUFFIXES)
+
+
+def _target_name(name):
+    """Strip a partial-download suffix to get the name the file will finish at."""
+    for partial in PARTIAL_SUFFIXES:
+        if name.endswith(partial):
+            return name[:-len(partial)]
+    return name
+
+
+def wait_for_download_start(directory, before, timeout=DOWNLOAD_TIMEOUT, suffix=".json"):
+    """
+    Wait until a download that started after the `before` snapshot shows up.
+
+    Returns:
+        Path the download will have once it has finished (it may still be
+        in flight - pass it to wait_for_file())
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        new_files = _new_names(directory, before)
+        # Finished files / placeholders first, then in-flight .part files
+        for name in sorted(new_files, key=_is_partial):
+            target = _target_name(name)
+            if target.endswith(suffix):
+                return os.path.join(directory, target)
+        time.sleep(POLL_INTERVAL)
+    raise TimeoutError(f"No download started in {directory} after {timeout}s")
+
+
+def wait_for_file(path, timeout=DOWNLOAD_TIMEOUT):
+    """
+    Wait until path exists, is non-empty and has no partial companion left.
+
+    Returns:
+        path
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        in_flight = any(os.path.exists(path + partial) for partial in PARTIAL_SUFFIXES)
+        try:
+            # Firefox keeps an empty placeholder until the .part is renamed
+            if not in_flight and os.path.getsize(path) > 0:
+                return path
+        except OSError:
+            pass
+        time.sleep(POLL_INTERVAL)
+    raise TimeoutError(f"Download {path} did not finish after {timeout}s")
+
+
+def finalize_download(path, char_name, directory=None, suffix=".json"):
+    """
+    Atomically rename a finished download to "<char_name><suffix>".
+
+    Returns:
+        The final path
+    """
+    directory = directory or os.path.dirname(path)
+    final_path = os.path.join(directory, safe_filename(char_name) + suffix)
+    if os.path.abspath(path) != os.path.abspath(final_path):
+        claim(final_path, source=path)
+        os.replace(path, final_path)
+    return final_path
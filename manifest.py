@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+SQLite manifest of exported characters.
+
+One row per character, keyed by the character ID from its URL (or the
+normalized URL when it has none), with the name, export time, SHA-256 of
+the JSON and PNG, and their paths. Batch runs consult it to skip
+characters whose files are still on disk unchanged, and re-export only
+those older than a TTL.
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from urllib.parse import urlparse
+
+# --- CONFIGURATION ---
+MANIFEST_PATH = os.path.join(
+    os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share"),
+    "janitor-dl", "manifest.sqlite3",
+)
+
+UUID_RE = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", re.I)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS exports (
+    key         TEXT PRIMARY KEY,
+    url         TEXT NOT NULL,
+    name        TEXT NOT NULL,
+    exported_at REAL NOT NULL,
+    json_path   TEXT NOT NULL,
+    json_sha256 TEXT NOT NULL,
+    json_stat   TEXT NOT NULL,
+    png_path    TEXT NOT NULL,
+    png_sha256  TEXT NOT NULL,
+    png_stat    TEXT NOT NULL
+)
+"""
+
+
+def character_key(url):
+    """
+    Stable manifest key for a character URL.
+
+    JanitorAI character and chat URLs carry a UUID; that is used when
+    present so different URL forms of one character share a row.
+    """
+    match = UUID_RE.search(url)
+    if match:
+        return f"janitorai:{match.group(0).lower()}"
+    parsed = urlparse(url.strip())
+    return f"{parsed.netloc.lower()}{parsed.path.rstrip('/')}"
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def file_stat(path):
+    """Cheap change signature: 'size:mtime_ns'."""
+    st = os.stat(path)
+    return f"{st.st_size}:{st.st_mtime_ns}"
+
+
+def _unchanged(path, sha256, stat):
+    """True if path still holds the exported content (hashing only when the stat moved)."""
+    try:
+        if file_stat(path) == stat:
+            return True
+        return file_sha256(path) == sha256
+    except OSError:
+        return False
+
+
+class Manifest:
+    """Thread-safe handle on the manifest database."""
+
+    def __init__(self, path=None):
+        self.path = path or MANIFEST_PATH
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(SCHEMA)
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    def get(self, url):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT * FROM exports WHERE key = ?", (character_key(url),)
+            ).fetchone()
+
+    def is_current(self, url, ttl=None):
+        """
+        True if url was exported, its files are unchanged on disk and the
+        export is younger than ttl seconds (ttl=None: never expires).
+        """
+        row = self.get(url)
+        if row is None:
+            return False
+        if ttl is not None and time.time() - row['exported_at'] > ttl:
+            return False
+        return (_unchanged(row['json_path'], row['json_sha256'], row['json_stat'])
+                and _unchanged(row['png_path'], row['png_sha256'], row['png_stat']))
+
+    def pending(self, urls, ttl=None):
+        """
+        Split urls into those that need exporting and those that are current.
+
+        Returns:
+            (urls to export, urls skipped)
+        """
+        todo, skipped = [], []
+        for url in urls:
+            (skipped if self.is_current(url, ttl) else todo).append(url)
+        return todo, skipped
+
+    def record(self, url, result):
+        """Store a finished export (a sync_character() result dict)."""
+        json_path = os.path.abspath(result['json_path'])
+        png_path = os.path.abspath(result['image_path'])
+        row = (
+            character_key(url), url, result['name'], time.time(),
+            json_path, file_sha256(json_path), file_stat(json_path),
+            png_path, file_sha256(png_path), file_stat(png_path),
+        )
+        with self._lock:
+            other = self._conn.execute(
+                "SELECT url FROM exports WHERE png_path = ? AND key != ?", (png_path, row[0])
+            ).fetchone()
+            if other is not None:
+                print(f"[WARNING] {os.path.basename(png_path)} was previously exported "
+                      f"from {other['url']} and has been overwritten")
+                self._conn.execute("DELETE FROM exports WHERE png_path = ? AND key != ?",
+                                   (png_path, row[0]))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO exports VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", row
+            )
+            self._conn.commit()
+
+    def update_image(self, old_path, new_path):
+        """Point rows exported with old_path at new_path (e.g. after transcoding)."""
+        new_path = os.path.abspath(new_path)
+        row = (new_path, file_sha256(new_path), file_stat(new_path), os.path.abspath(old_path))
+        with self._lock:
+            self._conn.execute(
+                "UPDATE exports SET png_path = ?, png_sha256 = ?, png_stat = ? WHERE png_path = ?", row
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_manifest = None
+_manifest_lock = threading.Lock()
+
+
+def get_manifest():
+    """The process-wide Manifest."""
+    global _manifest
+    with _manifest_lock:
+        if _manifest is None:
+            _manifest = Manifest()
+        return _manifest
+
+
+def record_export(url, result):
+    """Record a finished export, warning instead of failing the sync on errors."""
+    try:
+        get_manifest().record(url, result)
+    except (OSError, sqlite3.Error) as e:
+        print(f"[WARNING] Could not update export manifest: {e}")
+
+
+def previous_export(url):
+    """The manifest row for url, or None (warning instead of failing the sync on errors)."""
+    try:
+        return get_manifest().get(url)
+    except (OSError, sqlite3.Error) as e:
+        print(f"[WARNING] Could not read export manifest: {e}")
+        return None
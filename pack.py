@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Pack exported <name>.json + <name>.png pairs into single PNG character cards.
+
+SillyTavern reads a character card's JSON from a PNG tEXt chunk with the
+keyword "chara" holding the base64-encoded JSON. The card is written by
+copying the PNG's chunks and inserting that tEXt chunk after IHDR, so the
+image data is never decoded or re-compressed. A second tEXt chunk records
+the hashes of the source pair, and a pair whose card already carries the
+same hashes is skipped.
+
+`janitor-dl pack` packs a whole export folder on a process pool, with a
+bounded number of pairs in flight so memory stays flat for any folder
+size. sync can also pack each character as it finishes (PACK_CARDS).
+"""
+
+import base64
+import hashlib
+import json
+import os
+import struct
+import sys
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+# --- CONFIGURATION ---
+CARD_DIR_NAME = "cards"
+CARD_KEYWORD = b"chara"
+SOURCE_KEYWORD = b"janitor-dl-source"
+# Pairs queued per worker process
+IN_FLIGHT_PER_WORKER = 4
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def _chunk(chunk_type, data):
+    crc = zlib.crc32(chunk_type + data) & 0xffffffff
+    return struct.pack(">I", len(data)) + chunk_type + data + struct.pack(">I", crc)
+
+
+def _text_chunk(keyword, text):
+    return _chunk(b"tEXt", keyword + b"\x00" + text)
+
+
+def _iter_chunks(f):
+    """Yield (type, data) for each chunk of an open PNG positioned after the signature."""
+    while True:
+        header = f.read(8)
+        if len(header) < 8:
+            return
+        length, chunk_type = struct.unpack(">I4s", header)
+        data = f.read(length)
+        f.read(4)  # CRC
+        yield chunk_type, data
+        if chunk_type == b"IEND":
+            return
+
+
+def pair_digest(json_path, png_path):
+    """Hash identifying a (JSON, PNG) pair's content."""
+    digest = hashlib.sha256()
+    for path in (json_path, png_path):
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 16), b""):
+                digest.update(block)
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+def card_source(card_path):
+    """The source hash recorded in an existing card, or None."""
+    try:
+        with open(card_path, 'rb') as f:
+            if f.read(8) != PNG_SIGNATURE:
+                return None
+            for chunk_type, data in _iter_chunks(f):
+                if chunk_type == b"tEXt":
+                    keyword, _, text = data.partition(b"\x00")
+                    if keyword == SOURCE_KEYWORD:
+                        return text.decode('ascii', 'replace')
+                elif chunk_type == b"IDAT":
+                    return None
+    except OSError:
+        return None
+    return None
+
+
+def _png_bytes_source(png_path):
+    """Open png_path as a PNG stream, converting with Pillow if it isn't one."""
+    f = open(png_path, 'rb')
+    if f.read(8) == PNG_SIGNATURE:
+        return f
+    f.close()
+    from io import BytesIO
+    from PIL import Image
+
+    out = BytesIO()
+    with Image.open(png_path) as img:
+        img.save(out, format="PNG")
+    out.seek(len(PNG_SIGNATURE))
+    return out
+
+
+def pack_pair(json_path, png_path, card_path):
+    """
+    Write card_path: png_path's image with json_path embedded as a "chara" chunk.
+
+    Returns:
+        'packed' or 'skipped' (card already holds this exact pair)
+    """
+    source = pair_digest(json_path, png_path)
+    if card_source(card_path) == source:
+        return "skipped"
+
+    with open(json_path, 'rb') as f:
+        raw = f.read()
+    json.loads(raw.decode('utf-8'))  # refuse to embed a broken export
+    text_chunks = (_text_chunk(SOURCE_KEYWORD, source.encode('ascii'))
+                   + _text_chunk(CARD_KEYWORD, base64.b64encode(raw)))
+
+    os.makedirs(os.path.dirname(card_path) or ".", exist_ok=True)
+    tmp_path = f"{card_path}.part"
+    with _png_bytes_source(png_path) as src, open(tmp_path, 'wb') as out:
+        out.write(PNG_SIGNATURE)
+        for chunk_type, data in _iter_chunks(src):
+            if chunk_type == b"tEXt" and data.partition(b"\x00")[0] in (CARD_KEYWORD, SOURCE_KEYWORD):
+                continue
+            out.write(_chunk(chunk_type, data))
+            if chunk_type == b"IHDR":
+                out.write(text_chunks)
+    os.replace(tmp_path, card_path)
+    return "packed"
+
+
+def card_path_for(json_path, out_dir=None):
+    """Where the card for <name>.json goes (default: <export dir>/cards/<name>.png)."""
+    directory = os.path.dirname(os.path.abspath(json_path))
+    stem = os.path.splitext(os.path.basename(json_path))[0]
+    return os.path.join(out_dir or os.path.join(directory, CARD_DIR_NAME), stem + ".png")
+
+
+def find_pairs(directory):
+    """
+    Yield (json_path, image_path) for every <name>.json with a matching
+    <name>.png (or <name>.webp, which is converted to PNG for the card).
+    """
+    with os.scandir(directory) as it:
+        for entry in it:
+            if not entry.name.endswith(".json") or not entry.is_file():
+                continue
+            stem = os.path.join(directory, entry.name[:-len(".json")])
+            for suffix in (".png", ".webp"):
+                if os.path.isfile(stem + suffix):
+                    yield entry.path, stem + suffix
+                    break
+
+
+def _pack_job(args):
+    json_path, png_path, card_path = args
+    try:
+        return json_path, pack_pair(json_path, png_path, card_path), None
+    except Exception as e:
+        return json_path, "failed", f"{type(e).__name__}: {e}"
+
+
+def pack_directory(directory, out_dir=None, workers=None):
+    """
+    Pack every pair in directory on a process pool.
+
+    Returns:
+        Counts per outcome: {'packed': n, 'skipped': n, 'failed': n}
+    """
+    workers = workers or os.cpu_count() or 1
+    counts = {'packed': 0, 'skipped': 0, 'failed': 0}
+    jobs = ((j, p, card_path_for(j, out_dir)) for j, p in find_pairs(directory))
+
+    def collect(done):
+        for future in done:
+            json_path, outcome, error = future.result()
+            counts[outcome] += 1
+            if error:
+                print(f"[ERROR] {os.path.basename(json_path)}: {error}")
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        in_flight = set()
+        for job in jobs:
+            if len(in_flight) >= workers * IN_FLIGHT_PER_WORKER:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                collect(done)
+            in_flight.add(executor.submit(_pack_job, job))
+        collect(wait(in_flight).done)
+    return counts
+
+
+def main(directory=None, out_dir=None, workers=None):
+    """Entry point for `janitor-dl pack`."""
+    if directory is None:
+        import sync
+        directory = sync.DOWNLOAD_PATH
+    directory = os.path.expanduser(directory)
+    out_dir = os.path.expanduser(out_dir) if out_dir else None
+
+    if not os.path.isdir(directory):
+        print(f"[ERROR] Export folder not found: {directory}")
+        return 1
+
+    print(f"[PACK] Packing character cards from {directory} "
+          f"into {out_dir or os.path.join(directory, CARD_DIR_NAME)}...")
+    started = time.monotonic()
+    counts = pack_directory(directory, out_dir, workers)
+    elapsed = time.monotonic() - started
+    total = sum(counts.values())
+    rate = total / elapsed if elapsed else 0.0
+    print(f"[PACK] {counts['packed']} packed, {counts['skipped']} unchanged, "
+          f"{counts['failed']} failed in {elapsed:.1f}s ({rate:.0f} pairs/s)")
+    return 0 if not counts['failed'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1] if len(sys.argv) > 1 else None))
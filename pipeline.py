@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Staged sync pipeline for batch runs.
+
+The browser-bound part of each character (sync.browse_character) runs on
+the driver thread. Finishing the JSON download, converting and writing the
+image, and verifying the outputs run on worker threads fed through bounded
+queues, so character N's post-processing overlaps with character N+1's
+browser steps. A full queue blocks the stage in front of it, which keeps
+memory bounded when post-processing falls behind.
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+
+import resources
+import timing
+
+# --- CONFIGURATION ---
+DEFAULT_WORKERS = 2
+DEFAULT_QUEUE_SIZE = 4
+
+_STOP = object()
+
+
+class Stage:
+    """A pipeline stage: an input queue plus utilization/depth counters."""
+
+    def __init__(self, name, workers=1, queue_size=DEFAULT_QUEUE_SIZE):
+        self.name = name
+        self.workers = workers
+        self.queue = queue.Queue(maxsize=queue_size) if queue_size else None
+        self.processed = 0
+        self.failed = 0
+        self.busy = 0.0
+        self.depth_total = 0
+        self.depth_samples = 0
+        self.depth_max = 0
+        self._lock = threading.Lock()
+
+    def put(self, item):
+        """Queue an item for this stage, blocking while the queue is full."""
+        self.queue.put(item)
+        self.sample_depth(self.queue.qsize())
+
+    def sample_depth(self, depth):
+        with self._lock:
+            self.depth_total += depth
+            self.depth_samples += 1
+            self.depth_max = max(self.depth_max, depth)
+
+    def record(self, seconds, ok=True):
+        with self._lock:
+            self.busy += seconds
+            self.processed += 1
+            if not ok:
+                self.failed += 1
+
+    def stats(self, wall):
+        """Summary dict for this stage over a run that took `wall` seconds."""
+        capacity = wall * self.workers
+        return {
+            'stage': self.name,
+            'workers': self.workers,
+            'processed': self.processed,
+            'failed': self.failed,
+            'busy': round(self.busy, 3),
+            'utilization': round(self.busy / capacity, 3) if capacity > 0 else 0.0,
+            'queue_avg': round(self.depth_total / self.depth_samples, 2) if self.depth_samples else 0.0,
+            'queue_max': self.depth_max,
+        }
+
+
+def print_stage_report(stats):
+    """Print per-stage utilization and queue depth."""
+    print("  Stage       Workers  Items  Failed  Busy(s)  Util   Queue avg/max")
+    for s in stats:
+        print(f"  {s['stage']:<11} {s['workers']:>7}  {s['processed']:>5}  {s['failed']:>6}  "
+              f"{s['busy']:>7.1f}  {s['utilization'] * 100:>4.0f}%  "
+              f"{s['queue_avg']:>5.1f}/{s['queue_max']}")
+
+
+class Pipeline:
+    """
+    browser (driver thread) -> finish (thread pool) -> verify (thread pool)
+
+    Each finished record is passed to on_record (called from worker threads,
+    serialized by a lock).
+    """
+
+    def __init__(self, driver, workers=DEFAULT_WORKERS, queue_size=DEFAULT_QUEUE_SIZE,
+                 on_record=None, relaunch=None):
+        self.driver = driver
+        self.on_record = on_record
+        self.relaunch = relaunch
+        self.recycler = resources.BrowserRecycler()
+        self.browser = Stage("browser", workers=1, queue_size=0)
+        self.finish = Stage("finish", workers=workers, queue_size=queue_size)
+        self.verify = Stage("verify", workers=workers, queue_size=queue_size)
+        self.records = []
+        self.wall = 0.0
+        self._records_lock = threading.Lock()
+        # Characters handed to the finish stage and not done with it yet
+        self._unfinished = 0
+        self._finish_idle = threading.Condition()
+
+    def _emit(self, record, started, trace):
+        record['duration'] = round(time.monotonic() - started, 3)
+        if record['success']:
+            trace.write("ok")
+        else:
+            trace.write("error", record['error'])
+        with self._records_lock:
+            self.records.append(record)
+            if self.on_record:
+                self.on_record(record)
+
+    def _start_workers(self, stage, handler, next_stage):
+        """Start stage.workers threads running handler(record, payload) -> payload."""
+        def worker():
+            while True:
+                item = stage.queue.get()
+                if item is _STOP:
+                    break
+                record, payload, started, trace = item
+                t0 = time.monotonic()
+                try:
+                    with timing.active(trace):
+                        result = handler(record, payload)
+                except Exception as e:
+                    stage.record(time.monotonic() - t0, ok=False)
+                    record['error'] = f"{type(e).__name__}: {e}"
+                    print(f"[ERROR] {stage.name} failed for {record['url']}: {record['error']}")
+                    self._emit(record, started, trace)
+                    continue
+                stage.record(time.monotonic() - t0)
+                if next_stage is None:
+                    self._emit(record, started, trace)
+                else:
+                    next_stage.put((record, result, started, trace))
+
+        threads = [
+            threading.Thread(target=worker, name=f"{stage.name}-{i}", daemon=True)
+            for i in range(stage.workers)
+        ]
+        for thread in threads:
+            thread.start()
+        return threads
+
+    @staticmethod
+    def _stop_workers(stage, threads):
+        for _ in threads:
+            stage.queue.put(_STOP)
+        for thread in threads:
+            thread.join()
+
+    def _finish(self, record, pending):
+        import sync
+        try:
+            result = sync.finish_character(pending)
+        finally:
+            with self._finish_idle:
+                self._unfinished -= 1
+                self._finish_idle.notify_all()
+        record.update(json_path=result['json_path'], image_path=result['image_path'])
+        return result
+
+    def _queue_finish(self, item):
+        with self._finish_idle:
+            self._unfinished += 1
+        self.finish.put(item)
+
+    def _drain_finish(self):
+        """Block until the finish stage has every queued character on disk."""
+        with self._finish_idle:
+            self._finish_idle.wait_for(lambda: self._unfinished == 0)
+
+    @staticmethod
+    def _verify(record, result):
+        import manifest
+        import sync
+        sync.verify_outputs(result)
+        manifest.record_export(record['url'], result)
+        record['success'] = True
+        return result
+
+    def _browse(self, url):
+        """Run the browser stage for one URL on the driver thread."""
+        import sync
+        from batch import new_record
+
+        record = new_record(url)
+        started = time.monotonic()
+        # The trace follows the character through the worker threads
+        trace = timing.Trace(url)
+        try:
+            with timing.active(trace):
+                self.driver.get(url)
+                pending = sync.browse_character(self.driver)
+        except KeyboardInterrupt:
+            raise
+        except Exception as e:
+            self.browser.record(time.monotonic() - started, ok=False)
+            record['error'] = f"{type(e).__name__}: {e}"
+            print(f"[ERROR] {url}: {record['error']}")
+            try:
+                sync.close_extra_tabs(self.driver)
+            except Exception:
+                pass
+            self._recycle(record)
+            self._emit(record, started, trace)
+            return
+        self.browser.record(time.monotonic() - started)
+        record['name'] = pending['name']
+        item = (record, pending, started, trace)
+        queued = []
+
+        def hand_off():
+            queued.append(item)
+            self._queue_finish(item)
+
+        self._recycle(record, hand_off)
+        if not queued:
+            self._queue_finish(item)
+
+    def _recycle(self, record, hand_off=None):
+        """
+        Sample the browser into record and restart it if it is due (driver
+        thread only).
+
+        The finish stage is drained before a restart: only then are the
+        downloads Firefox started for earlier characters (and for this one,
+        handed over through hand_off) complete on disk.
+        """
+        import sync
+
+        def before_restart():
+            if hand_off is not None:
+                hand_off()
+            print("[RECYCLE] Waiting for downloads in flight to finish...")
+            self._drain_finish()
+
+        try:
+            self.driver = sync.recycle_if_due(self.driver, self.recycler, self.relaunch, record,
+                                              before_restart)
+        except Exception as e:
+            print(f"[WARNING] Browser check failed: {e}")
+
+    def run(self, urls):
+        """Push every URL through the pipeline. Returns records in completion order."""
+        started = time.monotonic()
+        verify_threads = self._start_workers(self.verify, self._verify, None)
+        finish_threads = self._start_workers(self.finish, self._finish, self.verify)
+        try:
+            for i, url in enumerate(urls, 1):
+                print("\n" + "="*60)
+                print(f"  [{i}/{len(urls)}] {url}")
+                print("="*60)
+                self.browser.sample_depth(len(urls) - i)
+                self._browse(url)
+        finally:
+            self._stop_workers(self.finish, finish_threads)
+            self._stop_workers(self.verify, verify_threads)
+            self.wall = time.monotonic() - started
+        return self.records
+
+    def stats(self):
+        """Per-stage stats for the last run."""
+        return [stage.stats(self.wall) for stage in (self.browser, self.finish, self.verify)]
+
+
+def run_pipeline(urls, results_path=None, driver=None, workers=DEFAULT_WORKERS,
+                 queue_size=DEFAULT_QUEUE_SIZE, relaunch=None):
+    """
+    Batch-sync urls through the staged pipeline.
+
+    Same arguments and result records as batch.run_batch(), plus the stage
+    report printed after the summary.
+    """
+    import sync
+    from batch import print_summary
+
+    if driver is None:
+        print("[INIT] Launching Firefox via Selenium...")
+        driver = sync.get_firefox_driver()
+
+    results_file = open(os.path.expanduser(results_path), 'a') if results_path else None
+
+    def write_record(record):
+        if results_file:
+            results_file.write(json.dumps(record) + "\n")
+            results_file.flush()
+
+    pipeline = Pipeline(driver, workers=workers, queue_size=queue_size, on_record=write_record,
+                        relaunch=relaunch)
+    try:
+        pipeline.run(urls)
+    except KeyboardInterrupt:
+        print("\n[INFO] Batch interrupted by user.")
+    finally:
+        if results_file:
+            results_file.close()
+
+    print_summary(pipeline.records, pipeline.wall)
+    print("  Pipeline stages:")
+    print_stage_report(pipeline.stats())
+    print("="*60 + "\n")
+    return pipeline.records
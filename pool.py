@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Multi-browser worker pool for parallel batch export.
+
+Starts N Firefox sessions. Each one gets its own throwaway profile copy
+(FirefoxProfile copies PROFILE_PATH to a temp dir on every launch) and its
+own download directory, so downloads from different workers can't be
+mistaken for each other. Workers pull characters from one shared queue.
+A per-host limiter caps how many workers talk to a site at once and how
+often a new character may start there. Finished files are moved into the
+normal DOWNLOAD_PATH. If a worker's browser dies, its item goes back on
+the queue and the worker relaunches.
+"""
+
+import json
+import os
+import queue
+import shutil
+import threading
+import time
+from urllib.parse import urlparse
+
+import manifest
+import resources
+import timing
+
+# --- CONFIGURATION ---
+DEFAULT_BROWSERS = 2
+# Most workers allowed on one host at the same time
+DEFAULT_HOST_CONCURRENCY = 2
+# Most characters started per minute against one host (0 = unlimited)
+DEFAULT_RATE_PER_MINUTE = 20
+# How often an item is retried after its worker's browser crashed
+MAX_REQUEUES = 2
+
+WORKER_DIR_NAME = ".janitor-dl-workers"
+
+
+class HostLimiter:
+    """Per-host concurrency cap plus a minimum spacing between starts."""
+
+    def __init__(self, concurrency=DEFAULT_HOST_CONCURRENCY, rate_per_minute=DEFAULT_RATE_PER_MINUTE):
+        self.concurrency = max(1, concurrency)
+        self.interval = 60.0 / rate_per_minute if rate_per_minute else 0.0
+        self._lock = threading.Lock()
+        self._semaphores = {}
+        self._next_start = {}
+
+    def _semaphore(self, host):
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(self.concurrency)
+            return self._semaphores[host]
+
+    def _wait_for_slot(self, host):
+        """Block until `host` may see another start, then book the next one."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                next_start = self._next_start.get(host, now)
+                if next_start <= now:
+                    self._next_start[host] = now + self.interval
+                    return
+                delay = next_start - now
+            time.sleep(delay)
+
+    def acquire(self, hosts):
+        """Acquire every host (in sorted order, so workers can't deadlock)."""
+        hosts = sorted(set(hosts))
+        for host in hosts:
+            self._semaphore(host).acquire()
+        for host in hosts:
+            self._wait_for_slot(host)
+        return hosts
+
+    def release(self, hosts):
+        for host in hosts:
+            self._semaphore(host).release()
+
+
+def _driver_alive(driver):
+    """True if the browser session still answers."""
+    try:
+        driver.window_handles
+        return True
+    except Exception:
+        return False
+
+
+def _quit(driver):
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+
+class Worker(threading.Thread):
+    """One Firefox session pulling items from the shared queue."""
+
+    def __init__(self, index, pool):
+        super().__init__(name=f"browser-{index}", daemon=True)
+        self.index = index
+        self.pool = pool
+        self.download_path = os.path.join(pool.output_dir, WORKER_DIR_NAME, f"worker-{index}")
+        self.driver = None
+        self.recycler = resources.BrowserRecycler()
+
+    def log(self, message):
+        print(f"[WORKER {self.index}] {message}")
+
+    def launch(self):
+        import sync
+        os.makedirs(self.download_path, exist_ok=True)
+        self.recycler.reset()
+        self.log("Launching Firefox...")
+        # Several sessions can't share one profile directory, so always copy
+        self.driver = sync.get_firefox_driver(download_path=self.download_path, profile_mode="copy")
+
+    def run(self):
+        from batch import new_record
+        import sync
+
+        while True:
+            item = self.pool.items.get()
+            if item is None:
+                break
+            url, attempt = item
+            record = new_record(url)
+            record['worker'] = self.index
+            started = time.monotonic()
+            hosts = []
+            try:
+                if self.driver is None:
+                    self.launch()
+                hosts = self.pool.limiter.acquire([
+                    urlparse(url).hostname or url,
+                    urlparse(sync.SUCKER_URL).hostname,
+                ])
+                with timing.traced(url):
+                    self.driver.get(url)
+                    pending = sync.browse_character(self.driver, download_path=self.download_path)
+                    result = sync.verify_outputs(sync.finish_character(pending, self.pool.output_dir))
+                manifest.record_export(url, result)
+                record.update(
+                    success=True,
+                    name=result['name'],
+                    json_path=result['json_path'],
+                    image_path=result['image_path'],
+                )
+            except Exception as e:
+                record['error'] = f"{type(e).__name__}: {e}"
+                if self.driver is not None and not _driver_alive(self.driver):
+                    _quit(self.driver)
+                    self.driver = None
+                    if attempt < MAX_REQUEUES:
+                        self.log(f"Browser crashed on {url}, requeueing ({record['error']})")
+                        self.pool.items.put((url, attempt + 1))
+                        continue
+                self.log(f"{url}: {record['error']}")
+                if self.driver is not None:
+                    try:
+                        sync.close_extra_tabs(self.driver)
+                    except Exception:
+                        pass
+            finally:
+                self.pool.limiter.release(hosts)
+                self.pool.items.task_done()
+            record['duration'] = round(time.monotonic() - started, 3)
+            record['attempts'] = attempt + 1
+            if self.driver is not None:
+                self.check_browser(record)
+            self.pool.add_record(record)
+
+        if self.driver is not None:
+            _quit(self.driver)
+
+    def check_browser(self, record):
+        """Log this worker's browser memory into record and recycle it when due."""
+        try:
+            sample = self.recycler.measure(self.driver, record)
+        except Exception as e:
+            self.log(f"Browser check failed: {e}")
+            return
+        reason = self.recycler.due()
+        if reason:
+            self.log(f"Restarting browser: {reason} ({resources.describe(sample)})")
+            _quit(self.driver)
+            self.driver = None
+            self.recycler.reset()
+
+
+class WorkerPool:
+    """Shared queue + N browser workers + per-host limiter."""
+
+    def __init__(self, browsers=DEFAULT_BROWSERS, host_concurrency=DEFAULT_HOST_CONCURRENCY,
+                 rate_per_minute=DEFAULT_RATE_PER_MINUTE, output_dir=None, on_record=None):
+        import sync
+        self.output_dir = output_dir or sync.DOWNLOAD_PATH
+        self.browsers = max(1, browsers)
+        self.limiter = HostLimiter(host_concurrency, rate_per_minute)
+        self.items = queue.Queue()
+        self.records = []
+        self.on_record = on_record
+        self._records_lock = threading.Lock()
+
+    def add_record(self, record):
+        with self._records_lock:
+            self.records.append(record)
+            if self.on_record:
+                self.on_record(record)
+
+    def run(self, urls):
+        """Export every URL across the workers. Returns records in completion order."""
+        for url in urls:
+            self.items.put((url, 0))
+
+        workers = [Worker(i + 1, self) for i in range(min(self.browsers, len(urls)))]
+        for worker in workers:
+            worker.start()
+
+        # Requeued items are put back before task_done, so join() covers them
+        self.items.join()
+        for _ in workers:
+            self.items.put(None)
+        for worker in workers:
+            worker.join()
+
+        shutil.rmtree(os.path.join(self.output_dir, WORKER_DIR_NAME), ignore_errors=True)
+        return self.records
+
+
+def run_pool(urls, results_path=None, browsers=DEFAULT_BROWSERS,
+             host_concurrency=DEFAULT_HOST_CONCURRENCY, rate_per_minute=DEFAULT_RATE_PER_MINUTE):
+    """
+    Batch-sync urls with several browsers in parallel.
+
+    Same result records as batch.run_batch(), with 'worker' and 'attempts'
+    added.
+    """
+    from batch import print_summary
+
+    results_file = open(os.path.expanduser(results_path), 'a') if results_path else None
+
+    def write_record(record):
+        if results_file:
+            results_file.write(json.dumps(record) + "\n")
+            results_file.flush()
+
+    print(f"[INFO] Starting {browsers} browser worker(s), "
+          f"{host_concurrency} per host, {rate_per_minute or 'unlimited'} starts/min per host")
+    pool = WorkerPool(browsers, host_concurrency, rate_per_minute, on_record=write_record)
+    started = time.monotonic()
+    try:
+        pool.run(urls)
+    except KeyboardInterrupt:
+        print("\n[INFO] Batch interrupted by user.")
+    finally:
+        if results_file:
+            results_file.close()
+
+    print_summary(pool.records, time.monotonic() - started)
+    return pool.records
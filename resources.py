@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Firefox resource monitor and browser recycling policy.
+
+Between characters, the RSS and CPU use of the Firefox process tree (the
+browser plus its content processes) are sampled with psutil when it is
+installed, or from /proc on Linux otherwise. The sample and the open tab
+count go into the character's result record. The browser is restarted
+after RECYCLE_AFTER_CHARACTERS characters, when the tree's RSS passes
+RECYCLE_RSS_MB, or when tabs leak past RECYCLE_MAX_TABS. The caller keeps
+its own work queue and just carries on with the new driver.
+"""
+
+import os
+import time
+
+# --- CONFIGURATION ---
+# Restart the browser after this many characters (0 = never)
+RECYCLE_AFTER_CHARACTERS = 100
+# Restart once Firefox's processes use more than this much memory (0 = never)
+RECYCLE_RSS_MB = 2500
+# Restart when more tabs than this are still open between characters, not
+# counting the pinned sucker.dev tab (see tabs.py)
+RECYCLE_MAX_TABS = 1
+
+
+def browser_pid(driver):
+    """PID of the Firefox main process behind driver, or None."""
+    pid = (getattr(driver, 'capabilities', None) or {}).get("moz:processID")
+    if pid:
+        return int(pid)
+    process = getattr(getattr(driver, 'service', None), 'process', None)
+    return getattr(process, 'pid', None)
+
+
+def _tree_psutil(pid):
+    import psutil
+
+    try:
+        root = psutil.Process(pid)
+        processes = [root] + root.children(recursive=True)
+    except psutil.Error:
+        return None
+    rss = cpu = 0.0
+    count = 0
+    for process in processes:
+        try:
+            rss += process.memory_info().rss
+            times = process.cpu_times()
+            cpu += times.user + times.system
+            count += 1
+        except psutil.Error:
+            continue
+    return rss, cpu, count
+
+
+def _tree_proc(pid):
+    """Same as _tree_psutil() from /proc/<pid>/stat (Linux only)."""
+    if not os.path.isdir("/proc"):
+        return None
+    stats = {}
+    for name in os.listdir("/proc"):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{name}/stat", 'rb') as f:
+                # Fields after the parenthesised command name
+                fields = f.read().rsplit(b")", 1)[1].split()
+        except (OSError, IndexError):
+            continue
+        stats[int(name)] = fields
+    if pid not in stats:
+        return None
+
+    children = {}
+    for child, fields in stats.items():
+        children.setdefault(int(fields[1]), []).append(child)
+    tick = os.sysconf("SC_CLK_TCK")
+    page = os.sysconf("SC_PAGE_SIZE")
+
+    rss = cpu = 0.0
+    count = 0
+    todo = [pid]
+    while todo:
+        current = todo.pop()
+        fields = stats[current]
+        cpu += (int(fields[11]) + int(fields[12])) / tick
+        rss += int(fields[21]) * page
+        count += 1
+        todo.extend(children.get(current, ()))
+    return rss, cpu, count
+
+
+def _tree_usage(pid):
+    """(rss bytes, cpu seconds, process count) for pid and its descendants, or None."""
+    try:
+        import psutil  # noqa: F401
+    except ImportError:
+        return _tree_proc(pid)
+    return _tree_psutil(pid)
+
+
+class ResourceMonitor:
+    """Samples one browser's process tree; CPU is averaged since the last sample."""
+
+    def __init__(self, pid):
+        self.pid = pid
+        self._last = None
+
+    def sample(self):
+        """
+        Returns:
+            dict with 'rss_mb', 'cpu_percent' (None on the first sample) and
+            'processes', or None if the tree can't be read
+        """
+        usage = _tree_usage(self.pid) if self.pid else None
+        if usage is None:
+            return None
+        rss, cpu, count = usage
+        now = time.monotonic()
+        cpu_percent = None
+        if self._last is not None and now > self._last[0]:
+            cpu_percent = round(max(cpu - self._last[1], 0.0) / (now - self._last[0]) * 100, 1)
+        self._last = (now, cpu)
+        return {'rss_mb': round(rss / 1024 / 1024, 1), 'cpu_percent': cpu_percent, 'processes': count}
+
+
+def _pinned_tabs(driver):
+    import tabs
+    return 1 if tabs.pinned(driver) else 0
+
+
+class BrowserRecycler:
+    """
+    Tracks one browser between characters and says when to restart it.
+
+    Call measure() after each character, then restart the browser yourself
+    if due() returns a reason, and call reset() with the new driver.
+    """
+
+    def __init__(self, after_characters=None, rss_mb=None, max_tabs=None):
+        self.after_characters = RECYCLE_AFTER_CHARACTERS if after_characters is None else after_characters
+        self.rss_mb = RECYCLE_RSS_MB if rss_mb is None else rss_mb
+        self.max_tabs = RECYCLE_MAX_TABS if max_tabs is None else max_tabs
+        self.characters = 0
+        self.reason = None
+        self._monitor = None
+
+    def measure(self, driver, record=None):
+        """
+        Sample driver's browser and decide whether it is due for a restart.
+
+        The sample ('rss_mb', 'cpu_percent', 'processes', 'tabs') is stored
+        in record['memory'] when a record is given.
+
+        Returns:
+            The sample dict
+        """
+        self.characters += 1
+        pid = browser_pid(driver)
+        if self._monitor is None or self._monitor.pid != pid:
+            self._monitor = ResourceMonitor(pid)
+        sample = self._monitor.sample() or {'rss_mb': None, 'cpu_percent': None, 'processes': None}
+        try:
+            sample['tabs'] = len(driver.window_handles)
+        except Exception:
+            sample['tabs'] = None
+        if record is not None:
+            record['memory'] = sample
+
+        self.reason = None
+        if self.after_characters and self.characters >= self.after_characters:
+            self.reason = f"{self.characters} characters since launch"
+        elif self.rss_mb and sample['rss_mb'] and sample['rss_mb'] > self.rss_mb:
+            self.reason = f"Firefox using {sample['rss_mb']:.0f} MB (limit {self.rss_mb} MB)"
+        elif self.max_tabs and sample['tabs'] and sample['tabs'] > self.max_tabs + _pinned_tabs(driver):
+            self.reason = f"{sample['tabs']} tabs open between characters"
+        return sample
+
+    def due(self):
+        """Why the browser should be restarted now, or None."""
+        return self.reason
+
+    def reset(self):
+        """Start counting again for a freshly launched browser."""
+        self.characters = 0
+        self.reason = None
+        self._monitor = None
+
+
+def describe(sample):
+    """One-line summary of a sample for logs."""
+    if not sample or sample.get('rss_mb') is None:
+        return f"memory n/a, {sample.get('tabs') if sample else '?'} tab(s)"
+    cpu = sample['cpu_percent']
+    return (f"{sample['rss_mb']:.0f} MB RSS in {sample['processes']} process(es), "
+            f"CPU {'n/a' if cpu is None else f'{cpu:.0f}%'}, {sample['tabs']} tab(s)")
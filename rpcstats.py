@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Opt-in WebDriver round-trip accounting and Python profiling.
+
+Every Selenium call that touches the browser (find_elements, .text,
+.is_displayed(), .size, execute_script, ...) is one HTTP round trip to
+geckodriver through the driver's command executor. When enabled, the
+executor is wrapped so each command is counted by type and by the project
+function that issued it, with its duration. A report is printed after
+every character (tied to its timing trace) and a total when janitor-dl
+exits.
+
+profiled() wraps a run in cProfile for the Python side.
+"""
+
+import atexit
+import contextlib
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+import timing
+
+# --- CONFIGURATION ---
+RPC_TRACE_ENABLED = False
+# Callers listed per report
+REPORT_ROWS = 15
+# Functions listed from a cProfile run
+PROFILE_ROWS = 25
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+class Tally:
+    """Round-trip counts and durations, overall and per calling function."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.commands = Counter()
+        self.callers = {}
+
+    def add(self, command, caller, seconds):
+        self.count += 1
+        self.seconds += seconds
+        self.commands[command] += 1
+        entry = self.callers.setdefault(caller, {'count': 0, 'seconds': 0.0, 'commands': Counter()})
+        entry['count'] += 1
+        entry['seconds'] += seconds
+        entry['commands'][command] += 1
+
+
+def calling_function():
+    """
+    'module.function' of the innermost project frame on the stack, i.e. the
+    janitor-dl code that caused the Selenium call.
+    """
+    frame = sys._getframe(2)
+    this_file = os.path.abspath(__file__)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        # Skip pseudo-files ("<string>", "<frozen runpy>"), which abspath()
+        # would place in the current directory
+        if not filename.startswith("<"):
+            filename = os.path.abspath(filename)
+        if os.path.dirname(filename) == HERE and filename != this_file:
+            module = os.path.splitext(os.path.basename(filename))[0]
+            name = getattr(frame.f_code, 'co_qualname', frame.f_code.co_name)
+            return f"{module}.{name}"
+        frame = frame.f_back
+    return "(outside janitor-dl)"
+
+
+class RoundTripRecorder:
+    """Counts commands sent through every attached driver's command executor."""
+
+    def __init__(self):
+        self.total = Tally()
+        self._per_trace = {}
+        self._lock = threading.Lock()
+
+    def attach(self, driver):
+        """Wrap driver.command_executor.execute (once per executor)."""
+        executor = driver.command_executor
+        if getattr(executor, '_rpc_recorder', None) is self:
+            return driver
+        original = executor.execute
+
+        def execute(command, params):
+            caller = calling_function()
+            started = time.perf_counter()
+            try:
+                return original(command, params)
+            finally:
+                self.record(command, caller, time.perf_counter() - started)
+
+        executor.execute = execute
+        executor._rpc_recorder = self
+        return driver
+
+    def record(self, command, caller, seconds):
+        trace = timing.current()
+        with self._lock:
+            self.total.add(command, caller, seconds)
+            if trace is not None:
+                self._per_trace.setdefault(trace, Tally()).add(command, caller, seconds)
+
+    def trace_finished(self, trace, outcome):
+        """timing listener: print the round trips issued for this character."""
+        with self._lock:
+            tally = self._per_trace.pop(trace, None)
+        if tally is None:
+            return
+        label = trace.character or trace.url or "character"
+        print_report(tally, f"'{label}' ({outcome})")
+
+    def print_total(self):
+        if self.total.count:
+            print_report(self.total, "all characters")
+
+
+def print_report(tally, label):
+    """Print a tally as a table of calling functions."""
+    print(f"\n[RPC] {label}: {tally.count} WebDriver round trips, "
+          f"{tally.seconds:.2f}s waiting on geckodriver")
+    print(f"      {'Caller':<40} {'Calls':>6} {'Time':>8}   Commands")
+    rows = sorted(tally.callers.items(), key=lambda item: item[1]['seconds'], reverse=True)
+    for caller, entry in rows[:REPORT_ROWS]:
+        commands = ", ".join(f"{name} x{count}" for name, count in entry['commands'].most_common(3))
+        print(f"      {caller:<40} {entry['count']:>6} {entry['seconds']:>7.2f}s   {commands}")
+    if len(rows) > REPORT_ROWS:
+        print(f"      ... {len(rows) - REPORT_ROWS} more")
+    by_type = ", ".join(f"{name} x{count}" for name, count in tally.commands.most_common(6))
+    print(f"      By command: {by_type}")
+
+
+_recorder = None
+
+
+def enable():
+    """Turn on round-trip accounting for drivers attached from now on."""
+    global RPC_TRACE_ENABLED, _recorder
+    RPC_TRACE_ENABLED = True
+    if _recorder is None:
+        _recorder = RoundTripRecorder()
+        timing.add_listener(_recorder.trace_finished)
+        atexit.register(_recorder.print_total)
+    return _recorder
+
+
+def attach(driver):
+    """Instrument driver if accounting is enabled; otherwise leave it alone."""
+    if RPC_TRACE_ENABLED:
+        enable().attach(driver)
+    return driver
+
+
+@contextlib.contextmanager
+def profiled(path):
+    """
+    Run the block under cProfile, save the stats to path (for snakeviz,
+    pstats, ...) and print the top functions by cumulative time.
+
+    Only the calling thread is profiled; pipeline and pool worker threads
+    are not.
+    """
+    import cProfile
+    import pstats
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        path = os.path.expanduser(path)
+        profiler.dump_stats(path)
+        print(f"\n[PROFILE] cProfile stats saved to {path}")
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(PROFILE_ROWS)
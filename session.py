@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Warm, reusable browser session for the janitor-dl menu.
+
+Owns one long-lived geckodriver service and one Firefox session on top of
+it. Sync runs borrow the session instead of cold-starting Firefox, the
+session is health-checked before each reuse (and relaunched on the same
+geckodriver if it died), and both are quit cleanly when janitor-dl exits.
+The browser can also be started in the background while the menu is on
+screen.
+"""
+
+import atexit
+import os
+import threading
+import time
+
+
+class BrowserSession:
+    """A single geckodriver service + Firefox session, kept warm between runs."""
+
+    def __init__(self):
+        self._service = None
+        self._driver = None
+        self._profile_path = None
+        self._lock = threading.Lock()
+        self._prewarm_thread = None
+        self.launch_seconds = None
+
+    def _current_profile_path(self):
+        """PROFILE_PATH as currently written in sync.py (setup may have changed it)."""
+        import sync
+        try:
+            from setup_profile import get_current_profile
+            configured = get_current_profile()
+        except Exception:
+            configured = None
+        if configured:
+            sync.PROFILE_PATH = os.path.expanduser(configured)
+        return sync.PROFILE_PATH
+
+    def _start_service(self):
+        from selenium.webdriver.firefox.service import Service
+
+        if self._service is not None and self._service.is_connectable():
+            return self._service
+        self.stop_service()
+        self._service = Service(log_output=os.devnull)
+        self._service.start()
+        return self._service
+
+    def _launch(self):
+        import rpcstats
+        import sync
+        from selenium import webdriver
+
+        started = time.monotonic()
+        service = self._start_service()
+        self._profile_path = self._current_profile_path()
+        self._driver = rpcstats.attach(sync.prepare_driver(webdriver.Remote(
+            command_executor=service.service_url,
+            options=sync.get_firefox_options(),
+        )))
+        self.launch_seconds = time.monotonic() - started
+        print(f"[SESSION] Firefox ready in {self.launch_seconds:.1f}s "
+              f"(profile mode: {sync.PROFILE_MODE})")
+        return self._driver
+
+    def healthy(self):
+        """True if the session answers and is still on the configured profile."""
+        if self._driver is None:
+            return False
+        if self._profile_path != self._current_profile_path():
+            print("[SESSION] Firefox profile changed, restarting browser...")
+            return False
+        try:
+            self._driver.window_handles
+            return True
+        except Exception:
+            return False
+
+    def get(self):
+        """Return a healthy driver, launching or relaunching Firefox as needed."""
+        with self._lock:
+            if self.healthy():
+                import sync
+                try:
+                    sync.close_extra_tabs(self._driver)
+                except Exception:
+                    pass
+                return self._driver
+            self.quit_browser()
+            return self._launch()
+
+    def restart(self):
+        """Quit Firefox and launch a fresh one on the same geckodriver."""
+        with self._lock:
+            self.quit_browser()
+            return self._launch()
+
+    def prewarm(self):
+        """Start Firefox in a background thread if it isn't running yet."""
+        if self._prewarm_thread is not None and self._prewarm_thread.is_alive():
+            return
+
+        def warm():
+            try:
+                self.get()
+            except Exception as e:
+                print(f"\n[SESSION] Background browser start failed: {e}")
+
+        self._prewarm_thread = threading.Thread(target=warm, name="prewarm", daemon=True)
+        self._prewarm_thread.start()
+
+    def quit_browser(self):
+        """Quit the Firefox session but keep geckodriver running."""
+        driver, self._driver = self._driver, None
+        if driver is not None:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+    def stop_service(self):
+        service, self._service = self._service, None
+        if service is not None:
+            try:
+                service.stop()
+            except Exception:
+                pass
+
+    def close(self):
+        """Quit Firefox and stop geckodriver."""
+        with self._lock:
+            self.quit_browser()
+            self.stop_service()
+
+
+_session = None
+
+
+def get_session():
+    """The process-wide BrowserSession, quit automatically at exit."""
+    global _session
+    if _session is None:
+        _session = BrowserSession()
+        atexit.register(_session.close)
+    return _session
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Slim working copy of a Firefox profile.
+
+Instead of copying the whole profile (cache2, session history, every
+site's storage) on each launch, only the files that keep you logged in to
+JanitorAI and sucker.dev are mirrored into a cached working copy. Later
+refreshes only copy files whose size or mtime changed.
+"""
+
+import fnmatch
+import os
+import shutil
+from pathlib import Path
+
+# --- CONFIGURATION ---
+SLIM_CACHE_DIR = Path.home() / ".cache" / "janitor-dl" / "profiles"
+
+# Sites whose per-origin storage is carried over
+SLIM_SITES = ["janitorai.com", "sucker.severian.dev"]
+
+# Top-level profile files needed for logins and settings
+SLIM_FILES = [
+    "prefs.js",
+    "user.js",
+    "cookies.sqlite",
+    "cookies.sqlite-wal",
+    "cookies.sqlite-shm",
+    "permissions.sqlite",
+    "webappsstore.sqlite",
+    "cert9.db",
+    "key4.db",
+    "logins.json",
+    "containers.json",
+    "times.json",
+    "compatibility.ini",
+]
+
+
+# Files SQLite keeps next to a database; a stale WAL is replayed onto
+# whatever database sits next to it
+SQLITE_COMPANIONS = ("-wal", "-shm")
+
+
+def _site_storage_dirs(profile_path):
+    """Per-origin storage directories for SLIM_SITES (any subdomain, any port)."""
+    storage = Path(profile_path) / "storage" / "default"
+    if not storage.is_dir():
+        return []
+    patterns = []
+    for site in SLIM_SITES:
+        patterns.append(f"https+++{site}*")
+        patterns.append(f"https+++*.{site}*")
+    return [
+        entry for entry in storage.iterdir()
+        if entry.is_dir() and any(fnmatch.fnmatch(entry.name, p) for p in patterns)
+    ]
+
+
+def _selected_files(profile_path):
+    """Relative paths of every file the slim copy should contain."""
+    profile_path = Path(profile_path)
+    selected = []
+    for name in SLIM_FILES:
+        if (profile_path / name).is_file():
+            selected.append(Path(name))
+    for directory in _site_storage_dirs(profile_path):
+        for root, _, files in os.walk(directory):
+            for name in files:
+                selected.append((Path(root) / name).relative_to(profile_path))
+    return selected
+
+
+def _companions(rel):
+    return [rel.with_name(rel.name + suffix) for suffix in SQLITE_COMPANIONS]
+
+
+def _unchanged(src, dst):
+    try:
+        s, d = src.stat(), dst.stat()
+    except FileNotFoundError:
+        return False
+    return s.st_size == d.st_size and int(s.st_mtime) == int(d.st_mtime)
+
+
+def slim_copy_path(profile_path):
+    """Where the slim working copy of profile_path lives."""
+    return SLIM_CACHE_DIR / Path(profile_path).name
+
+
+def refresh_slim_copy(profile_path, target=None):
+    """
+    Create or incrementally refresh the slim working copy of profile_path.
+
+    Returns:
+        (target path, files copied, bytes copied)
+    """
+    profile_path = Path(profile_path)
+    target = Path(target) if target else slim_copy_path(profile_path)
+    target.mkdir(parents=True, exist_ok=True)
+
+    selected = _selected_files(profile_path)
+    keep = set(selected)
+    # Databases before their WAL/shm, so a refreshed database never sits
+    # next to the copy's old ones
+    companions = {companion for rel in selected for companion in _companions(rel)}
+    copied = 0
+    copied_bytes = 0
+    for rel in sorted(selected, key=lambda rel: rel in companions):
+        src = profile_path / rel
+        dst = target / rel
+        if _unchanged(src, dst):
+            continue
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            shutil.copy2(src, dst)
+        except OSError:
+            # Firefox may be rewriting the file right now; keep the old copy
+            continue
+        copied += 1
+        copied_bytes += src.stat().st_size
+        if rel.suffix == ".sqlite":
+            # The source's current WAL/shm (if any) are copied after this
+            for companion in _companions(rel):
+                try:
+                    (target / companion).unlink()
+                except FileNotFoundError:
+                    pass
+
+    # Drop site storage that no longer exists in the source profile
+    storage = target / "storage" / "default"
+    if storage.is_dir():
+        for root, _, files in os.walk(storage):
+            for name in files:
+                rel = (Path(root) / name).relative_to(target)
+                if rel not in keep:
+                    (target / rel).unlink()
+
+    # A stale lock would make Firefox refuse to start on the copy
+    for lock in ("lock", ".parentlock", "parent.lock"):
+        try:
+            (target / lock).unlink()
+        except OSError:
+            pass
+
+    return target, copied, copied_bytes
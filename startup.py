@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Startup-time report for the janitor-dl entry point.
+
+Measures, each in a fresh interpreter so nothing is cached:
+- import time per project module and heavy dependency (via -X importtime)
+- time until the menu prompt appears
+- time until a subcommand's argument parser is ready
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Project modules followed by the heavy dependencies they defer
+REPORT_MODULES = [
+    "cli",
+    "sync",
+    "waits",
+    "downloads",
+    "batch",
+    "pipeline",
+    "pool",
+    "session",
+    "slim_profile",
+    "timing",
+    "rpcstats",
+    "manifest",
+    "blobstore",
+    "pack",
+    "transcode",
+    "resources",
+    "capture",
+    "checkpoint",
+    "tabs",
+    "strategies",
+    "setup_profile",
+    "create_profile",
+    "selenium.webdriver",
+    "PIL.Image",
+]
+
+MENU_PROMPT = "Select an option"
+PROMPT_TIMEOUT = 30
+
+
+def _run_python(args, **kwargs):
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    return subprocess.run(
+        [sys.executable] + args, cwd=HERE, env=env,
+        capture_output=True, text=True, **kwargs
+    )
+
+
+def measure_import(module):
+    """
+    Import module in a fresh interpreter with -X importtime.
+
+    Returns:
+        (cumulative microseconds for module, number of modules it pulled in),
+        or (None, 0) if it can't be imported
+    """
+    result = _run_python(["-X", "importtime", "-c", f"import {module}"])
+    if result.returncode != 0:
+        return None, 0
+
+    cumulative = None
+    count = 0
+    for line in result.stderr.splitlines():
+        # "import time:       387 |       2584 |       re._compiler"
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = [p.strip() for p in line[len("import time:"):].split("|")]
+        if len(parts) != 3 or not parts[1].isdigit():
+            continue
+        count += 1
+        if parts[2] == module:
+            cumulative = int(parts[1])
+    return cumulative, count
+
+
+def measure_first_prompt():
+    """Seconds from process start until the menu prompt is printed."""
+    env = dict(os.environ, PYTHONUNBUFFERED="1")
+    started = time.monotonic()
+    proc = subprocess.Popen(
+        [sys.executable, "-c", "import cli; cli.main([])"],
+        cwd=HERE, env=env, stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+    )
+    seen = b""
+    elapsed = None
+    try:
+        while time.monotonic() - started < PROMPT_TIMEOUT:
+            chunk = proc.stdout.read1(4096)
+            if not chunk:
+                break
+            seen += chunk
+            if MENU_PROMPT.encode() in seen:
+                elapsed = time.monotonic() - started
+                break
+    finally:
+        # EOF at the prompt makes the menu exit
+        proc.stdin.close()
+        try:
+            proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+    return elapsed
+
+
+def measure_subcommand_ready():
+    """Seconds until `janitor-dl batch`'s arguments are parsed."""
+    started = time.monotonic()
+    result = _run_python(["-c", "import cli; cli.build_parser().parse_args(['batch', '-'])"])
+    if result.returncode != 0:
+        return None
+    return time.monotonic() - started
+
+
+def measure_interpreter():
+    """Seconds for a bare interpreter start, to put the others in context."""
+    started = time.monotonic()
+    _run_python(["-c", "pass"])
+    return time.monotonic() - started
+
+
+def main():
+    print("="*60)
+    print(" " * 18 + "Startup Report")
+    print("="*60)
+
+    print("\n  Import time (fresh interpreter, cumulative):\n")
+    print(f"  {'Module':<22} {'Time (ms)':>10} {'Modules loaded':>15}")
+    for module in REPORT_MODULES:
+        cumulative, count = measure_import(module)
+        if cumulative is None:
+            print(f"  {module:<22} {'n/a':>10} {'(not importable)':>15}")
+        else:
+            print(f"  {module:<22} {cumulative / 1000:>10.1f} {count:>15}")
+
+    interpreter = measure_interpreter()
+    prompt = measure_first_prompt()
+    subcommand = measure_subcommand_ready()
+
+    print("\n  Wall time (includes interpreter start):\n")
+    print(f"  {'Bare interpreter':<28} {interpreter * 1000:>8.0f} ms")
+    if prompt is None:
+        print(f"  {'Menu first prompt':<28} {'n/a':>8}")
+    else:
+        print(f"  {'Menu first prompt':<28} {prompt * 1000:>8.0f} ms")
+    if subcommand is None:
+        print(f"  {'Subcommand parsed (batch)':<28} {'n/a':>8}")
+    else:
+        print(f"  {'Subcommand parsed (batch)':<28} {subcommand * 1000:>8.0f} ms")
+    print("\n" + "="*60 + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
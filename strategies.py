@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Adaptive ordering of the fallback strategies sync uses to find things on
+JanitorAI pages: chatbox selectors, back button selectors and the
+character name methods.
+
+Every lookup records which strategy won and how long it took; a miss of
+the favourite counts against it. The stats are kept as moving averages
+in STRATEGY_STATS_PATH, so a run starts from what worked last time. The
+favourite (best hit rate, then lowest latency) is tried alone with a
+short timeout first. Only on a miss does the full list run, in adaptive
+order, through a single wait that checks every selector each poll
+instead of one wait per selector. When the site's markup changes, the old
+favourite's hit rate decays after a few misses and the new winner takes
+its place.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+
+import waits
+
+# --- CONFIGURATION ---
+STRATEGY_STATS_PATH = os.path.join(
+    os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share"),
+    "janitor-dl", "strategies.json",
+)
+# How long the favourite strategy gets before the full list is tried
+FAVOURITE_TIMEOUT = 1.0
+# Weight of the newest lookup in the moving averages
+DECAY = 0.3
+# Write the stats at most this often (and once at exit)
+SAVE_INTERVAL = 10.0
+
+# Returns [index, element] for the first selector (in the given order) with
+# a visible, enabled match, or null
+LOCATE_SCRIPT = """
+var selectors = arguments[0];
+for (var i = 0; i < selectors.length; i++) {
+    var elements;
+    try {
+        elements = document.querySelectorAll(selectors[i]);
+    } catch (e) {
+        continue;
+    }
+    for (var j = 0; j < elements.length; j++) {
+        var el = elements[j];
+        var rect = el.getBoundingClientRect();
+        if (!rect.width || !rect.height || el.disabled) continue;
+        var style = window.getComputedStyle(el);
+        if (style.display !== 'none' && style.visibility !== 'hidden') return [i, el];
+    }
+}
+return null;
+"""
+
+
+class StrategyStats:
+    """Hit rate and latency per (group, strategy), persisted as JSON."""
+
+    def __init__(self, path=None):
+        self.path = path or STRATEGY_STATS_PATH
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._saved = time.monotonic()
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self._stats = json.load(f)
+        except (OSError, ValueError):
+            self._stats = {}
+
+    def _update(self, group, strategy, hit, seconds=None):
+        entry = self._stats.setdefault(group, {}).setdefault(
+            strategy, {'hits': 0, 'misses': 0, 'hit_rate': 1.0, 'latency': None}
+        )
+        entry['hits' if hit else 'misses'] += 1
+        entry['hit_rate'] = round((1 - DECAY) * entry['hit_rate'] + DECAY * (1.0 if hit else 0.0), 4)
+        if seconds is not None:
+            latency = entry['latency']
+            entry['latency'] = round(seconds if latency is None
+                                     else (1 - DECAY) * latency + DECAY * seconds, 4)
+
+    def record(self, group, strategy, seconds):
+        """strategy found what group was looking for after seconds."""
+        with self._lock:
+            self._update(group, strategy, True, seconds)
+            self._dirty = True
+        self._maybe_save()
+
+    def miss(self, group, strategy):
+        """strategy was tried first for group and found nothing."""
+        with self._lock:
+            self._update(group, strategy, False)
+            self._dirty = True
+        self._maybe_save()
+
+    def order(self, group, strategies):
+        """strategies with past winners first (best hit rate, then fastest), the rest as given."""
+        with self._lock:
+            known = self._stats.get(group, {})
+            ranked = sorted(
+                (s for s in strategies if known.get(s, {}).get('hits')),
+                key=lambda s: (-known[s]['hit_rate'], known[s]['latency'] or 0.0),
+            )
+        return ranked + [s for s in strategies if s not in ranked]
+
+    def favourite(self, group, strategies):
+        """The strategy to try first for group, or None without history."""
+        with self._lock:
+            known = self._stats.get(group, {})
+            if not any(known.get(s, {}).get('hits') for s in strategies):
+                return None
+        return self.order(group, strategies)[0]
+
+    def _maybe_save(self):
+        if time.monotonic() - self._saved >= SAVE_INTERVAL:
+            self.save()
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                tmp_path = f"{self.path}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(self._stats, f, indent=2, sort_keys=True)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                print(f"[WARNING] Could not save selector stats: {e}")
+            self._dirty = False
+            self._saved = time.monotonic()
+
+
+_stats = None
+_stats_lock = threading.Lock()
+
+
+def get_stats():
+    """The process-wide StrategyStats (saved at exit)."""
+    global _stats
+    with _stats_lock:
+        if _stats is None:
+            _stats = StrategyStats()
+            atexit.register(_stats.save)
+        return _stats
+
+
+def locate(driver, group, selectors, timeout):
+    """
+    Find the first visible, enabled element matching one of selectors.
+
+    The favourite selector for group gets FAVOURITE_TIMEOUT on its own;
+    after that every selector is polled together, best first, for up to
+    timeout seconds (0: a single check).
+
+    Returns:
+        (element, selector), or (None, None) if nothing matched in time
+    """
+    stats = get_stats()
+    started = time.monotonic()
+
+    def find(order):
+        def condition(d):
+            found = d.execute_script(LOCATE_SCRIPT, order)
+            return (found[1], order[found[0]]) if found else False
+        return condition
+
+    def attempt(order, seconds):
+        if not seconds:
+            return find(order)(driver) or None
+        try:
+            return waits.wait_for(driver, f"locate:{group}", find(order), seconds)
+        except Exception:
+            return None
+
+    favourite = stats.favourite(group, selectors)
+    if favourite is not None:
+        found = attempt([favourite], min(FAVOURITE_TIMEOUT, timeout))
+        if found:
+            stats.record(group, favourite, time.monotonic() - started)
+            return found
+        stats.miss(group, favourite)
+
+    found = attempt(stats.order(group, selectors), timeout)
+    if found:
+        stats.record(group, found[1], time.monotonic() - started)
+        return found
+    return None, None
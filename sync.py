@@ -1,331 +1,1037 @@
 import time
 import os
 import sys
-from selenium import webdriver
-from selenium.webdriver.firefox.service import Service
-from selenium.webdriver.firefox.options import Options
-from selenium.webdriver.firefox.firefox_profile import FirefoxProfile
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from PIL import Image
+import base64
+import json
+import difflib
+import re
+import unicodedata
+import urllib.parse
 from io import BytesIO
+import waits
+import downloads
+import timing
+import rpcstats
+import resources
+import capture
+import checkpoint
+import tabs
+import strategies
+
+# Selenium and Pillow are imported inside the functions that use them, so
+# importing this module (menu, batch planning, setup) stays cheap.
 
 # --- CONFIGURATION ---
 # Set your Firefox profile path (find it in ~/.mozilla/firefox/)
 # Example: "~/.mozilla/firefox/yvntn2wj.automation"
 PROFILE_PATH = os.path.expanduser("~/.mozilla/firefox/p6tus3mi.a2")
 DOWNLOAD_PATH = os.path.expanduser("~/Downloads")
+SUCKER_URL = "https://sucker.severian.dev/"
+# How Firefox gets the profile:
+#   "copy"     - Selenium copies the whole profile to a temp dir on every launch
+#   "in-place" - Firefox runs directly on PROFILE_PATH (no copy; Firefox must
+#                not already be running on it, and geckodriver writes its
+#                automation prefs into that profile)
+#   "slim"     - Firefox runs on a cached copy holding only the login-relevant
+#                files, refreshed incrementally (see slim_profile.py)
+PROFILE_MODE = "copy"
+# Store exported files once by content hash under DOWNLOAD_PATH and make
+# <name>.json / <name>.png links to them (see blobstore.py)
+CONTENT_STORE = True
+# Also write a SillyTavern character card (PNG with the JSON embedded) to
+# DOWNLOAD_PATH/cards/ after each character (see pack.py)
+PACK_CARDS = False
+# Re-encode each saved avatar (see transcode.py): None keeps the fetched
+# image as is, or "png" (optimized), "webp", "webp-lossless"
+IMAGE_FORMAT = None
+# Largest (width, height) kept when re-encoding, or None for no limit
+IMAGE_MAX_SIZE = None
+# Lean page loads: "eager" load strategy with explicit readiness waits, no
+# web fonts or autoplaying media, and images blocked while the sucker.dev
+# tab loads (it only needs the card list)
+LEAN_MODE = False
+# Take the character JSON from sucker.dev's own network responses (WebDriver
+# BiDi, see capture.py) instead of clicking "Download JSON"; falls back to
+# the button whenever the capture misses
+NETWORK_CAPTURE = False
+# Journal each character's finished steps on disk so a retry resumes at the
+# failed step (see checkpoint.py)
+CHECKPOINTS = True
+# Automatic retries of a failed step, waiting RETRY_BACKOFF seconds before
+# the first and doubling after each
+STEP_RETRIES = 2
+RETRY_BACKOFF = 2.0
 
-def get_firefox_driver():
-    # Use existing profile - try to modify as little as possible to avoid detection
-    if PROFILE_PATH and os.path.exists(PROFILE_PATH):
-        profile = FirefoxProfile(PROFILE_PATH)
-        print(f"[INFO] Using Firefox profile: {PROFILE_PATH}")
-    else:
-        profile = FirefoxProfile()
-        print("[WARNING] Profile path not found, using default profile")
-    
-    # Only set essential download preferences (minimal changes to avoid detection)
-    profile.set_preference("browser.download.folderList", 2)
-    profile.set_preference("browser.download.manager.showWhenStarting", False)
-    profile.set_preference("browser.download.dir", DOWNLOAD_PATH)
-    profile.set_preference("browser.helperApps.neverAsk.saveToDisk", "application/json")
+def _download_preferences(download_path):
+    """Download preferences applied in every mode (minimal changes to avoid detection)."""
+    return {
+        "browser.download.folderList": 2,
+        "browser.download.manager.showWhenStarting": False,
+        "browser.download.dir": download_path,
+        "browser.helperApps.neverAsk.saveToDisk": "application/json",
+    }
+
+def _lean_preferences():
+    """Preferences added in lean mode."""
+    return {
+        "gfx.downloadable_fonts.enabled": False,
+        "media.autoplay.default": 5,
+        "media.preload.default": 0,
+    }
+
+def get_firefox_options(download_path=None, profile_mode=None):
+    """
+    Build Firefox options for the configured profile.
     
-    # Update the profile (required after setting preferences)
-    profile.update_preferences()
+    Args:
+        download_path: Directory Firefox saves downloads to (default: DOWNLOAD_PATH)
+        profile_mode: "copy", "in-place" or "slim" (default: PROFILE_MODE)
+    """
+    from selenium.webdriver.firefox.options import Options
+    from selenium.webdriver.firefox.firefox_profile import FirefoxProfile
     
-    # Assign profile to options (Selenium 4.x way)
+    download_path = download_path or DOWNLOAD_PATH
+    profile_mode = profile_mode or PROFILE_MODE
+    prefs = _download_preferences(download_path)
     options = Options()
-    options.profile = profile
+    if LEAN_MODE:
+        prefs.update(_lean_preferences())
+        options.page_load_strategy = "eager"
+        # Needed (Firefox 138+) to toggle image loading from chrome context
+        options.add_argument("-remote-allow-system-access")
+    if NETWORK_CAPTURE:
+        capture.bidi_capabilities(options)
+    started = time.monotonic()
+    
+    has_profile = PROFILE_PATH and os.path.exists(PROFILE_PATH)
+    if not has_profile:
+        print("[WARNING] Profile path not found, using default profile")
+    
+    if has_profile and profile_mode in ("in-place", "slim"):
+        profile_dir = PROFILE_PATH
+        if profile_mode == "slim":
+            from slim_profile import refresh_slim_copy
+            profile_dir, copied, copied_bytes = refresh_slim_copy(PROFILE_PATH)
+            print(f"[INFO] Slim profile refreshed: {copied} file(s), "
+                  f"{copied_bytes / 1024:.0f} KiB copied")
+        options.add_argument("-profile")
+        options.add_argument(str(profile_dir))
+        for name, value in prefs.items():
+            options.set_preference(name, value)
+        print(f"[INFO] Using Firefox profile ({profile_mode}): {profile_dir}")
+    else:
+        # Use existing profile - try to modify as little as possible to avoid detection
+        if has_profile:
+            profile = FirefoxProfile(PROFILE_PATH)
+            print(f"[INFO] Using Firefox profile (copy): {PROFILE_PATH}")
+        else:
+            profile = FirefoxProfile()
+        for name, value in prefs.items():
+            profile.set_preference(name, value)
+        
+        # Update the profile (required after setting preferences)
+        profile.update_preferences()
+        
+        # Assign profile to options (Selenium 4.x way)
+        options.profile = profile
     
+    print(f"[INFO] Profile prepared in {time.monotonic() - started:.2f}s")
+    return options
+
+def get_firefox_driver(download_path=None, profile_mode=None):
+    """Launch Firefox (and its own geckodriver) with the configured profile."""
+    from selenium import webdriver
+    from selenium.webdriver.firefox.service import Service
+    
+    started = time.monotonic()
+    options = get_firefox_options(download_path, profile_mode)
     service = Service(log_output=os.devnull)
     driver = webdriver.Firefox(options=options, service=service)
+    print(f"[INFO] Firefox started in {time.monotonic() - started:.2f}s "
+          f"(profile mode: {profile_mode or PROFILE_MODE})")
     
+    return rpcstats.attach(prepare_driver(driver))
+
+LEAN_IMAGE_PREF_SCRIPT = """
+Services.prefs.setIntPref("permissions.default.image", arguments[0]);
+"""
+
+def prepare_driver(driver):
+    """
+    Per-session setup after launch: readiness waits accept an interactive
+    DOM in LEAN_MODE, and the capture hook is registered for NETWORK_CAPTURE.
+    """
+    if LEAN_MODE:
+        waits.READY_STATES = ("interactive", "complete")
+    if NETWORK_CAPTURE:
+        capture.install(driver, SUCKER_URL)
     return driver
 
-def detect_character_name(driver):
-    """Try multiple methods to detect the character name."""
-    wait = WebDriverWait(driver, 5)
+def block_images(driver, blocked):
+    """
+    Turn image loading off (or back on) for the whole browser in lean mode.
     
-    # Method 1: Parse from tab title (most reliable)
+    Called around the sucker.dev tab's turn, while the JanitorAI tab is
+    idle, which makes it effectively a per-tab block. Needs chrome-context
+    access; without it lean mode just keeps the eager load strategy.
+    """
+    if not LEAN_MODE or getattr(driver, '_janitor_images_blocked', False) == blocked:
+        return
+    if getattr(driver, '_janitor_chrome_denied', False):
+        return
     try:
-        title = driver.title.strip()
-        if title:
-            if '(' in title:
-                name = title.split('(')[0].strip()
-            elif '|' in title:
-                name = title.split('|')[0].strip()
-            else:
-                name = title.strip()
-            
-            if name and len(name) < 100:
-                return name
+        driver.execute("SET_CONTEXT", {"context": "chrome"})
+        try:
+            driver.execute_script(LEAN_IMAGE_PREF_SCRIPT, 2 if blocked else 1)
+        finally:
+            driver.execute("SET_CONTEXT", {"context": "content"})
+        driver._janitor_images_blocked = blocked
     except Exception as e:
-        print(f"[DEBUG] Title parsing failed: {e}")
+        driver._janitor_chrome_denied = True
+        print(f"[WARNING] Lean mode can't block images ({e}); using eager loading only")
+
+# Selectors tried (in order) when looking for the name in the chat area
+NAME_SELECTORS = [
+    "span.font-bold",
+    "span[class*='font-bold']",
+    "div[class*='character-name']",
+    "div[class*='char-name']",
+    "h1", "h2", "h3",
+    "[class*='name']"
+]
+NAME_IGNORE = ["Back", "Menu", "Settings", "Login"]
+
+# Caps keep the snapshot a fixed size however long the chat history is
+NAME_SCAN_LIMIT = 50
+
+# Gathers everything detect_character_name needs in one round trip
+NAME_SCAN_SCRIPT = """
+var selectors = arguments[0];
+var limit = arguments[1];
+var withButtons = arguments[2];
+function isVisible(el) {
+    var rect = el.getBoundingClientRect();
+    if (rect.width === 0 || rect.height === 0) return false;
+    var style = window.getComputedStyle(el);
+    return style.display !== 'none' && style.visibility !== 'hidden';
+}
+function visibleTexts(elements) {
+    var out = [];
+    for (var i = 0; i < elements.length && out.length < limit; i++) {
+        var el = elements[i];
+        var text = (el.innerText || '').trim();
+        if (text && text.length < 50 && isVisible(el)) out.push(text);
+    }
+    return out;
+}
+var matches = selectors.map(function (selector) {
+    try {
+        return visibleTexts(document.querySelectorAll(selector));
+    } catch (e) {
+        return [];
+    }
+});
+return {
+    title: document.title || '',
+    url: window.location.href,
+    buttons: withButtons ? visibleTexts(document.getElementsByTagName('button')) : [],
+    selectors: matches
+};
+"""
+
+def scan_name_sources(driver, selectors=NAME_SELECTORS, buttons=True):
+    """Collect title, URL, button texts and selector matches in one call."""
+    return driver.execute_script(NAME_SCAN_SCRIPT, selectors, NAME_SCAN_LIMIT, buttons)
+
+def pick_character_name(snapshot, selectors=NAME_SELECTORS):
+    """
+    Apply the name heuristics to a scan_name_sources() snapshot taken with
+    the given selectors.
+    
+    Returns:
+        (name, method) where method is "title", "button", "selector:<css>"
+        or "url"
+    
+    Raises:
+        Exception: If no method produced a name
+    """
+    # Method 1: Parse from tab title (most reliable)
+    title = (snapshot.get('title') or '').strip()
+    if title:
+        if '(' in title:
+            name = title.split('(')[0].strip()
+        elif '|' in title:
+            name = title.split('|')[0].strip()
+        else:
+            name = title
+        
+        if name and len(name) < 100:
+            return name, "title"
     
     # Method 2: Look for button in navigation bar
-    try:
-        buttons = driver.find_elements(By.TAG_NAME, "button")
-        for button in buttons:
-            text = button.text.strip()
-            if text and len(text) < 50 and text not in ["Back", "Menu", "Settings", "Login"]:
-                if ' ' not in text or len(text.split()[0]) < 20:
-                    return text.split()[0]
-    except:
-        pass
+    for text in snapshot.get('buttons') or []:
+        if text not in NAME_IGNORE:
+            if ' ' not in text or len(text.split()[0]) < 20:
+                return text.split()[0], "button"
     
     # Method 3: Look for name in chat area
-    selectors = [
-        "span.font-bold",
-        "span[class*='font-bold']",
-        "div[class*='character-name']",
-        "div[class*='char-name']",
-        "h1", "h2", "h3",
-        "[class*='name']"
-    ]
-    
-    for selector in selectors:
-        try:
-            elements = driver.find_elements(By.CSS_SELECTOR, selector)
-            for element in elements:
-                text = element.text.strip()
-                if text and len(text) < 50 and text not in ["Back", "Login", "Settings", "Menu"]:
-                    if element.is_displayed():
-                        name = text.split()[0] if ' ' in text else text
-                        if len(name) < 30:
-                            return name
-        except:
-            continue
+    for selector, texts in zip(selectors, snapshot.get('selectors') or []):
+        for text in texts:
+            if text not in NAME_IGNORE:
+                name = text.split()[0] if ' ' in text else text
+                if len(name) < 30:
+                    return name, f"selector:{selector}"
     
     # Method 4: Look in URL
-    try:
-        url = driver.current_url
-        if '/character/' in url:
-            parts = url.split('/character/')
-            if len(parts) > 1:
-                name = parts[1].split('/')[0].strip()
-                if name:
-                    return name
-    except:
-        pass
+    url = snapshot.get('url') or ''
+    if '/character/' in url:
+        name = url.split('/character/')[1].split('/')[0].strip()
+        if name:
+            return name, "url"
     
     raise Exception("Could not detect character name")
 
-def find_chatbox(driver):
-    """Find the chatbox element."""
-    wait = WebDriverWait(driver, 5)
-    
-    selectors = [
-        "textarea",
-        "textarea[placeholder*='message']",
-        "textarea[placeholder*='Message']",
-        "textarea[class*='chat']",
-        "textarea[class*='input']",
-        "textarea[role='textbox']"
-    ]
-    
-    for selector in selectors:
+NAME_METHODS = ["title", "button"] + [f"selector:{s}" for s in NAME_SELECTORS] + ["url"]
+
+def _favourite_scan(method):
+    """scan_name_sources() arguments covering only what method reads."""
+    if method.startswith("selector:"):
+        return [method[len("selector:"):]], False
+    return [], method == "button"
+
+@timing.timed("detect_character_name")
+def detect_character_name(driver):
+    """
+    Detect the character name from a single in-page snapshot.
+    
+    The method that usually wins (see strategies.py) is tried first on a
+    snapshot of just its source; the full snapshot is only taken if that
+    doesn't produce a name by the same method.
+    
+    Returns:
+        (name, method) - see pick_character_name()
+    """
+    stats = strategies.get_stats()
+    started = time.monotonic()
+    favourite = stats.favourite("character_name", NAME_METHODS)
+    if favourite is not None:
+        selectors, buttons = _favourite_scan(favourite)
         try:
-            element = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, selector)))
-            if element.is_displayed() and element.is_enabled():
-                return element
-        except:
-            continue
+            name, method = pick_character_name(scan_name_sources(driver, selectors, buttons), selectors)
+        except Exception:
+            method = None
+        if method == favourite:
+            stats.record("character_name", method, time.monotonic() - started)
+            return name, method
+        stats.miss("character_name", favourite)
     
-    raise Exception("Could not find chatbox")
+    name, method = pick_character_name(scan_name_sources(driver))
+    stats.record("character_name", method, time.monotonic() - started)
+    return name, method
 
-def find_character_in_sucker(driver, char_name):
-    """Find and scroll to the character in sucker.dev, then click download JSON."""
-    wait = WebDriverWait(driver, 10)
-    
-    time.sleep(2)
+CHATBOX_SELECTORS = [
+    "textarea",
+    "textarea[placeholder*='message']",
+    "textarea[placeholder*='Message']",
+    "textarea[class*='chat']",
+    "textarea[class*='input']",
+    "textarea[role='textbox']"
+]
+CHATBOX_TIMEOUT = 5
+
+@timing.timed("find_chatbox")
+def find_chatbox(driver):
+    """Find the chatbox element (selectors tried in adaptive order, see strategies.py)."""
+    element, _ = strategies.locate(driver, "chatbox", CHATBOX_SELECTORS, CHATBOX_TIMEOUT)
+    if element is None:
+        raise Exception("Could not find chatbox")
+    return element
+
+# Reads every rendered card once: its Download JSON button, title line and
+# full text. A card is the largest ancestor of its button that does not
+# also contain the neighbouring cards' buttons, and never climbs past the
+# list container (ul/ol or an ARIA list) or into the page around a lone
+# card.
+CARD_INDEX_SCRIPT = """
+var buttons = Array.from(document.querySelectorAll('button')).filter(function (b) {
+    return (b.textContent || '').indexOf('Download JSON') !== -1;
+});
+function labelsOf(el) {
+    return Array.from(el.querySelectorAll('button')).map(function (b) {
+        return (b.innerText || '').trim();
+    });
+}
+function linesOf(el) {
+    var labels = labelsOf(el);
+    return (el.innerText || '').split('\\n').map(function (line) {
+        return line.trim();
+    }).filter(function (line) {
+        return line && labels.indexOf(line) === -1;
+    });
+}
+function repeated(el) {
+    return Array.from(el.parentElement.children).some(function (sibling) {
+        return sibling !== el && sibling.tagName === el.tagName && sibling.className === el.className;
+    });
+}
+return buttons.map(function (button, i) {
+    var prev = buttons[i - 1], next = buttons[i + 1];
+    var card = button, titled = null, found = false;
+    for (var depth = 0; depth < 8 && !found; depth++) {
+        if (card !== button && !titled && linesOf(card).length) titled = card;
+        // A lone button has no neighbours to stop at: stop at a list item
+        // (an ancestor with text repeated by its siblings) instead
+        if (!prev && !next && titled && repeated(card)) break;
+        var parent = card.parentElement;
+        if (!parent || parent === document.body) break;
+        found = (prev && parent.contains(prev)) || (next && parent.contains(next))
+            || parent.matches('ul, ol, [role="list"], [role="feed"]');
+        if (!found) card = parent;
+    }
+    // No list structure at all (e.g. a one-card list): the nearest ancestor
+    // with text, rather than one that also holds the page header
+    if (!found && !(titled && repeated(card))) card = titled || button;
+    var lines = linesOf(card);
+    return {button: button, title: lines[0] || '', text: lines.join(' ')};
+});
+"""
+
+# Minimum difflib ratio for a fuzzy title match; short names that differ by
+# a letter or a suffix ("Mia"/"Mila", "Aiko"/"Aiko 2") stay below it
+CARD_FUZZY_CUTOFF = 0.9
+
+def normalize_name(text):
+    """Unicode/case-normalize a name for card matching."""
+    text = unicodedata.normalize("NFKC", text or "").casefold()
+    text = text.replace("\u2019", "'").replace("\u2018", "'")
+    text = text.replace("\u201c", '"').replace("\u201d", '"')
+    return " ".join(text.split())
+
+def index_sucker_cards(driver):
+    """
+    Read the rendered sucker.dev card list into an index in one round trip.
     
-    # Scroll to bottom FIRST (newest characters are at the bottom)
-    print("[SUCKER] Scrolling to bottom first...")
-    driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-    time.sleep(1)
+    Returns:
+        (cards, index): cards in page order (oldest first), each a dict with
+        'button', 'title', 'text', 'position' and 'key' (normalized title);
+        index maps a key to the newest card with that title
+    """
+    cards = driver.execute_script(CARD_INDEX_SCRIPT) or []
+    index = {}
+    for position, card in enumerate(cards):
+        card['position'] = position
+        card['key'] = normalize_name(card['title'])
+        # Later cards are newer, so they overwrite older duplicates
+        index[card['key']] = card
+    return cards, index
+
+def match_sucker_card(cards, index, char_name):
+    """
+    Pick the card for char_name: exact title, then a title containing the
+    name as whole words, then a fuzzy title match.
     
-    xpaths = [
-        f"//div[contains(text(), '{char_name}')]//button[contains(text(), 'Download JSON')]",
-        f"//*[contains(text(), '{char_name}')]//following::button[contains(text(), 'Download JSON')]",
-        f"//button[contains(text(), 'Download JSON')][ancestor::*[contains(text(), '{char_name}')]]"
-    ]
+    The newest card wins among cards with the same title, but the substring
+    and fuzzy tiers only accept a single candidate title.
     
-    # Now search from the bottom
-    print(f"[SUCKER] Searching for '{char_name}'...")
-    for xpath in xpaths:
-        try:
-            button = driver.find_element(By.XPATH, xpath)
-            driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", button)
-            time.sleep(0.5)
-            button.click()
-            return True
-        except:
-            continue
+    Returns:
+        The card, or None when nothing matches
     
-    # If not found, scroll up and search
-    print(f"[SUCKER] Not found at bottom, searching upward...")
-    scroll_attempts = 0
-    max_scrolls = 30
+    Raises:
+        Exception: If several different titles match equally well, so the
+            step fails instead of saving another character's JSON
+    """
+    key = normalize_name(char_name)
+    if not key:
+        return None
     
-    while scroll_attempts < max_scrolls:
-        for xpath in xpaths:
-            try:
-                button = driver.find_element(By.XPATH, xpath)
-                driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", button)
-                time.sleep(0.5)
-                button.click()
-                return True
-            except:
-                continue
-        
-        driver.execute_script("window.scrollBy(0, -300);")
-        time.sleep(0.3)
-        scroll_attempts += 1
+    if key in index:
+        return index[key]
     
-    raise Exception(f"Could not find character '{char_name}' in sucker.dev")
+    word = re.compile(rf"(?<!\w){re.escape(key)}(?!\w)")
+    for candidates in (
+        [title for title in index if word.search(title)],
+        difflib.get_close_matches(key, list(index), n=2, cutoff=CARD_FUZZY_CUTOFF),
+    ):
+        if len(candidates) == 1:
+            return index[candidates[0]]
+        if candidates:
+            raise Exception(f"'{char_name}' matches several sucker.dev cards: "
+                            + ", ".join(repr(index[title]['title']) for title in candidates))
+    return None
 
-def find_back_button(driver):
-    """Find and click the back button."""
-    wait = WebDriverWait(driver, 5)
+@timing.timed("find_character_in_sucker")
+def find_character_in_sucker(driver, char_name):
+    """Find the character in sucker.dev's card list and click download JSON."""
+    waits.card_list_settled(driver)
     
-    selectors = [
-        "button[aria-label*='Back' i]",
-        "a[aria-label*='Back' i]",
-        "[class*='back'] button",
-        "[class*='back'] a"
-    ]
+    print(f"[SUCKER] Indexing cards and searching for '{char_name}'...")
+    cards, index = index_sucker_cards(driver)
+    card = match_sucker_card(cards, index, char_name)
     
-    for selector in selectors:
-        try:
-            element = driver.find_element(By.CSS_SELECTOR, selector)
-            if element.is_displayed() and element.is_enabled():
-                element.click()
-                return True
-        except:
-            continue
+    if card is None:
+        # The list may render lazily - load everything from the top once more
+        print(f"[SUCKER] Not found in {len(cards)} cards, re-reading full list...")
+        driver.execute_script("window.scrollTo(0, 0);")
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        waits.card_list_settled(driver)
+        cards, index = index_sucker_cards(driver)
+        card = match_sucker_card(cards, index, char_name)
+    
+    if card is None:
+        raise Exception(f"Could not find character '{char_name}' in sucker.dev")
+    
+    print(f"[SUCKER] Matched card '{card['title']}' ({card['position'] + 1}/{len(cards)})")
+    button = card['button']
+    driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", button)
+    waits.element_interactable(driver, button).click()
+    return True
+
+BACK_SELECTORS = [
+    "button[aria-label*='Back' i]",
+    "a[aria-label*='Back' i]",
+    "[class*='back'] button",
+    "[class*='back'] a"
+]
+
+@timing.timed("find_back_button")
+def find_back_button(driver):
+    """Find and click the back button (selectors in adaptive order, see strategies.py)."""
+    element, _ = strategies.locate(driver, "back_button", BACK_SELECTORS, 0)
+    if element is not None:
+        element.click()
+        return True
     
     # Fallback to browser back
     driver.back()
     return True
 
-def find_character_image_url(driver):
-    """Find the character image URL using Selenium element detection."""
-    print("[IMAGE] Searching for character image using element detection...")
-    wait = WebDriverWait(driver, 10)
+# Collects every <img> in one round trip: visibility, page-relative rect,
+# natural size and src. Ranking happens in Python on the returned snapshot.
+IMAGE_SCAN_SCRIPT = """
+var images = Array.from(document.images).map(function (img) {
+    var rect = img.getBoundingClientRect();
+    var style = window.getComputedStyle(img);
+    var visible = rect.width > 0 && rect.height > 0 &&
+        style.display !== 'none' && style.visibility !== 'hidden' &&
+        parseFloat(style.opacity || '1') > 0;
+    return {
+        src: img.currentSrc || img.src || '',
+        visible: visible,
+        x: rect.left + window.scrollX,
+        y: rect.top + window.scrollY,
+        width: rect.width,
+        height: rect.height,
+        natural_width: img.naturalWidth,
+        natural_height: img.naturalHeight
+    };
+});
+return {
+    page_width: document.body.scrollWidth,
+    page_height: document.body.scrollHeight,
+    images: images
+};
+"""
+
+def scan_images(driver):
+    """Snapshot all images on the page with a single execute_script call."""
+    return driver.execute_script(IMAGE_SCAN_SCRIPT)
+
+def rank_image_candidates(snapshot, min_size=200):
+    """
+    Rank image snapshot entries the way the element-based scan did.
     
-    # Get page dimensions
-    page_width = driver.execute_script("return document.body.scrollWidth")
-    page_height = driver.execute_script("return document.body.scrollHeight")
+    Returns:
+        (candidates, fallbacks): srcs of large images on the left side and
+        below the header, largest first; and any other large visible images
+        in document order
+    """
+    page_width = snapshot.get('page_width') or 0
+    page_height = snapshot.get('page_height') or 0
     
-    # Find all images using Selenium
-    all_images = driver.find_elements(By.TAG_NAME, "img")
     candidates = []
-    
-    for img in all_images:
-        try:
-            if not img.is_displayed():
-                continue
-            
-            size = img.size
-            location = img.location
-            width = size['width']
-            height = size['height']
-            
-            # Character images are large (at least 200x200)
-            if width >= 200 and height >= 200:
-                x_ratio = location['x'] / page_width if page_width > 0 else 0.5
-                y_ratio = location['y'] / page_height if page_height > 0 else 0
-                
-                # Prefer images on left side and not in header
-                if x_ratio < 0.6 and y_ratio > 0.1:
-                    area = width * height
-                    candidates.append({
-                        'element': img,
-                        'src': img.get_attribute('src'),
-                        'area': area,
-                        'x': location['x']
-                    })
-        except:
+    fallbacks = []
+    for img in snapshot.get('images', []):
+        if not img.get('visible') or not img.get('src'):
+            continue
+        width = img['width']
+        height = img['height']
+        
+        # Character images are large (at least 200x200)
+        if width < min_size or height < min_size:
             continue
+        fallbacks.append(img['src'])
+        
+        x_ratio = img['x'] / page_width if page_width > 0 else 0.5
+        y_ratio = img['y'] / page_height if page_height > 0 else 0
+        
+        # Prefer images on left side and not in header
+        if x_ratio < 0.6 and y_ratio > 0.1:
+            candidates.append(img)
+    
+    # Sort by area (largest first), then by x position
+    candidates.sort(key=lambda img: (-img['width'] * img['height'], img['x']))
+    return [img['src'] for img in candidates], fallbacks
+
+@timing.timed("find_character_image_url")
+def find_character_image_url(driver):
+    """Find the character image URL from a single in-page image scan."""
+    print("[IMAGE] Searching for character image...")
+    candidates, fallbacks = rank_image_candidates(scan_images(driver))
     
     if candidates:
-        # Sort by area (largest first), then by x position
-        candidates.sort(key=lambda x: (-x['area'], x['x']))
-        img_url = candidates[0]['src']
+        img_url = candidates[0]
         print(f"[IMAGE] Found character image URL: {img_url[:80]}...")
         return img_url
     
-    # Fallback: try any large image
-    print("[IMAGE] Fallback: Looking for any large image...")
-    for img in all_images:
-        try:
-            if img.is_displayed():
-                size = img.size
-                if size['width'] >= 200 and size['height'] >= 200:
-                    img_url = img.get_attribute('src')
-                    if img_url:
-                        print(f"[IMAGE] Found large image (fallback): {img_url[:80]}...")
-                        return img_url
-        except:
-            continue
+    # Fallback: any large image
+    if fallbacks:
+        img_url = fallbacks[0]
+        print(f"[IMAGE] Found large image (fallback): {img_url[:80]}...")
+        return img_url
     
     raise Exception("Could not find character image URL")
 
-def download_and_convert_image(driver, char_name):
-    """Download image: Open in new tab, find img element, screenshot just that element."""
-    img_url = find_character_image_url(driver)
+# Fetches the image bytes from inside the page and hands them back
+# base64-encoded. The default credentials mode (same-origin) sends cookies
+# to the site itself; cross-origin avatar CDNs answering with
+# Access-Control-Allow-Origin: * would reject a credentialed request
+IMAGE_FETCH_SCRIPT = """
+var url = arguments[0];
+var done = arguments[arguments.length - 1];
+fetch(url)
+    .then(function (response) {
+        if (!response.ok) throw new Error('HTTP ' + response.status);
+        return response.arrayBuffer();
+    })
+    .then(function (buffer) {
+        var bytes = new Uint8Array(buffer);
+        var chunks = [];
+        for (var i = 0; i < bytes.length; i += 0x8000) {
+            chunks.push(String.fromCharCode.apply(null, bytes.subarray(i, i + 0x8000)));
+        }
+        done({data: btoa(chunks.join(''))});
+    })
+    .catch(function (error) {
+        done({error: String(error)});
+    });
+"""
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+IMAGE_FETCH_TIMEOUT = 30
+
+def _fetch_image_in_page(driver, img_url):
+    """Fetch image bytes with an in-page fetch(). Raises on failure."""
+    driver.set_script_timeout(IMAGE_FETCH_TIMEOUT)
+    result = driver.execute_async_script(IMAGE_FETCH_SCRIPT, img_url) or {}
+    if 'data' not in result:
+        raise Exception(result.get('error', 'in-page fetch returned nothing'))
+    return base64.b64decode(result['data'])
+
+def _cookie_matches(cookie, url):
+    """True if the browser would send cookie with a request to url (domain and secure)."""
+    parsed = urllib.parse.urlparse(url)
+    host = (parsed.hostname or "").lower()
+    domain = (cookie.get('domain') or "").lower().lstrip(".")
+    if not domain or not (host == domain or host.endswith("." + domain)):
+        return False
+    return parsed.scheme == "https" or not cookie.get('secure')
+
+def _fetch_image_with_cookies(driver, img_url):
+    """Fetch image bytes over HTTP with the browser's user agent and cookies for img_url's host."""
+    import urllib.request
+    
+    cookies = "; ".join(f"{c['name']}={c['value']}" for c in driver.get_cookies()
+                        if _cookie_matches(c, img_url))
+    headers = {
+        "User-Agent": driver.execute_script("return navigator.userAgent"),
+        "Referer": driver.current_url,
+    }
+    if cookies:
+        headers["Cookie"] = cookies
+    request = urllib.request.Request(img_url, headers=headers)
+    with urllib.request.urlopen(request, timeout=IMAGE_FETCH_TIMEOUT) as response:
+        return response.read()
+
+@timing.timed("fetch_image_bytes")
+def fetch_image_bytes(driver, img_url):
+    """Download the original image bytes without opening a new tab."""
+    if img_url.startswith("data:"):
+        header, _, payload = img_url.partition(",")
+        if header.endswith(";base64"):
+            return base64.b64decode(payload)
+        return urllib.parse.unquote_to_bytes(payload)
+    
+    try:
+        return _fetch_image_in_page(driver, img_url)
+    except Exception as e:
+        # Cross-origin images without CORS headers can't be read in-page
+        print(f"[IMAGE] In-page fetch failed ({e}), retrying with browser cookies...")
+    return _fetch_image_with_cookies(driver, img_url)
+
+def convert_to_png(data):
+    """Return PNG bytes for image data, re-encoding only when it isn't PNG already."""
+    if data.startswith(PNG_SIGNATURE):
+        return data
+    
+    from PIL import Image
+    
+    with Image.open(BytesIO(data)) as img:
+        img.load()
+        if img.mode not in ("RGB", "RGBA", "L", "LA", "P"):
+            img = img.convert("RGBA" if "A" in img.getbands() else "RGB")
+        out = BytesIO()
+        img.save(out, format="PNG")
+    return out.getvalue()
+
+def save_image_as_png(data, save_path):
+    """Convert image bytes to PNG and write them atomically to save_path."""
+    png = convert_to_png(data)
+    tmp_path = save_path + ".part"
+    with open(tmp_path, 'wb') as f:
+        f.write(png)
+    os.replace(tmp_path, save_path)
+    return save_path
+
+def restart_browser(driver, relaunch=None):
+    """Quit driver and start a fresh browser with relaunch() (default: get_firefox_driver())."""
+    try:
+        driver.quit()
+    except Exception:
+        pass
+    return relaunch() if relaunch else get_firefox_driver()
+
+def recycle_if_due(driver, recycler, relaunch=None, record=None, before_restart=None):
+    """
+    Sample the browser after a character and restart it if the recycling
+    policy says so (see resources.py).
     
-    if not img_url:
-        raise Exception("Could not find image URL")
+    before_restart, if given, is called once a restart is decided and
+    before Firefox is quit (e.g. to let downloads in flight finish).
     
-    print("[IMAGE] Opening image in new tab...")
+    Returns:
+        The driver to use for the next character
+    """
+    sample = recycler.measure(driver, record)
+    print(f"[MEMORY] {resources.describe(sample)}")
+    reason = recycler.due()
+    if not reason:
+        return driver
+    print(f"[RECYCLE] Restarting Firefox: {reason}")
+    if before_restart is not None:
+        before_restart()
+    driver = restart_browser(driver, relaunch)
+    recycler.reset()
+    return driver
+
+def save_json(data, char_name, output_dir):
+    """Write captured character JSON to <output_dir>/<char_name>.json atomically."""
+    json_path = os.path.join(output_dir, f"{downloads.safe_filename(char_name)}.json")
+    # Not a .part name: the download watcher would take it for a download
+    tmp_path = f"{json_path}.writing"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    downloads.claim(json_path, source=tmp_path)
+    os.replace(tmp_path, json_path)
+    return json_path
+
+def close_extra_tabs(driver, keep=None):
+    """
+    Reset the session to its working set and switch to `keep` (default:
+    the JanitorAI tab); the pinned sucker.dev tab stays open (see tabs.py).
+    """
+    tabs.reset(driver, keep)
+    block_images(driver, False)
+
+def browse_character(driver, download_path=None, journal=None):
+    """
+    Run the browser-bound part of STEP 1-6 for the current chat page.
     
-    original_window = driver.current_window_handle
+    Stops once the JSON download has started and the image bytes are in
+    memory; finish_character() does the file-side work. Steps already in
+    journal are skipped and their recorded outputs used instead.
     
-    driver.execute_script(f"window.open('{img_url}', '_blank');")
-    time.sleep(1)
+    Args:
+        driver: WebDriver on the character chat page
+        download_path: Directory this driver's Firefox downloads into
+            (default: DOWNLOAD_PATH)
+        journal: checkpoint.Journal to resume from and record into
+            (default: a fresh in-memory one)
     
-    windows = driver.window_handles
-    image_window = [w for w in windows if w != original_window][0]
-    driver.switch_to.window(image_window)
-    time.sleep(2)
+    Returns:
+        dict with 'name', 'name_method', 'download_path' (None when the JSON
+        was captured from the network), 'json_data' (the captured JSON, or
+        None), 'image_data' and 'journal'
+    """
+    journal = journal or checkpoint.Journal()
+    if journal.steps:
+        print(f"[RESUME] Continuing '{journal.get('name')['name']}' at step '{journal.next_step()}'")
     
-    print("[IMAGE] Finding image element on page...")
-    wait = WebDriverWait(driver, 10)
-    try:
-        img_element = wait.until(EC.presence_of_element_located((By.TAG_NAME, "img")))
-        print("[IMAGE] Found img element, taking screenshot of just the image...")
-    except:
-        driver.close()
-        driver.switch_to.window(original_window)
-        raise Exception("Could not find img element on image page")
+    print("[INFO] Waiting for page to stabilize...")
+    with timing.span("page_ready"):
+        waits.document_ready(driver)
     
-    save_path = os.path.join(DOWNLOAD_PATH, f"{char_name}.png")
-    print(f"[IMAGE] Saving image to {save_path}...")
+    # Step 1: Detect character name
+    done = journal.get("name")
+    if done:
+        char_name, name_method = done['name'], done['name_method']
+    else:
+        print("\n[STEP 1] Detecting character name...")
+        with timing.span("step1_detect_name"):
+            char_name, name_method = detect_character_name(driver)
+        print(f"[SUCCESS] Character name detected: {char_name} (via {name_method})")
+        journal.record("name", journal.page_of(driver), name=char_name, name_method=name_method)
+    timing.set_character(char_name)
     
-    try:
-        img_element.screenshot(save_path)
-        print(f"[SUCCESS] Image saved as PNG: {save_path}")
-    except Exception as e:
-        driver.close()
-        driver.switch_to.window(original_window)
-        print(f"[ERROR] Element screenshot failed: {e}")
-        raise
+    # Step 2: Paste name into chatbox and send
+    if not journal.done("name_sent"):
+        from selenium.webdriver.common.keys import Keys
+        print("\n[STEP 2] Pasting character name into chatbox...")
+        with timing.span("step2_send_name"):
+            chatbox = waits.element_interactable(driver, find_chatbox(driver))
+            chatbox.click()
+            chatbox.clear()
+            chatbox.send_keys(char_name)
+            mentions_before = waits.count_text_occurrences(driver, char_name)
+            chatbox.send_keys(Keys.ENTER)
+            waits.chat_message_appeared(driver, char_name, mentions_before)
+        print("[SUCCESS] Name sent to chatbox")
+        journal.record("name_sent", journal.page_of(driver))
     
-    driver.close()
-    driver.switch_to.window(original_window)
-    time.sleep(0.5)
+    done = journal.get("json")
+    if done:
+        download_path, json_data = done['download_path'], done['json_data']
+    else:
+        # Step 3: Switch to the sucker.dev tab, refreshing it, or open one
+        print("\n[STEP 3] Opening sucker.dev...")
+        with timing.span("step3_open_sucker"):
+            janitor_window = driver.current_window_handle
+            # With network capture the card data is all we wait for
+            capturing = NETWORK_CAPTURE and capture.installed(driver)
+            block_images(driver, True)
+            sucker_state = tabs.open_sucker(driver, SUCKER_URL, janitor_window,
+                                            wait_for_load=not capturing)
+            if not capturing:
+                waits.document_ready(driver)
+        print(f"[SUCCESS] sucker.dev tab {sucker_state}")
+        
+        # Step 4: Find character and download JSON
+        print(f"\n[STEP 4] Searching for '{char_name}' in sucker.dev...")
+        with timing.span("step4_download_json"):
+            json_data = None
+            if capturing:
+                json_data = capture.wait_for_card(driver, char_name)
+            if json_data is None:
+                if sucker_state == 'requeried':
+                    # The rendered list predates the in-place requery
+                    driver.refresh()
+                elif capturing:
+                    waits.document_ready(driver)
+                download_dir = download_path or DOWNLOAD_PATH
+                files_before = downloads.snapshot(download_dir)
+                find_character_in_sucker(driver, char_name)
+                print(f"[SUCCESS] JSON download initiated")
+                download_path = downloads.wait_for_download_start(download_dir, files_before)
+            else:
+                download_path = None
+                print("[SUCCESS] Character JSON captured from the network")
+            
+            # Return to JanitorAI (closing the sucker.dev tab unless pinned)
+            tabs.leave_sucker(driver, janitor_window)
+            block_images(driver, False)
+        journal.record("json", journal.page_of(driver),
+                       download_path=download_path, json_data=json_data)
     
-    return save_path
+    # Step 5: Click back button (recorded before the page settles, so a
+    # retry never clicks back a second time; the page it landed on is
+    # added once it has loaded)
+    if not journal.done("navigated_back"):
+        print("\n[STEP 5] Navigating back...")
+        with timing.span("step5_navigate_back"):
+            try:
+                find_back_button(driver)
+                print("[SUCCESS] Navigated back")
+            except Exception as e:
+                print(f"[WARNING] Back button issue (using browser back): {e}")
+                driver.back()
+            journal.record("navigated_back")
+            waits.document_ready(driver)
+        journal.record("navigated_back", journal.page_of(driver))
+    
+    # Step 6: Download image
+    print("\n[STEP 6] Downloading character image...")
+    with timing.span("step6_fetch_image"):
+        done = journal.get("image_url")
+        if done:
+            img_url = done['image_url']
+        else:
+            waits.large_image_present(driver)
+            img_url = find_character_image_url(driver)
+            journal.record("image_url", journal.page_of(driver), image_url=img_url)
+        image_data = fetch_image_bytes(driver, img_url)
+    
+    return {
+        'name': char_name,
+        'name_method': name_method,
+        'download_path': download_path,
+        'json_data': json_data,
+        'image_data': image_data,
+        'journal': journal,
+    }
+
+def finish_character(pending, output_dir=None):
+    """
+    File-side part of a sync: wait for the JSON, rename it and save the PNG.
+    
+    Saving the JSON and the image are checkpointed in pending's journal.
+    
+    Args:
+        pending: Result of browse_character()
+        output_dir: Where <name>.json and <name>.png end up (default: DOWNLOAD_PATH)
+    
+    Returns:
+        dict with 'name', 'name_method', 'json_path', 'image_path' and
+        'card_path' (None unless PACK_CARDS is set)
+    """
+    char_name = pending['name']
+    output_dir = output_dir or DOWNLOAD_PATH
+    journal = pending.get('journal') or checkpoint.Journal()
+    
+    done = journal.get("json_saved")
+    if done:
+        json_path = done['json_path']
+    else:
+        with timing.span("finish_json"):
+            if pending.get('json_data') is not None:
+                json_path = save_json(pending['json_data'], char_name, output_dir)
+            else:
+                try:
+                    json_path = downloads.wait_for_file(pending['download_path'])
+                except TimeoutError:
+                    # Waiting again won't bring the file: a retry has to
+                    # click Download JSON again (STEP 3-4)
+                    journal.forget("json")
+                    raise
+                json_path = downloads.finalize_download(json_path, char_name, output_dir)
+        journal.record("json_saved", json_path=json_path)
+    print(f"[SUCCESS] JSON saved as: {json_path}")
+    
+    done = journal.get("image_saved")
+    if done:
+        image_path = done['image_path']
+    else:
+        with timing.span("finish_image"):
+            image_path = os.path.join(output_dir, f"{downloads.safe_filename(char_name)}.png")
+            save_image_as_png(pending['image_data'], image_path)
+        print(f"[SUCCESS] Image saved as PNG: {image_path}")
+        
+        if IMAGE_FORMAT:
+            import transcode
+            with timing.span("finish_transcode"):
+                image_path, before, after = transcode.transcode_inline(
+                    image_path, IMAGE_FORMAT, IMAGE_MAX_SIZE
+                )
+            print(f"[IMAGE] Re-encoded as {IMAGE_FORMAT}: {image_path} "
+                  f"({before} -> {after} bytes)")
+        journal.record("image_saved", image_path=image_path)
+    
+    if CONTENT_STORE:
+        import blobstore
+        with timing.span("finish_store"):
+            for path in (json_path, image_path):
+                digest, outcome = blobstore.store(path, output_dir)
+                if outcome == "deduplicated":
+                    print(f"[STORE] {os.path.basename(path)} has the same content as an "
+                          f"earlier export, linked to blob {digest[:12]}")
+    
+    card_path = None
+    if PACK_CARDS:
+        import pack
+        with timing.span("finish_pack"):
+            card_path = pack.card_path_for(json_path)
+            pack.pack_pair(json_path, image_path, card_path)
+        print(f"[SUCCESS] Character card saved as: {card_path}")
+    
+    return {
+        'name': char_name,
+        'name_method': pending['name_method'],
+        'json_path': json_path,
+        'image_path': image_path,
+        'card_path': card_path,
+    }
+
+def verify_outputs(result):
+    """
+    Check that the exported JSON parses and the PNG decodes.
+    
+    Raises:
+        Exception: If either file is missing or broken
+    """
+    from PIL import Image
+    
+    with open(result['json_path'], 'r', encoding='utf-8') as f:
+        json.load(f)
+    with Image.open(result['image_path']) as img:
+        img.verify()
+    return result
 
-def main():
-    print("[INIT] Launching Firefox via Selenium...")
-    driver = get_firefox_driver()
+def sync_character(driver, url=None):
+    """
+    Run STEP 1-6 for the character chat page currently open in driver.
     
+    Each finished step is checkpointed (see checkpoint.py). A failed step
+    is retried up to STEP_RETRIES times with exponential backoff after a
+    session reset, resuming at that step; if it keeps failing the journal
+    stays on disk and the next call for the same page resumes as well.
+    The run is recorded as one timing trace (see timing.py) unless the
+    caller already started one.
+    
+    Args:
+        driver: WebDriver on the character chat page
+        url: The chat page URL, if the caller already knows it
+    
+    Returns:
+        dict with 'name', 'name_method', 'json_path', 'image_path',
+        'card_path' and 'url' (the chat page the export started on)
+    """
+    url = url or driver.current_url
+    journal = checkpoint.open_journal(url) if CHECKPOINTS else checkpoint.Journal(url)
+    with timing.traced():
+        attempt = 0
+        while True:
+            try:
+                result = finish_character(browse_character(driver, journal=journal))
+                break
+            except Exception as e:
+                if attempt >= STEP_RETRIES:
+                    raise
+                delay = RETRY_BACKOFF * 2 ** attempt
+                attempt += 1
+                print(f"\n[RETRY] Step '{journal.next_step()}' failed: {e}")
+                print(f"[RETRY] Resuming in {delay:.0f}s (retry {attempt} of {STEP_RETRIES})")
+                close_extra_tabs(driver)
+                time.sleep(delay)
+                journal.rewind(driver.current_url)
+    journal.clear()
+    result['url'] = journal.url
+    return result
+
+def main(driver=None, relaunch=None):
+    """
+    Interactive sync loop.
+    
+    Args:
+        driver: Already running WebDriver to use (e.g. from session.py);
+            a new browser is launched when omitted
+        relaunch: Callable returning a fresh driver when the browser is
+            recycled (default: get_firefox_driver)
+    """
+    if driver is None:
+        print("[INIT] Launching Firefox via Selenium...")
+        driver = get_firefox_driver()
+    else:
+        print("[INIT] Reusing running Firefox session...")
+    
+    recycler = resources.BrowserRecycler()
     try:
         print("[INFO] Browser opened. Please navigate to JanitorAI manually.")
         print("[INFO] This avoids automated navigation detection.")
@@ -349,71 +1055,25 @@ def main():
                     print("[INFO] Exiting...")
                     break
                 
-                print("[INFO] Waiting for page to stabilize...")
-                time.sleep(2)
-                
-                # Step 1: Detect character name
-                print("\n[STEP 1] Detecting character name...")
-                char_name = detect_character_name(driver)
-                print(f"[SUCCESS] Character name detected: {char_name}")
-                
-                # Step 2: Paste name into chatbox and send
-                print("\n[STEP 2] Pasting character name into chatbox...")
-                chatbox = find_chatbox(driver)
-                chatbox.click()
-                time.sleep(0.8)
-                chatbox.clear()
-                chatbox.send_keys(char_name)
-                time.sleep(0.5)
-                chatbox.send_keys(Keys.ENTER)
-                print("[SUCCESS] Name sent to chatbox")
-                time.sleep(2)
-                
-                # Step 3: Open sucker.dev in new tab
-                print("\n[STEP 3] Opening sucker.dev in new tab...")
-                janitor_window = driver.current_window_handle
-                driver.execute_script("window.open('https://sucker.severian.dev/', '_blank');")
-                time.sleep(1)
-                
-                windows = driver.window_handles
-                sucker_window = [w for w in windows if w != janitor_window][0]
-                driver.switch_to.window(sucker_window)
-                time.sleep(3)
-                
-                # Step 4: Find character and download JSON
-                print(f"\n[STEP 4] Searching for '{char_name}' in sucker.dev...")
-                find_character_in_sucker(driver, char_name)
-                print(f"[SUCCESS] JSON download initiated")
-                time.sleep(2)
-                
-                # Close sucker tab and return to JanitorAI
-                driver.close()
-                driver.switch_to.window(janitor_window)
-                time.sleep(1)
-                
-                # Step 5: Click back button
-                print("\n[STEP 5] Navigating back...")
-                try:
-                    find_back_button(driver)
-                    print("[SUCCESS] Navigated back")
-                    time.sleep(2)
-                except Exception as e:
-                    print(f"[WARNING] Back button issue (using browser back): {e}")
-                    driver.back()
-                    time.sleep(2)
+                import manifest
+                url = driver.current_url
+                previous = manifest.previous_export(url)
+                if previous is not None:
+                    exported = time.strftime("%Y-%m-%d %H:%M", time.localtime(previous['exported_at']))
+                    print(f"[INFO] '{previous['name']}' was already exported on {exported}, exporting again")
                 
-                # Step 6: Download and convert image
-                print("\n[STEP 6] Downloading character image...")
-                download_and_convert_image(driver, char_name)
+                result = sync_character(driver, url)
+                manifest.record_export(result['url'], result)
                 
                 print("\n" + "="*60)
                 print(" " * 18 + "SUCCESS!")
                 print("="*60)
-                print(f"  JSON downloaded to: {DOWNLOAD_PATH}")
-                print(f"  Image saved as: {char_name}.png")
+                print(f"  JSON saved as: {result['json_path']}")
+                print(f"  Image saved as: {result['image_path']}")
                 print("\n  Ready for next character. Press ENTER to continue.")
                 print("  (Type 'quit' to exit)")
                 print("="*60 + "\n")
+                driver = recycle_if_due(driver, recycler, relaunch)
                 
             except KeyboardInterrupt:
                 print("\n[INFO] Interrupted by user. Exiting...")
@@ -422,18 +1082,11 @@ def main():
                 print(f"\n[ERROR] An error occurred: {e}")
                 import traceback
                 traceback.print_exc()
-                print("\n  Returning to start. Fix the issue and press ENTER to try again.")
+                print("\n  Fix the issue and press ENTER to resume from the failed step.")
                 print("  (Type 'quit' to exit)\n")
-                # Close any extra tabs
                 try:
-                    windows = driver.window_handles
-                    if len(windows) > 1:
-                        current = driver.current_window_handle
-                        for window in windows:
-                            if window != current:
-                                driver.switch_to.window(window)
-                                driver.close()
-                        driver.switch_to.window(windows[0])
+                    close_extra_tabs(driver)
+                    driver = recycle_if_due(driver, recycler, relaunch)
                 except:
                     pass
                 continue
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+The browser's tab working set: the JanitorAI tab plus one sucker.dev tab.
+
+With PIN_SUCKER_TAB, the sucker.dev tab is opened once per browser and
+kept between characters. For each new character its card list is
+refreshed in place instead of paying for a new tab and a cold page load.
+With network capture that means re-fetching the page's JSON endpoints
+without touching the page; otherwise it means reloading the tab. The tab
+is reopened only once it has gone stale (closed, crashed or navigated
+away from sucker.dev). Without PIN_SUCKER_TAB every character opens and
+closes its own tab as before.
+"""
+
+from urllib.parse import urlparse
+
+import capture
+import waits
+
+# --- CONFIGURATION ---
+# Keep one sucker.dev tab open for the whole session
+PIN_SUCKER_TAB = True
+
+# Tabs opened by OPEN_TAB_SCRIPT can be closed again by their opener in one
+# call, instead of a switch_to.window + close round trip pair per tab
+OPEN_TAB_SCRIPT = """
+var opened = window.open(arguments[0], '_blank');
+window.__janitorOpened = (window.__janitorOpened || []).concat(opened ? [opened] : []);
+"""
+CLOSE_OPENED_SCRIPT = """
+var opened = (window.__janitorOpened || []).filter(function (w) { return !w.closed; });
+opened.forEach(function (w) { w.close(); });
+window.__janitorOpened = [];
+return opened.length;
+"""
+
+
+def pinned(driver):
+    """Handle of driver's pinned sucker.dev tab, or None."""
+    return getattr(driver, '_janitor_sucker_tab', None)
+
+
+def _origin(url):
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc}"
+
+
+def _refresh(driver, sucker_url, requery):
+    """
+    Refresh the pinned tab driver has switched to.
+
+    Returns:
+        'requeried' or 'reloaded', or None if the tab is stale
+    """
+    if requery and capture.requery(driver):
+        return 'requeried'
+    if driver.execute_script("return location.origin") != _origin(sucker_url):
+        return None
+    driver.refresh()
+    return 'reloaded'
+
+
+def _close_quietly(driver, handle, home):
+    from selenium.common.exceptions import WebDriverException
+
+    try:
+        if handle in driver.window_handles:
+            driver.switch_to.window(handle)
+            driver.close()
+    except WebDriverException:
+        pass
+    driver.switch_to.window(home)
+
+
+def open_sucker(driver, sucker_url, home, wait_for_load=True):
+    """
+    Switch to a sucker.dev tab with an up-to-date card list.
+
+    Args:
+        driver: WebDriver currently on the JanitorAI tab
+        sucker_url: sucker.dev URL to open
+        home: Handle of the JanitorAI tab
+        wait_for_load: Whether a newly opened tab should have loaded when
+            this returns (the network capture only needs it to be loading)
+
+    Returns:
+        'requeried' (card data re-fetched in place, page untouched),
+        'reloaded' or 'opened'
+    """
+    from selenium.common.exceptions import WebDriverException
+
+    handle = pinned(driver)
+    if handle is not None:
+        try:
+            driver.switch_to.window(handle)
+            refreshed = _refresh(driver, sucker_url, requery=capture.installed(driver))
+            if refreshed:
+                return refreshed
+            print("[TABS] sucker.dev tab navigated away, reopening it")
+        except WebDriverException as e:
+            print(f"[TABS] sucker.dev tab is gone ({type(e).__name__}), reopening it")
+        driver._janitor_sucker_tab = None
+        _close_quietly(driver, handle, home)
+
+    if not PIN_SUCKER_TAB:
+        handles_before = driver.window_handles
+        driver.execute_script(OPEN_TAB_SCRIPT, sucker_url)
+        driver.switch_to.window(waits.tab_count_changed(driver, handles_before)[0])
+        return 'opened'
+
+    driver.switch_to.new_window('tab')
+    if wait_for_load:
+        driver.get(sucker_url)
+    else:
+        driver.execute_script("location.href = arguments[0];", sucker_url)
+    driver._janitor_sucker_tab = driver.current_window_handle
+    return 'opened'
+
+
+def leave_sucker(driver, home):
+    """Go back to the JanitorAI tab, closing the sucker.dev tab unless it is pinned."""
+    if pinned(driver) is None:
+        driver.close()
+    driver.switch_to.window(home)
+
+
+def reset(driver, keep=None):
+    """
+    Reset the session to its working set: the tab `keep` (default: the
+    first one that isn't the pinned sucker.dev tab) plus the pinned tab.
+
+    Tabs the page opened itself are closed from the page in one script;
+    only tabs it doesn't know about are closed one by one.
+    """
+    from selenium.common.exceptions import NoSuchWindowException
+
+    windows = driver.window_handles
+    sucker = pinned(driver)
+    keep = keep or next((w for w in windows if w != sucker), windows[0])
+    driver.switch_to.window(keep)
+    working_set = {keep, sucker}
+    if any(w not in working_set for w in windows):
+        closed = driver.execute_script(CLOSE_OPENED_SCRIPT) or 0
+        remaining = len(windows) - closed
+        if closed:
+            try:
+                waits.wait_for(driver, "tab_count_changed",
+                               lambda d: len(d.window_handles) <= remaining)
+            except Exception:
+                pass
+        leftover = [w for w in driver.window_handles if w not in working_set]
+        for window in leftover:
+            try:
+                driver.switch_to.window(window)
+                driver.close()
+            except NoSuchWindowException:
+                pass
+        if leftover:
+            driver.switch_to.window(keep)
+    return keep
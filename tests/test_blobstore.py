@@ -0,0 +1,86 @@
+import os
+import shutil
+
+import blobstore
+
+
+def write(path, data):
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_same_bytes_are_stored_once(tmp_path):
+    first = write(tmp_path / "Aiko.json", b'{"name": "Aiko"}')
+    second = write(tmp_path / "Aiko (copy).json", b'{"name": "Aiko"}')
+
+    digest, outcome = blobstore.store(first)
+    assert outcome == "new"
+    assert blobstore.store(second) == (digest, "deduplicated")
+    # Storing a file that already is the blob is a no-op
+    assert blobstore.store(first) == (digest, "deduplicated")
+
+    blob = blobstore.blob_path(str(tmp_path), digest)
+    assert os.path.samefile(first, blob) and os.path.samefile(second, blob)
+    assert os.stat(blob).st_nlink == 3
+
+
+def test_reflink_is_used_where_hardlinks_fail(tmp_path, monkeypatch):
+    def no_hardlinks(src, dst):
+        raise OSError("hardlinks not supported")
+
+    reflinked = []
+
+    def reflink(src, dst):
+        reflinked.append(dst)
+        shutil.copyfile(src, dst)
+
+    monkeypatch.setattr(blobstore.os, "link", no_hardlinks)
+    monkeypatch.setattr(blobstore, "_reflink", reflink)
+    first = write(tmp_path / "Aiko.png", b"png bytes")
+    second = write(tmp_path / "Aiko 2.png", b"png bytes")
+
+    digest, outcome = blobstore.store(first)
+    assert outcome == "new"
+    assert blobstore.store(second) == (digest, "deduplicated")
+    assert len(reflinked) == 2
+    assert open(second, 'rb').read() == b"png bytes"
+
+
+def test_files_stay_plain_without_hardlinks_or_reflinks(tmp_path, monkeypatch):
+    def unsupported(src, dst):
+        raise OSError("not supported")
+
+    monkeypatch.setattr(blobstore.os, "link", unsupported)
+    monkeypatch.setattr(blobstore, "_reflink", unsupported)
+    path = write(tmp_path / "Aiko.json", b"{}")
+    assert blobstore.store(path)[1] == "unlinked"
+    assert open(path, 'rb').read() == b"{}"
+
+
+def test_gc_dry_run_only_reports(tmp_path, capsys):
+    kept = write(tmp_path / "Aiko.json", b"kept")
+    orphan = write(tmp_path / "Brenna.json", b"orphaned blob")
+    blobstore.store(kept)
+    orphan_digest, _ = blobstore.store(orphan)
+    os.remove(orphan)
+    orphan_blob = blobstore.blob_path(str(tmp_path), orphan_digest)
+
+    assert blobstore.gc(str(tmp_path), dry_run=True) == (1, len(b"orphaned blob"), 1)
+    assert blobstore.gc_main(str(tmp_path), dry_run=True) == 0
+    assert "Would remove 1 unreferenced blob(s)" in capsys.readouterr().out
+    assert os.path.exists(orphan_blob)
+
+    assert blobstore.gc(str(tmp_path)) == (1, len(b"orphaned blob"), 1)
+    assert not os.path.exists(orphan_blob)
+    assert blobstore.gc(str(tmp_path)) == (0, 0, 1)
+
+
+def test_gc_keeps_single_link_blobs_backing_a_reflinked_file(tmp_path):
+    path = write(tmp_path / "Aiko.png", b"reflinked")
+    digest, _ = blobstore.store(path)
+    # A reflinked copy is a separate inode with the same content
+    os.remove(path)
+    write(tmp_path / "Aiko.png", b"reflinked")
+
+    assert blobstore.gc(str(tmp_path)) == (0, 0, 1)
+    assert os.path.exists(blobstore.blob_path(str(tmp_path), digest))
@@ -0,0 +1,97 @@
+import json
+import shutil
+import subprocess
+
+import pytest
+
+import sync
+
+# Just enough DOM for CARD_INDEX_SCRIPT: every element is a block, so
+# innerText is its own text and its children's, one per line
+DOM_SHIM = """
+function Element(spec, parent) {
+    this.tagName = spec.tag.toUpperCase();
+    this.className = spec.cls || '';
+    this.role = spec.role || null;
+    this.text = spec.text || '';
+    this.parentElement = parent;
+    var self = this;
+    this.children = (spec.children || []).map(function (child) { return new Element(child, self); });
+}
+Element.prototype.descendants = function () {
+    return this.children.reduce(function (all, child) {
+        return all.concat([child], child.descendants());
+    }, []);
+};
+Element.prototype.querySelectorAll = function (tag) {
+    return this.descendants().filter(function (el) { return el.tagName === tag.toUpperCase(); });
+};
+Element.prototype.contains = function (other) {
+    return other === this || this.descendants().indexOf(other) !== -1;
+};
+Element.prototype.matches = function (selectors) {
+    var self = this;
+    return selectors.split(',').some(function (selector) {
+        var role = /\\[role="(\\w+)"\\]/.exec(selector);
+        return role ? self.role === role[1] : self.tagName === selector.trim().toUpperCase();
+    });
+};
+Object.defineProperty(Element.prototype, 'innerText', {get: function () {
+    return [this.text].concat(this.children.map(function (c) { return c.innerText; }))
+        .filter(Boolean).join('\\n');
+}});
+Object.defineProperty(Element.prototype, 'textContent', {get: function () {
+    return this.innerText;
+}});
+"""
+
+pytestmark = pytest.mark.skipif(shutil.which("node") is None, reason="needs node")
+
+
+def card_titles(body):
+    """Run CARD_INDEX_SCRIPT over a DOM built from body and return the card titles."""
+    program = (
+        DOM_SHIM
+        + f"var document = {{body: new Element({json.dumps(body)}, null)}};\n"
+        + "document.querySelectorAll = function (t) { return document.body.querySelectorAll(t); };\n"
+        + f"var cards = (function () {{ {sync.CARD_INDEX_SCRIPT} }})();\n"
+        + "console.log(JSON.stringify(cards.map(function (c) { return c.title; })));\n"
+    )
+    result = subprocess.run(["node", "-e", program], capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+
+def card(name):
+    return {"tag": "div", "cls": "card", "children": [
+        {"tag": "img"},
+        {"tag": "div", "children": [
+            {"tag": "div", "cls": "title", "text": name},
+            {"tag": "p", "text": f"{name} is a fixture character."},
+            {"tag": "button", "text": "Download JSON"},
+        ]},
+    ]}
+
+
+def page(*cards):
+    """An app root holding the page header and, further down, the card list."""
+    return {"tag": "body", "children": [{"tag": "div", "cls": "app", "children": [
+        {"tag": "header", "children": [{"tag": "h1", "text": "Captured characters"}]},
+        {"tag": "main", "children": [{"tag": "div", "cls": "cards", "children": list(cards)}]},
+    ]}]}
+
+
+def test_each_card_of_a_list_gets_its_own_title():
+    assert card_titles(page(card("Aiko"), card("Brenna"), card("Céline"))) == ["Aiko", "Brenna", "Céline"]
+
+
+def test_one_card_list_does_not_take_the_page_header():
+    assert card_titles(page(card("Aiko"))) == ["Aiko"]
+
+
+def test_one_card_list_stops_at_the_list_container():
+    body = page()
+    body["children"][0]["children"][1]["children"] = [{"tag": "ul", "children": [
+        {"tag": "li", "children": [{"tag": "div", "text": "Aiko"},
+                                   {"tag": "div", "children": [{"tag": "button", "text": "Download JSON"}]}]},
+    ]}]
+    assert card_titles(body) == ["Aiko"]
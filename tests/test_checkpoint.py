@@ -0,0 +1,99 @@
+import checkpoint
+import sync
+import timing
+import waits
+
+
+class FakeDriver:
+    def __init__(self, url):
+        self.current_url = url
+
+
+def test_step5_back_is_clicked_once_when_page_load_times_out(tmp_path, monkeypatch):
+    monkeypatch.setattr(checkpoint, "CHECKPOINT_DIR", str(tmp_path))
+    monkeypatch.setattr(timing, "TIMING_ENABLED", False)
+    monkeypatch.setattr(sync, "CHECKPOINTS", True)
+    monkeypatch.setattr(sync, "STEP_RETRIES", 1)
+    monkeypatch.setattr(sync.time, "sleep", lambda seconds: None)
+    monkeypatch.setattr(sync, "close_extra_tabs", lambda driver: None)
+
+    chat, character = "https://janitorai.test/chats/1", "https://janitorai.test/characters/1"
+    journal = checkpoint.open_journal(chat)
+    journal.record("name", chat, name="Aiko", name_method="title")
+    journal.record("name_sent", chat)
+    journal.record("json", chat, download_path="/tmp/Aiko.json", json_data=None)
+
+    driver = FakeDriver(chat)
+    clicks = []
+
+    def find_back_button(d):
+        clicks.append(d.current_url)
+        d.current_url = character
+        return True
+
+    ready_calls = []
+
+    def document_ready(d, timeout=None):
+        ready_calls.append(d.current_url)
+        # The first wait after the click times out on the character page
+        if d.current_url == character and ready_calls.count(character) == 1:
+            raise TimeoutError("Timed out waiting for 'document_ready'")
+        return True
+
+    monkeypatch.setattr(sync, "find_back_button", find_back_button)
+    monkeypatch.setattr(waits, "document_ready", document_ready)
+    monkeypatch.setattr(waits, "large_image_present", lambda d, timeout=None: True)
+    monkeypatch.setattr(sync, "find_character_image_url", lambda d: "https://img.test/a.png")
+    monkeypatch.setattr(sync, "fetch_image_bytes", lambda d, url: b"png")
+    monkeypatch.setattr(sync, "finish_character", lambda pending: {'name': pending['name']})
+
+    result = sync.sync_character(driver, chat)
+
+    assert clicks == [chat]
+    assert result == {'name': "Aiko", 'url': chat}
+    assert not list(tmp_path.iterdir())
+
+
+def test_download_timeout_makes_the_retry_download_again(tmp_path, monkeypatch):
+    monkeypatch.setattr(checkpoint, "CHECKPOINT_DIR", str(tmp_path))
+    monkeypatch.setattr(timing, "TIMING_ENABLED", False)
+    monkeypatch.setattr(sync, "CHECKPOINTS", True)
+    monkeypatch.setattr(sync, "STEP_RETRIES", 1)
+    monkeypatch.setattr(sync.time, "sleep", lambda seconds: None)
+    monkeypatch.setattr(sync, "close_extra_tabs", lambda driver: None)
+
+    chat = "https://janitorai.test/chats/1"
+    journal = checkpoint.open_journal(chat)
+    journal.record("name", chat, name="Aiko", name_method="title")
+    journal.record("name_sent", chat)
+    journal.record("json", chat, download_path=str(tmp_path / "lost.json"), json_data=None)
+    journal.record("navigated_back", chat)
+    journal.record("image_url", chat, image_url="https://img.test/a.png")
+
+    downloads_clicked = []
+
+    def browse_character(driver, journal):
+        if not journal.done("json"):
+            downloads_clicked.append(driver.current_url)
+            journal.record("json", download_path=str(tmp_path / "Aiko.json"), json_data=None)
+        return {'name': "Aiko", 'name_method': "title", 'download_path': journal.get("json")['download_path'],
+                'image_data': b"png", 'journal': journal}
+
+    def wait_for_file(path, timeout=None):
+        if path.endswith("lost.json"):
+            raise TimeoutError(f"Download {path} did not finish")
+        return path
+
+    monkeypatch.setattr(sync, "browse_character", browse_character)
+    monkeypatch.setattr(sync.downloads, "wait_for_file", wait_for_file)
+    monkeypatch.setattr(sync.downloads, "finalize_download", lambda path, name, directory: path)
+    monkeypatch.setattr(sync, "save_image_as_png", lambda data, path: None)
+    monkeypatch.setattr(sync, "IMAGE_FORMAT", None)
+    monkeypatch.setattr(sync, "CONTENT_STORE", False)
+    monkeypatch.setattr(sync, "PACK_CARDS", False)
+    monkeypatch.setattr(sync, "DOWNLOAD_PATH", str(tmp_path))
+
+    result = sync.sync_character(FakeDriver(chat), chat)
+
+    assert downloads_clicked == [chat]
+    assert result['json_path'] == str(tmp_path / "Aiko.json")
@@ -0,0 +1,27 @@
+import pytest
+
+import cli
+
+
+@pytest.mark.parametrize("argv", [
+    ["transcode", "--max-size", "768"],
+    ["transcode", "--max-size", "0x768"],
+    ["--image-format", "webp", "--image-max-size", "768"],
+    ["--image-max-size", "768x768"],
+])
+def test_bad_size_options_are_usage_errors(argv, capsys):
+    with pytest.raises(SystemExit) as exc:
+        cli.main(argv)
+    assert exc.value.code == 2
+    assert "max-size" in capsys.readouterr().err
+
+
+def test_transcode_gets_the_parsed_size(monkeypatch):
+    import transcode
+
+    calls = []
+    monkeypatch.setattr(transcode, "main", lambda *args: calls.append(args) or 0)
+    with pytest.raises(SystemExit) as exc:
+        cli.main(["transcode", "exports", "--max-size", "512x768"])
+    assert exc.value.code == 0
+    assert calls[0][:3] == ("exports", "png", (512, 768))
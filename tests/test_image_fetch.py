@@ -0,0 +1,17 @@
+import sync
+
+
+def cookie(domain, secure=False):
+    return {'name': "session", 'value': "x", 'domain': domain, 'secure': secure}
+
+
+def test_cookies_only_go_to_their_domain():
+    assert sync._cookie_matches(cookie(".janitorai.com"), "https://janitorai.com/a.png")
+    assert sync._cookie_matches(cookie(".janitorai.com"), "https://ella.janitorai.com/a.png")
+    assert sync._cookie_matches(cookie("janitorai.com"), "https://janitorai.com/a.png")
+    assert not sync._cookie_matches(cookie(".janitorai.com"), "https://cdn.example.net/a.png")
+    assert not sync._cookie_matches(cookie("janitorai.com"), "https://notjanitorai.com/a.png")
+
+
+def test_secure_cookies_need_https():
+    assert not sync._cookie_matches(cookie("janitorai.com", secure=True), "http://janitorai.com/a.png")
@@ -0,0 +1,79 @@
+import os
+import sqlite3
+
+import manifest
+
+
+def test_unreadable_manifest_warns_instead_of_failing(tmp_path, monkeypatch, capsys):
+    def broken():
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(manifest, "get_manifest", broken)
+    assert manifest.previous_export("https://janitorai.test/chats/1") is None
+    manifest.record_export("https://janitorai.test/chats/1", {})
+    out = capsys.readouterr().out
+    assert "Could not read export manifest: database is locked" in out
+    assert "Could not update export manifest: database is locked" in out
+
+
+CHAR_A = "https://janitorai.com/characters/0f8fad5b-d9cb-469f-a165-70867728950e_character-aiko"
+CHAR_B = "https://janitorai.com/characters/7c9e6679-7425-40de-944b-e07fc1f90ae7_character-brenna"
+
+
+def export(tmp_path, db, url, name):
+    json_path, png_path = tmp_path / f"{name}.json", tmp_path / f"{name}.png"
+    json_path.write_text('{"name": "%s"}' % name)
+    png_path.write_bytes(b"png " + name.encode())
+    db.record(url, {'name': name, 'json_path': str(json_path), 'image_path': str(png_path)})
+    return json_path, png_path
+
+
+def test_pending_skips_unchanged_exports(tmp_path):
+    db = manifest.Manifest(str(tmp_path / "manifest.sqlite3"))
+    export(tmp_path, db, CHAR_A, "Aiko")
+
+    # The chat URL of the same character shares its row
+    chat_url = "https://janitorai.com/chats/0f8fad5b-d9cb-469f-a165-70867728950e"
+    assert db.pending([CHAR_A, chat_url, CHAR_B]) == ([CHAR_B], [CHAR_A, chat_url])
+
+
+def test_touched_but_identical_files_still_count_as_exported(tmp_path):
+    db = manifest.Manifest(str(tmp_path / "manifest.sqlite3"))
+    json_path, _ = export(tmp_path, db, CHAR_A, "Aiko")
+    os.utime(json_path, (1, 1))
+    assert db.is_current(CHAR_A)
+
+
+def test_changed_or_missing_files_are_exported_again(tmp_path):
+    db = manifest.Manifest(str(tmp_path / "manifest.sqlite3"))
+    json_path, _ = export(tmp_path, db, CHAR_A, "Aiko")
+    _, png_path = export(tmp_path, db, CHAR_B, "Brenna")
+    json_path.write_text('{"name": "Aiko", "edited": true}')
+    png_path.unlink()
+    assert db.pending([CHAR_A, CHAR_B]) == ([CHAR_A, CHAR_B], [])
+
+
+def test_exports_older_than_the_ttl_are_due(tmp_path, monkeypatch):
+    db = manifest.Manifest(str(tmp_path / "manifest.sqlite3"))
+    export(tmp_path, db, CHAR_A, "Aiko")
+    monkeypatch.setattr(manifest.time, "time", lambda: 1e12)
+    assert db.pending([CHAR_A], ttl=86400) == ([CHAR_A], [])
+    assert db.pending([CHAR_A]) == ([], [CHAR_A])
+
+
+def test_batch_force_ignores_the_manifest(tmp_path, monkeypatch):
+    import batch
+
+    db = manifest.Manifest(str(tmp_path / "manifest.sqlite3"))
+    export(tmp_path, db, CHAR_A, "Aiko")
+    monkeypatch.setattr(manifest, "get_manifest", lambda: db)
+    exported = []
+    monkeypatch.setattr(batch, "run_batch", lambda urls, *args: exported.append(urls) or [])
+    source = tmp_path / "urls.txt"
+    source.write_text(f"{CHAR_A}\n{CHAR_B}\n")
+    results = str(tmp_path / "results.jsonl")
+
+    batch.main(str(source), results)
+    batch.main(str(source), results, force=True)
+
+    assert exported == [[CHAR_B], [CHAR_A, CHAR_B]]
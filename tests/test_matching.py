@@ -0,0 +1,50 @@
+import pytest
+
+import sync
+
+
+def cards_for(*titles):
+    cards, index = [], {}
+    for position, title in enumerate(titles):
+        card = {'title': title, 'position': position, 'key': sync.normalize_name(title)}
+        cards.append(card)
+        index[card['key']] = card
+    return cards, index
+
+
+def match(name, *titles):
+    card = sync.match_sucker_card(*cards_for(*titles), name)
+    return card and card['title']
+
+
+def test_exact_title_wins_over_longer_titles():
+    assert match("Aiko", "Aiko 2", "Aiko") == "Aiko"
+
+
+def test_newest_card_wins_for_the_same_title():
+    cards, index = cards_for("Mia", "Mia")
+    assert sync.match_sucker_card(cards, index, "mia")['position'] == 1
+
+
+@pytest.mark.parametrize("name, title", [("Aiko 2", "Aiko"), ("Ann", "Anna"), ("Mila", "Mia")])
+def test_near_names_do_not_match(name, title):
+    assert match(name, title) is None
+
+
+def test_name_inside_card_text_is_ignored():
+    cards, index = cards_for("Bob")
+    cards[0]['text'] = "Bob\nFriends with Alice"
+    assert sync.match_sucker_card(cards, index, "Alice") is None
+
+
+def test_unique_title_containing_the_name_matches():
+    assert match("Hermione", "Hermione Granger", "Ron") == "Hermione Granger"
+
+
+def test_ambiguous_matches_raise():
+    with pytest.raises(Exception, match="several"):
+        match("Aiko", "Aiko (v1)", "Aiko (v2)")
+
+
+def test_unique_close_typo_matches():
+    assert match("Hermoine Granger", "Hermione Granger") == "Hermione Granger"
@@ -0,0 +1,61 @@
+import base64
+import json
+import struct
+import zlib
+
+import pack
+
+
+def tiny_png():
+    header = struct.pack(">IIBBBBB", 1, 1, 8, 2, 0, 0, 0)
+    return (pack.PNG_SIGNATURE + pack._chunk(b"IHDR", header)
+            + pack._chunk(b"IDAT", zlib.compress(b"\x00\xff\x00\x00"))
+            + pack._chunk(b"IEND", b""))
+
+
+def export(directory, name, data):
+    json_path, png_path = directory / f"{name}.json", directory / f"{name}.png"
+    json_path.write_text(json.dumps(data))
+    png_path.write_bytes(tiny_png())
+    return str(json_path), str(png_path)
+
+
+def text_chunks(path):
+    with open(path, 'rb') as f:
+        assert f.read(8) == pack.PNG_SIGNATURE
+        return dict(data.partition(b"\x00")[::2] for kind, data in pack._iter_chunks(f)
+                    if kind == b"tEXt")
+
+
+def test_card_embeds_the_json(tmp_path):
+    json_path, png_path = export(tmp_path, "Aiko", {'name': "Aiko"})
+    card = str(tmp_path / "cards" / "Aiko.png")
+
+    assert pack.pack_pair(json_path, png_path, card) == "packed"
+    chunks = text_chunks(card)
+    assert json.loads(base64.b64decode(chunks[pack.CARD_KEYWORD])) == {'name': "Aiko"}
+    assert chunks[pack.SOURCE_KEYWORD].decode() == pack.pair_digest(json_path, png_path)
+
+
+def test_up_to_date_pairs_are_skipped_by_hash(tmp_path):
+    json_path, png_path = export(tmp_path, "Aiko", {'name': "Aiko"})
+    card = pack.card_path_for(json_path)
+    assert pack.pack_pair(json_path, png_path, card) == "packed"
+    assert pack.pack_pair(json_path, png_path, card) == "skipped"
+
+    # Same size, different content: only the hash tells them apart
+    with open(json_path, 'w') as f:
+        json.dump({'name': "Aiki"}, f)
+    assert pack.pack_pair(json_path, png_path, card) == "packed"
+    assert json.loads(base64.b64decode(text_chunks(card)[pack.CARD_KEYWORD])) == {'name': "Aiki"}
+
+
+def test_pack_directory_counts_outcomes(tmp_path):
+    export(tmp_path, "Aiko", {'name': "Aiko"})
+    export(tmp_path, "Brenna", {'name': "Brenna"})
+    (tmp_path / "Broken.json").write_text("{not json")
+    (tmp_path / "Broken.png").write_bytes(tiny_png())
+    (tmp_path / "Lonely.json").write_text("{}")
+
+    assert pack.pack_directory(str(tmp_path), workers=1) == {'packed': 2, 'skipped': 0, 'failed': 1}
+    assert pack.pack_directory(str(tmp_path), workers=1) == {'packed': 0, 'skipped': 2, 'failed': 1}
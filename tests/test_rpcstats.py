@@ -0,0 +1,56 @@
+import rpcstats
+import sync
+import timing
+
+
+class FakeExecutor:
+    def __init__(self):
+        self.sent = []
+
+    def execute(self, command, params):
+        self.sent.append(command)
+        return {'value': None}
+
+
+class FakeDriver:
+    def __init__(self):
+        self.command_executor = FakeExecutor()
+
+    def execute_script(self, script, *args):
+        self.command_executor.execute("executeScript", {'script': script, 'args': list(args)})
+        return {'images': []}
+
+
+def test_round_trips_are_attributed_to_the_project_function(monkeypatch):
+    monkeypatch.setattr(timing, "TIMING_ENABLED", False)
+    recorder = rpcstats.RoundTripRecorder()
+    driver = recorder.attach(FakeDriver())
+    # Attaching twice must not count every command twice
+    recorder.attach(driver)
+
+    with timing.traced() as trace:
+        sync.scan_images(driver)
+        sync.scan_images(driver)
+        sync.rank_image_candidates(sync.scan_images(driver))
+    driver.execute_script("return 1")
+
+    callers = recorder.total.callers
+    assert callers["sync.scan_images"]['count'] == 3
+    assert callers["sync.scan_images"]['commands'] == {"executeScript": 3}
+    assert callers["(outside janitor-dl)"]['count'] == 1
+    assert recorder.total.count == 4
+    assert recorder._per_trace[trace].count == 3
+
+
+def test_report_is_printed_when_the_character_finishes(capsys):
+    recorder = rpcstats.RoundTripRecorder()
+    trace = timing.Trace("https://janitorai.test/chats/1")
+    trace.character = "Aiko"
+    with timing.active(trace):
+        recorder.record("executeScript", "sync.scan_images", 0.25)
+
+    recorder.trace_finished(trace, "ok")
+    out = capsys.readouterr().out
+    assert "'Aiko' (ok): 1 WebDriver round trips" in out
+    assert "sync.scan_images" in out
+    assert trace not in recorder._per_trace
@@ -0,0 +1,41 @@
+import os
+
+import slim_profile
+
+
+def write(path, data, mtime=None):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+
+
+def test_refreshed_database_drops_the_copy_s_stale_wal(tmp_path):
+    source, target = tmp_path / "profile", tmp_path / "slim"
+    write(source / "cookies.sqlite", b"new database")
+    write(target / "cookies.sqlite", b"old", mtime=1)
+    write(target / "cookies.sqlite-wal", b"old wal")
+    write(target / "cookies.sqlite-shm", b"old shm")
+
+    slim_profile.refresh_slim_copy(source, target)
+
+    assert (target / "cookies.sqlite").read_bytes() == b"new database"
+    assert not (target / "cookies.sqlite-wal").exists()
+    assert not (target / "cookies.sqlite-shm").exists()
+
+
+def test_wal_and_shm_are_copied_with_the_database(tmp_path):
+    source, target = tmp_path / "profile", tmp_path / "slim"
+    write(source / "cookies.sqlite", b"database")
+    write(source / "cookies.sqlite-wal", b"wal")
+    write(source / "cookies.sqlite-shm", b"shm")
+    site = "storage/default/https+++janitorai.com/ls/data.sqlite"
+    write(source / site, b"site database")
+    write(source / (site + "-wal"), b"site wal")
+    write(target / site, b"old", mtime=1)
+    write(target / (site + "-wal"), b"old site wal", mtime=1)
+
+    slim_profile.refresh_slim_copy(source, target)
+
+    for name in ("cookies.sqlite", "cookies.sqlite-wal", "cookies.sqlite-shm", site, site + "-wal"):
+        assert (target / name).read_bytes() == (source / name).read_bytes()
@@ -0,0 +1,44 @@
+import json
+
+import strategies
+
+SELECTORS = ["textarea", "div[contenteditable]", "input[type=text]"]
+
+
+def test_order_puts_past_winners_first(tmp_path):
+    stats = strategies.StrategyStats(str(tmp_path / "strategies.json"))
+    assert stats.order("chatbox", SELECTORS) == SELECTORS
+    assert stats.favourite("chatbox", SELECTORS) is None
+
+    stats.record("chatbox", "input[type=text]", 0.5)
+    stats.record("chatbox", "div[contenteditable]", 0.1)
+    # Same hit rate: the faster one wins; strategies without hits keep their order
+    assert stats.order("chatbox", SELECTORS) == ["div[contenteditable]", "input[type=text]", "textarea"]
+    assert stats.favourite("chatbox", SELECTORS) == "div[contenteditable]"
+
+
+def test_misses_demote_the_favourite(tmp_path):
+    stats = strategies.StrategyStats(str(tmp_path / "strategies.json"))
+    stats.record("chatbox", "textarea", 0.1)
+    stats.record("chatbox", "input[type=text]", 0.9)
+    for _ in range(3):
+        stats.miss("chatbox", "textarea")
+    assert stats.favourite("chatbox", SELECTORS) == "input[type=text]"
+
+
+def test_stats_persist_between_runs(tmp_path):
+    path = str(tmp_path / "janitor-dl" / "strategies.json")
+    stats = strategies.StrategyStats(path)
+    stats.record("back_button", "button[aria-label='Back']", 0.2)
+    stats.save()
+
+    with open(path, encoding='utf-8') as f:
+        assert json.load(f)["back_button"]["button[aria-label='Back']"]["hits"] == 1
+    reloaded = strategies.StrategyStats(path)
+    assert reloaded.favourite("back_button", ["a.back", "button[aria-label='Back']"]) == "button[aria-label='Back']"
+
+
+def test_unreadable_stats_start_empty(tmp_path):
+    path = tmp_path / "strategies.json"
+    path.write_text("{not json")
+    assert strategies.StrategyStats(str(path)).favourite("chatbox", SELECTORS) is None
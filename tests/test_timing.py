@@ -0,0 +1,58 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+import timing
+
+
+def test_percentile_is_nearest_rank():
+    values = list(range(1, 101))
+    assert timing.percentile(values, 50) == 50
+    assert timing.percentile(values, 95) == 95
+    assert timing.percentile(values, 99) == 99
+    assert timing.percentile([7.0], 99) == 7.0
+    assert timing.percentile([], 50) == 0.0
+
+
+def test_summarize_groups_spans_by_step():
+    records = [
+        {'run': "a", 'step': "step1", 'duration': 1.0, 'outcome': "ok"},
+        {'run': "a", 'step': "step1", 'duration': 3.0, 'outcome': "error"},
+        {'run': "a", 'step': "total", 'duration': 5.0, 'outcome': "ok"},
+        {'run': "b", 'step': "total", 'duration': 7.0, 'outcome': "ok"},
+    ]
+    summary, runs, characters = timing.summarize(records)
+    assert [s['step'] for s in summary] == ["step1", "total"]
+    assert summary[0]['count'] == 2
+    assert summary[0]['errors'] == 1
+    assert summary[0]['p50'] == 1.0
+    assert summary[0]['mean'] == 2.0
+    assert (runs, characters) == (2, 2)
+
+
+def write_spans(path, *spans):
+    with open(path, 'w', encoding='utf-8') as f:
+        for ts, step, duration in spans:
+            f.write(json.dumps({'ts': ts.isoformat(timespec="seconds"), 'run': "r",
+                                'step': step, 'duration': duration, 'outcome': "ok"}) + "\n")
+        f.write("not json\n")
+
+
+def test_stats_filters_by_since_and_step(tmp_path, capsys):
+    now = datetime.now(timezone.utc)
+    path = tmp_path / "spans.jsonl"
+    write_spans(path,
+                (now - timedelta(days=10), "step1", 9.0),
+                (now - timedelta(hours=1), "step1", 1.0),
+                (now - timedelta(hours=1), "step2", 2.0))
+
+    since = now - timedelta(days=1)
+    assert [r['duration'] for r in timing.load_spans(str(path), since)] == [1.0, 2.0]
+
+    assert timing.stats_main(str(path), since_days=1, step="step1") == 0
+    out = capsys.readouterr().out
+    rows = [line.split() for line in out.splitlines() if line.strip().startswith("step")]
+    assert rows == [["step1", "1", "0", "1.00s", "1.00s", "1.00s"]]
+
+
+def test_missing_spans_file_is_an_error(tmp_path):
+    assert timing.stats_main(str(tmp_path / "missing.jsonl")) == 1
@@ -0,0 +1,27 @@
+import pytest
+
+import transcode
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def palette_png_with_transparent_index(path):
+    img = Image.new("P", (4, 4), 1)
+    img.putpalette([0, 0, 0, 255, 0, 0] + [0, 0, 0] * 254)
+    img.paste(0, (0, 0, 4, 2))
+    img.save(path, format="PNG", transparency=0)
+
+
+@pytest.mark.parametrize("fmt", transcode.FORMATS)
+def test_palette_transparency_survives(tmp_path, fmt):
+    path = str(tmp_path / "avatar.png")
+    palette_png_with_transparent_index(path)
+
+    # A resize forces a re-encode even when it wouldn't be smaller
+    out, _, _ = transcode.transcode_image(path, fmt, max_size=(2, 2))
+
+    with Image.open(out) as img:
+        rgba = img.convert("RGBA")
+        alphas = [rgba.getpixel((x, y))[3] for x in range(rgba.width) for y in range(rgba.height)]
+    assert 0 in alphas
+    assert 255 in alphas
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Per-step timing spans for sync runs.
+
+Each character's sync is a trace. STEP 1-6 and the helpers inside them
+record spans (step name, outcome, duration) into the trace, and when the
+character is done the spans are appended to a JSONL file together with
+the character name and the overall outcome. `janitor-dl stats` reads that
+file back and prints p50/p95/p99 per step.
+"""
+
+import contextlib
+import functools
+import json
+import math
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+
+# --- CONFIGURATION ---
+TIMING_ENABLED = True
+SPANS_PATH = os.path.join(
+    os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share"),
+    "janitor-dl", "spans.jsonl",
+)
+
+RUN_ID = uuid.uuid4().hex[:12]
+
+_local = threading.local()
+_write_lock = threading.Lock()
+# Called as listener(trace, outcome) whenever a trace finishes
+_listeners = []
+
+
+class Trace:
+    """Spans for one character, written out together when it finishes."""
+
+    def __init__(self, url=None):
+        self.url = url
+        self.character = None
+        self.spans = []
+        self.started = time.perf_counter()
+        self.written = False
+
+    def add(self, step, duration, outcome="ok", error=None):
+        self.spans.append({
+            'step': step,
+            'outcome': outcome,
+            'error': error,
+            'duration': round(duration, 6),
+        })
+
+    def write(self, outcome="ok", error=None):
+        """Append every span plus a 'total' span to SPANS_PATH (once)."""
+        if self.written:
+            return
+        self.written = True
+        self.add("total", time.perf_counter() - self.started, outcome, error)
+        for listener in list(_listeners):
+            try:
+                listener(self, outcome)
+            except Exception as e:
+                print(f"[WARNING] Trace listener failed: {e}")
+        if not TIMING_ENABLED:
+            return
+        ts = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        lines = []
+        for span in self.spans:
+            record = {
+                'ts': ts,
+                'run': RUN_ID,
+                'url': self.url,
+                'character': self.character,
+                'character_outcome': outcome,
+            }
+            record.update(span)
+            lines.append(json.dumps(record, ensure_ascii=False))
+        try:
+            os.makedirs(os.path.dirname(SPANS_PATH), exist_ok=True)
+            with _write_lock, open(SPANS_PATH, 'a', encoding='utf-8') as f:
+                f.write("\n".join(lines) + "\n")
+        except OSError as e:
+            print(f"[WARNING] Could not write timing spans: {e}")
+
+
+def add_listener(listener):
+    """Call listener(trace, outcome) each time a character's trace finishes."""
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def current():
+    """The trace active on this thread, or None."""
+    return getattr(_local, 'trace', None)
+
+
+@contextlib.contextmanager
+def active(trace):
+    """Make trace the current one on this thread (e.g. in a worker thread)."""
+    previous = current()
+    _local.trace = trace
+    try:
+        yield trace
+    finally:
+        _local.trace = previous
+
+
+@contextlib.contextmanager
+def traced(url=None):
+    """
+    Trace one character. Reuses the thread's active trace if there is one;
+    otherwise starts a new trace and writes it out on exit.
+    """
+    existing = current()
+    if existing is not None:
+        if url and not existing.url:
+            existing.url = url
+        yield existing
+        return
+
+    trace = Trace(url)
+    with active(trace):
+        try:
+            yield trace
+        except BaseException as e:
+            trace.write("error", f"{type(e).__name__}: {e}")
+            raise
+    trace.write("ok")
+
+
+def set_character(name):
+    """Attach the detected character name to the current trace."""
+    trace = current()
+    if trace is not None:
+        trace.character = name
+
+
+@contextlib.contextmanager
+def span(step):
+    """Time a block as `step` in the current trace (no-op without one)."""
+    trace = current()
+    if trace is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    except BaseException as e:
+        trace.add(step, time.perf_counter() - started, "error", f"{type(e).__name__}: {e}")
+        raise
+    trace.add(step, time.perf_counter() - started)
+
+
+def timed(step):
+    """Decorator form of span()."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(step):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not values:
+        return 0.0
+    rank = max(0, min(len(values) - 1, math.ceil(pct / 100.0 * len(values)) - 1))
+    return values[rank]
+
+
+def load_spans(path=None, since=None):
+    """Yield span records from path, optionally only those at or after `since` (datetime)."""
+    path = path or SPANS_PATH
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if since is not None:
+                try:
+                    if datetime.fromisoformat(record['ts']) < since:
+                        continue
+                except (KeyError, ValueError):
+                    continue
+            yield record
+
+
+def summarize(records):
+    """
+    Group spans by step.
+
+    Returns:
+        (list of per-step dicts sorted by first appearance, run count,
+        character count)
+    """
+    durations = {}
+    errors = {}
+    order = []
+    runs = set()
+    characters = 0
+    for record in records:
+        step = record.get('step')
+        if step is None:
+            continue
+        if step not in durations:
+            durations[step] = []
+            errors[step] = 0
+            order.append(step)
+        durations[step].append(record.get('duration', 0.0))
+        if record.get('outcome') != 'ok':
+            errors[step] += 1
+        runs.add(record.get('run'))
+        if step == 'total':
+            characters += 1
+
+    summary = []
+    for step in order:
+        values = sorted(durations[step])
+        summary.append({
+            'step': step,
+            'count': len(values),
+            'errors': errors[step],
+            'p50': percentile(values, 50),
+            'p95': percentile(values, 95),
+            'p99': percentile(values, 99),
+            'mean': sum(values) / len(values),
+        })
+    return summary, len(runs), characters
+
+
+def stats_main(path=None, since_days=None, step=None):
+    """Entry point for `janitor-dl stats`."""
+    path = path or SPANS_PATH
+    if not os.path.exists(path):
+        print(f"[ERROR] No timing data yet at {path}")
+        return 1
+
+    since = None
+    if since_days:
+        since = datetime.fromtimestamp(time.time() - since_days * 86400, timezone.utc)
+
+    records = load_spans(path, since)
+    if step:
+        records = (r for r in records if r.get('step') == step)
+    summary, runs, characters = summarize(records)
+
+    print("="*60)
+    print(" " * 20 + "Step Timing")
+    print("="*60)
+    print(f"  File:       {path}")
+    print(f"  Runs:       {runs}")
+    print(f"  Characters: {characters}\n")
+    print(f"  {'Step':<28} {'Count':>6} {'Err':>5} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for s in summary:
+        print(f"  {s['step']:<28} {s['count']:>6} {s['errors']:>5} "
+              f"{s['p50']:>7.2f}s {s['p95']:>7.2f}s {s['p99']:>7.2f}s")
+    print("="*60 + "\n")
+    return 0
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Re-encode exported avatars: optimized PNG, WebP or lossless WebP, optional
+maximum dimensions, metadata stripped.
+
+Encoding is CPU-bound, so it runs on a ProcessPoolExecutor: inline after
+each export (sync's IMAGE_FORMAT, one shared pool for the whole run) and
+in bulk over an existing folder with `janitor-dl transcode`. A PNG that
+would not get smaller is left alone. WebP output replaces <name>.png with
+<name>.webp.
+"""
+
+import atexit
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+# --- CONFIGURATION ---
+FORMATS = ("png", "webp", "webp-lossless")
+WEBP_QUALITY = 90
+# 0 (fast) - 6 (smallest)
+WEBP_METHOD = 6
+# Images queued per worker process in bulk mode
+IN_FLIGHT_PER_WORKER = 4
+
+IMAGE_SUFFIXES = (".png", ".webp", ".jpg", ".jpeg", ".gif")
+
+
+def parse_size(text):
+    """'512x768' -> (512, 768)."""
+    try:
+        width, height = (int(part) for part in text.lower().split("x"))
+    except ValueError:
+        raise ValueError(f"Expected WIDTHxHEIGHT, got {text!r}")
+    if width <= 0 or height <= 0:
+        raise ValueError(f"Expected a positive WIDTHxHEIGHT, got {text!r}")
+    return width, height
+
+
+def _encode(img, fmt, out, metadata):
+    if fmt == "png":
+        img.save(out, format="PNG", optimize=True, **metadata)
+    elif fmt == "webp":
+        img.save(out, format="WEBP", quality=WEBP_QUALITY, method=WEBP_METHOD, **metadata)
+    else:
+        img.save(out, format="WEBP", lossless=True, quality=100, method=WEBP_METHOD, **metadata)
+
+
+def transcode_image(path, fmt="png", max_size=None, strip=True):
+    """
+    Re-encode one image file in place (or to <stem>.webp for WebP formats).
+
+    Returns:
+        (output path, bytes before, bytes after). The output path is the
+        original path when the re-encoded PNG would not have been smaller.
+    """
+    from io import BytesIO
+    from PIL import Image, ImageOps
+
+    before = os.path.getsize(path)
+    with Image.open(path) as img:
+        img = ImageOps.exif_transpose(img)
+        resized = False
+        if max_size and (img.width > max_size[0] or img.height > max_size[1]):
+            img.thumbnail(max_size, Image.LANCZOS)
+            resized = True
+        if img.mode not in ("RGB", "RGBA", "L", "LA", "P"):
+            img = img.convert("RGBA")
+        # A transparent palette index or tRNS colour lives in info too: PNG
+        # gets it back explicitly, WebP needs a real alpha channel
+        transparency = img.info.get("transparency")
+        if transparency is not None and fmt != "png":
+            img = img.convert("RGBA")
+            transparency = None
+        # Pillow only writes the EXIF/ICC/text it is handed through info
+        keep = {} if strip else {k: img.info[k] for k in ("exif", "icc_profile") if img.info.get(k)}
+        if transparency is not None:
+            keep["transparency"] = transparency
+        img.info = {}
+        out = BytesIO()
+        _encode(img, fmt, out, keep)
+
+    stem = os.path.splitext(path)[0]
+    target = stem + (".png" if fmt == "png" else ".webp")
+    data = out.getvalue()
+    if target == path and not resized and len(data) >= before:
+        return path, before, before
+
+    tmp_path = f"{target}.part"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, target)
+    if target != path:
+        os.remove(path)
+    return target, before, len(data)
+
+
+def _job(args):
+    path, fmt, max_size, strip = args
+    try:
+        return (path,) + transcode_image(path, fmt, max_size, strip) + (None,)
+    except Exception as e:
+        return path, path, 0, 0, f"{type(e).__name__}: {e}"
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _shared_executor():
+    """Process pool shared by inline transcodes for the rest of the run."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=os.cpu_count() or 1)
+            atexit.register(_executor.shutdown)
+        return _executor
+
+
+def transcode_inline(path, fmt, max_size=None, strip=True):
+    """Transcode one freshly exported image on the shared pool and wait for it."""
+    path, output, before, after, error = _shared_executor().submit(
+        _job, (path, fmt, max_size, strip)
+    ).result()
+    if error:
+        raise Exception(f"Transcoding {os.path.basename(path)} failed: {error}")
+    return output, before, after
+
+
+def _update_manifest(old_path, new_path):
+    import manifest
+    try:
+        manifest.get_manifest().update_image(old_path, new_path)
+    except Exception as e:
+        print(f"[WARNING] Could not update export manifest: {e}")
+
+
+def find_images(directory):
+    with os.scandir(directory) as it:
+        for entry in it:
+            if entry.is_file() and entry.name.lower().endswith(IMAGE_SUFFIXES):
+                yield entry.path
+
+
+def transcode_directory(directory, fmt="png", max_size=None, strip=True, workers=None):
+    """
+    Transcode every image in directory on a process pool.
+
+    Returns:
+        (images processed, failures, bytes before, bytes after)
+    """
+    workers = workers or os.cpu_count() or 1
+    totals = {'done': 0, 'failed': 0, 'before': 0, 'after': 0}
+    jobs = ((path, fmt, max_size, strip) for path in find_images(directory))
+
+    def collect(done):
+        for future in done:
+            path, output, before, after, error = future.result()
+            if error:
+                totals['failed'] += 1
+                print(f"[ERROR] {os.path.basename(path)}: {error}")
+                continue
+            totals['done'] += 1
+            totals['before'] += before
+            totals['after'] += after
+            if output != path or after != before:
+                _update_manifest(path, output)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        in_flight = set()
+        for job in jobs:
+            if len(in_flight) >= workers * IN_FLIGHT_PER_WORKER:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                collect(done)
+            in_flight.add(executor.submit(_job, job))
+        collect(wait(in_flight).done)
+    return totals['done'], totals['failed'], totals['before'], totals['after']
+
+
+def main(directory=None, fmt="png", max_size=None, strip=True, workers=None):
+    """Entry point for `janitor-dl transcode`."""
+    if directory is None:
+        import sync
+        directory = sync.DOWNLOAD_PATH
+    directory = os.path.expanduser(directory)
+    if not os.path.isdir(directory):
+        print(f"[ERROR] Export folder not found: {directory}")
+        return 1
+
+    print(f"[IMAGE] Transcoding images in {directory} to {fmt}"
+          f"{f' (max {max_size[0]}x{max_size[1]})' if max_size else ''}...")
+    started = time.monotonic()
+    done, failed, before, after = transcode_directory(directory, fmt, max_size, strip, workers)
+    elapsed = time.monotonic() - started
+    saved = before - after
+    rate = done / elapsed if elapsed else 0.0
+    percent = saved / before * 100 if before else 0.0
+    print(f"[IMAGE] {done} image(s), {failed} failed in {elapsed:.1f}s ({rate:.1f} images/s)")
+    print(f"[IMAGE] {before / 1024 / 1024:.1f} MB -> {after / 1024 / 1024:.1f} MB, "
+          f"saved {saved / 1024 / 1024:.1f} MB ({percent:.0f}%)")
+    return 0 if not failed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1] if len(sys.argv) > 1 else None))
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Condition-driven waits used by sync.py.
+
+Each wait is a named readiness condition polled through WebDriverWait, so a
+step moves on the moment the page is ready instead of after a fixed sleep.
+"""
+
+import time
+
+# --- CONFIGURATION ---
+# Per-condition timeouts in seconds (worst case on a slow load)
+TIMEOUTS = {
+    "document_ready": 15,
+    "element_interactable": 10,
+    "tab_count_changed": 10,
+    "chat_message_appeared": 10,
+    "card_list_settled": 20,
+    "large_image_present": 10,
+    "network_capture": 10,
+}
+POLL_INTERVAL = 0.1
+# document.readyState values that count as ready ("interactive" as well in
+# lean mode, where the eager load strategy skips waiting for subresources)
+READY_STATES = ("complete",)
+
+# How long the sucker.dev card count must stay unchanged to count as settled
+CARD_LIST_QUIET_PERIOD = 0.5
+
+
+def wait_for(driver, name, condition, timeout=None):
+    """
+    Poll a named condition until it returns something truthy.
+
+    Args:
+        driver: Selenium WebDriver instance
+        name: Condition name, used for the timeout lookup and error message
+        condition: Callable taking the driver
+        timeout: Optional override of TIMEOUTS[name]
+
+    Returns:
+        Whatever the condition returned when it held
+    """
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.common.exceptions import TimeoutException, StaleElementReferenceException
+
+    if timeout is None:
+        timeout = TIMEOUTS.get(name, 10)
+    wait = WebDriverWait(
+        driver,
+        timeout,
+        poll_frequency=POLL_INTERVAL,
+        ignored_exceptions=(StaleElementReferenceException,),
+    )
+    try:
+        return wait.until(condition)
+    except TimeoutException:
+        raise TimeoutException(f"Timed out after {timeout}s waiting for '{name}'")
+
+
+def document_ready(driver, timeout=None):
+    """Wait until the current document has finished loading (see READY_STATES)."""
+    return wait_for(
+        driver,
+        "document_ready",
+        lambda d: d.execute_script("return document.readyState") in READY_STATES,
+        timeout,
+    )
+
+
+def element_interactable(driver, locator_or_element, timeout=None):
+    """
+    Wait until an element is displayed and enabled.
+
+    Accepts either a (By, selector) locator or an already-found element.
+    Returns the element.
+    """
+    def condition(d):
+        if isinstance(locator_or_element, tuple):
+            elements = d.find_elements(*locator_or_element)
+            element = elements[0] if elements else None
+        else:
+            element = locator_or_element
+        if element is not None and element.is_displayed() and element.is_enabled():
+            return element
+        return False
+
+    return wait_for(driver, "element_interactable", condition, timeout)
+
+
+def tab_count_changed(driver, previous_handles, timeout=None):
+    """
+    Wait until the set of window handles differs from previous_handles.
+
+    Returns the list of newly opened handles (empty if a tab was closed).
+    """
+    previous = set(previous_handles)
+
+    def condition(d):
+        handles = d.window_handles
+        if len(handles) != len(previous):
+            return [h for h in handles if h not in previous] or [None]
+        return False
+
+    new_handles = wait_for(driver, "tab_count_changed", condition, timeout)
+    return [h for h in new_handles if h is not None]
+
+
+def count_text_occurrences(driver, text):
+    """Count how often text appears in the rendered page."""
+    return driver.execute_script(
+        "return (document.body.innerText || '').split(arguments[0]).length - 1;",
+        text,
+    )
+
+
+def chat_message_appeared(driver, text, previous_count, timeout=None):
+    """Wait until text shows up in the page more often than previous_count."""
+    return wait_for(
+        driver,
+        "chat_message_appeared",
+        lambda d: count_text_occurrences(d, text) > previous_count,
+        timeout,
+    )
+
+
+class _CardListSettled:
+    """Condition: card count is non-zero and unchanged for the quiet period."""
+
+    def __init__(self, quiet_period):
+        self.quiet_period = quiet_period
+        self.last_count = None
+        self.stable_since = None
+
+    def __call__(self, driver):
+        count = driver.execute_script(
+            "return Array.from(document.querySelectorAll('button'))"
+            ".filter(b => (b.textContent || '').indexOf('Download JSON') !== -1).length;"
+        )
+        now = time.monotonic()
+        if count != self.last_count:
+            self.last_count = count
+            self.stable_since = now
+            return False
+        if count and now - self.stable_since >= self.quiet_period:
+            return count
+        return False
+
+
+def card_list_settled(driver, timeout=None, quiet_period=CARD_LIST_QUIET_PERIOD):
+    """Wait until the sucker.dev card list has rendered and stopped growing."""
+    return wait_for(driver, "card_list_settled", _CardListSettled(quiet_period), timeout)
+
+
+def large_image_present(driver, min_size=200, timeout=None):
+    """Wait until at least one image of min_size x min_size is rendered."""
+    return wait_for(
+        driver,
+        "large_image_present",
+        lambda d: d.execute_script(
+            "var min = arguments[0];"
+            "return Array.from(document.images).some(function (img) {"
+            "  var r = img.getBoundingClientRect();"
+            "  return img.complete && r.width >= min && r.height >= min;"
+            "});",
+            min_size,
+        ),
+        timeout,
+    )